@@ -0,0 +1,273 @@
+"""
+Benchmark das Operações de Imagem
+Mede tempo e pico de memória das operações de imagem em imagens sintéticas de 64 px a 8K
+
+Cada caso (operação x tamanho) roda em um processo novo, para que o pico de
+memória de um não contamine o outro. Os resultados são gravados em JSON e
+comparados com um baseline; o processo termina com código 1 se algum caso
+ficar mais lento que o limite.
+
+Uso:
+    python -m benchmarks.bench_image_ops
+    python -m benchmarks.bench_image_ops --sizes 64,512,2K --output results.json
+    python -m benchmarks.bench_image_ops --save-baseline
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_THRESHOLD = 0.25  # 25% mais lento que o baseline = regressão
+NOISE_FLOOR_MS = 1.0  # Diferenças absolutas menores que isso são ruído de medição
+SEED = 1234
+
+SIZES = {
+    "64": (64, 64),
+    "512": (512, 512),
+    "2K": (2048, 2048),
+    "4K": (3840, 2160),
+    "8K": (7680, 4320),
+}
+
+# Operação -> entrada: "path" recebe o arquivo, "array" uma cópia RGBA já decodificada
+OPERATIONS = {
+    "get_dominant_color": "path",
+    "create_circular_pixmap": "path",
+    "load_rgba": "path",
+    "transparent": "array",
+    "transparent_edge": "array",
+    "chroma_key": "array",
+    "tint": "array",
+    "tint_colorize": "array",
+    "tint_hue": "array",
+}
+
+
+def synthetic_image(width, height, seed=SEED):
+    """Imagem determinística: gradiente, blobs coloridos, fundo escuro/verde nas bordas e ruído"""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    u, v = x / max(width - 1, 1), y / max(height - 1, 1)
+
+    pixels = np.empty((height, width, 4), dtype=np.uint8)
+    pixels[..., 0] = (u * 200 + 30).astype(np.uint8)
+    pixels[..., 1] = (v * 160 + 60).astype(np.uint8)
+    pixels[..., 2] = ((1 - u) * 180 + 40).astype(np.uint8)
+    pixels[..., 3] = 255
+
+    for _ in range(6):
+        cx, cy = rng.uniform(0.2, 0.8, 2)
+        radius = rng.uniform(0.05, 0.2)
+        color = rng.integers(0, 256, 3, dtype=np.uint8)
+        pixels[(u - cx) ** 2 + (v - cy) ** 2 < radius ** 2, :3] = color
+
+    # Faixas de borda: preto (transparência/edge) e verde (chroma key)
+    border = max(1, min(width, height) // 16)
+    pixels[:border, :, :3] = 0
+    pixels[-border:, :, :3] = (0, 255, 0)
+    noise = rng.integers(0, 12, (height, width, 3), dtype=np.uint8)
+    pixels[..., :3] = np.minimum(pixels[..., :3].astype(np.uint16) + noise, 255).astype(np.uint8)
+    return pixels
+
+
+def repeats_for(width, height):
+    """Menos repetições para imagens grandes (tempo total de poucos segundos por caso)"""
+    megapixels = width * height / 1_000_000
+    if megapixels < 1:
+        return 20
+    if megapixels < 10:
+        return 5
+    return 3
+
+
+def peak_rss_bytes():
+    """Pico de memória residente do processo (None se a plataforma não informar)"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset
+        except (ImportError, AttributeError):
+            return None
+
+
+def operation_callable(name):
+    """Função a medir (importada no processo do caso, depois do QApplication)"""
+    if name == "get_dominant_color":
+        from utils.image_handler import ImageHandler
+        return ImageHandler.get_dominant_color
+    if name == "create_circular_pixmap":
+        from utils.image_handler import ImageHandler
+        return lambda path: ImageHandler.create_circular_pixmap(path, 60)
+    if name == "load_rgba":
+        from utils.image_ops import ImageOps
+        return ImageOps.load_rgba
+
+    from utils.batch_processor import OPERATIONS as BATCH_OPERATIONS, operation_args
+    function = BATCH_OPERATIONS[name]
+    args = operation_args(name, 30, color=(74, 144, 226), key=(0, 255, 0), softness=20)
+    return lambda pixels: function(pixels, *args)
+
+
+def run_case(task):
+    """Mede uma operação em um tamanho (executado em um processo novo)"""
+    name, size_label, image_path = task
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])  # QPixmap exige uma QApplication viva
+
+    function = operation_callable(name)
+    source = None
+    if OPERATIONS[name] == "array":
+        from utils.image_ops import ImageOps
+        source = ImageOps.load_rgba(image_path)
+        work = source.copy()
+
+    with Image.open(image_path) as img:
+        width, height = img.size
+    repeats = repeats_for(width, height)
+
+    # A primeira chamada mede a memória (o pico de RSS só cresce) e serve de aquecimento
+    # (LUTs em cache, imports tardios); os tempos vêm das repetições seguintes
+    rss_before = peak_rss_bytes()
+    tracemalloc.start()
+    function(work if source is not None else image_path)
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = peak_rss_bytes()
+
+    times = []
+    for _ in range(repeats):
+        if source is not None:
+            np.copyto(work, source)  # Entrada nova a cada repetição, sem alocar
+            start = time.perf_counter()
+            function(work)
+        else:
+            start = time.perf_counter()
+            function(image_path)
+        times.append(time.perf_counter() - start)
+
+    return {
+        "operation": name,
+        "size": size_label,
+        "width": width,
+        "height": height,
+        "repeats": repeats,
+        "min_ms": min(times) * 1000,
+        "median_ms": statistics.median(times) * 1000,
+        "python_peak_mb": python_peak / 1024 / 1024,
+        # Crescimento do pico de RSS na operação (além da entrada já carregada)
+        "rss_growth_mb": (rss_after - rss_before) / 1024 / 1024 if rss_before is not None else None,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Lista os casos cujo melhor tempo passou do baseline + limite (o mínimo é o menos ruidoso)"""
+    reference = {(r["operation"], r["size"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        base = reference.get((result["operation"], result["size"]))
+        if (base and result["min_ms"] > base["min_ms"] * (1 + threshold)
+                and result["min_ms"] - base["min_ms"] > NOISE_FLOOR_MS):
+            regressions.append((result, base))
+    return regressions
+
+
+def format_results(results):
+    """Tabela legível dos resultados"""
+    lines = [f"{'operation':<24}{'size':>6}{'median ms':>12}{'min ms':>10}{'py peak MB':>12}{'rss +MB':>9}"]
+    for r in results:
+        rss = f"{r['rss_growth_mb']:.1f}" if r["rss_growth_mb"] is not None else "-"
+        lines.append(f"{r['operation']:<24}{r['size']:>6}{r['median_ms']:>12.2f}{r['min_ms']:>10.2f}"
+                     f"{r['python_peak_mb']:>12.1f}{rss:>9}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Ponto de entrada"""
+    parser = argparse.ArgumentParser(description="Image operations benchmark (offscreen Qt)")
+    parser.add_argument("--sizes", default=",".join(SIZES), help=f"Comma-separated from {', '.join(SIZES)}")
+    parser.add_argument("--ops", default=",".join(OPERATIONS), help="Comma-separated operations")
+    parser.add_argument("--output", help="Write results JSON to this path")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    args = parser.parse_args(argv)
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    operations = [o.strip() for o in args.ops.split(",") if o.strip()]
+    unknown = [s for s in sizes if s not in SIZES] + [o for o in operations if o not in OPERATIONS]
+    if unknown:
+        parser.error(f"Unknown size/operation: {', '.join(unknown)}")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for size_label in sizes:
+            width, height = SIZES[size_label]
+            image_path = os.path.join(tmp, f"synthetic_{size_label}.png")
+            Image.fromarray(synthetic_image(width, height), "RGBA").save(image_path, compress_level=1)
+            for name in operations:
+                # Um processo por caso: picos de memória isolados
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    result = executor.submit(run_case, (name, size_label, image_path)).result()
+                results.append(result)
+                print(f"{name:<24}{size_label:>6}{result['median_ms']:>12.2f} ms", flush=True)
+
+    report = {
+        "machine": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "processor": platform.processor() or platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    print()
+    print(format_results(results))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+        for result, base in regressions:
+            print(f"  {result['operation']} @ {result['size']}: "
+                  f"{result['min_ms']:.2f} ms vs {base['min_ms']:.2f} ms baseline")
+        return 1
+    print(f"\nNo regressions over {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""
+Benchmark do Matcher de Regras
+Mede compilação e classificação de conjuntos grandes de regras contra milhares de nomes de processo
+
+As regras sintéticas misturam os tipos de uma lista de debloat real (nomes
+exatos, prefixos, sufixos, substrings, globs genéricos e regexes). O custo
+por nome é medido sem cache (o matcher em si) e com cache (classificações
+repetidas, como em varreduras seguidas). Para comparação, uma amostra dos
+nomes é testada regra a regra, como um laço de fnmatch/regex faria. Com
+várias quantidades de regras, a tabela mostra se o custo por nome fica estável.
+Sai com código 1 se o matcher e o laço ingênuo discordarem.
+
+Uso:
+    python -m benchmarks.bench_rule_matcher
+    python -m benchmarks.bench_rule_matcher --rules 100,1000,10000 --processes 5000 --output results.json
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import string
+import fnmatch
+import platform
+import argparse
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from utils.rule_matcher import RuleMatcher, REGEX_PREFIX  # noqa: E402
+
+SEED = 1234
+NAIVE_SAMPLE = 200  # Nomes testados regra a regra (o laço ingênuo é lento demais para todos)
+HIT_RATE = 0.2  # Fração dos processos sintéticos que casa com alguma regra
+ALLOW_FRACTION = 0.02  # Fração das regras que vira allowlist
+
+# Proporção de cada tipo de regra
+RULE_MIX = (("exact", 0.70), ("prefix", 0.10), ("suffix", 0.08), ("contains", 0.04),
+            ("glob", 0.05), ("regex", 0.03))
+
+
+def random_word(rng, low=4, high=14):
+    """Palavra aleatória (nome de executável sem extensão)"""
+    return "".join(rng.choice(string.ascii_letters + string.digits) for _ in range(rng.randint(low, high)))
+
+
+def synthetic_rules(count, rng):
+    """Regras de todos os tipos, na proporção de RULE_MIX"""
+    rules = []
+    for kind, share in RULE_MIX:
+        for _ in range(max(1, round(count * share))):
+            word = random_word(rng)
+            if kind == "exact":
+                rules.append(f"{word}.exe")
+            elif kind == "prefix":
+                rules.append(f"{word}*")
+            elif kind == "suffix":
+                rules.append(f"*{word}.exe")
+            elif kind == "contains":
+                rules.append(f"*{word}*")
+            elif kind == "glob":
+                rules.append(f"{word[:3]}*{word[3:]}?.exe")
+            else:
+                rules.append(f"{REGEX_PREFIX}{word[:3]}[0-9]+{word[3:]}\\.exe")
+    return rules[:count]
+
+
+def name_for(rule, rng):
+    """Um nome que casa com a regra"""
+    if rule.startswith(REGEX_PREFIX):
+        source = rule[len(REGEX_PREFIX):]
+        head, tail = source.split("[0-9]+")
+        return f"{head}{rng.randint(0, 999)}{tail.replace(chr(92), '')}"
+    return "".join(random_word(rng, 1, 4) if c == "*" else "x" if c == "?" else c for c in rule)
+
+
+def synthetic_processes(count, rules, rng):
+    """Nomes de processo distintos: HIT_RATE casam com regras, o resto não"""
+    names = set()
+    while len(names) < count:
+        if rng.random() < HIT_RATE:
+            names.add(name_for(rng.choice(rules), rng))
+        else:
+            names.add(f"{random_word(rng)}_{len(names)}.exe")
+    return sorted(names)
+
+
+def naive_match(rules, name):
+    """Referência: testa regra por regra"""
+    lowered = name.lower()
+    for rule in rules:
+        if rule.startswith(REGEX_PREFIX):
+            if re.search(rule[len(REGEX_PREFIX):], lowered, re.IGNORECASE):
+                return rule
+        elif fnmatch.fnmatchcase(lowered, rule.lower()):
+            return rule
+    return None
+
+
+def run_case(rule_count, process_count, seed=SEED):
+    """Compila rule_count regras e classifica process_count nomes"""
+    rng = random.Random(seed)
+    rules = synthetic_rules(rule_count, rng)
+    allow_count = max(1, int(rule_count * ALLOW_FRACTION))
+    allow_rules, kill_rules = rules[:allow_count], rules[allow_count:]
+    names = synthetic_processes(process_count, rules, rng)
+
+    start = time.perf_counter()
+    matcher = RuleMatcher(kill_rules, allow_rules)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    verdicts = [matcher.classify(name)[0] for name in names]
+    cold_us = (time.perf_counter() - start) / len(names) * 1e6
+
+    start = time.perf_counter()
+    for name in names:
+        matcher.classify(name)
+    warm_us = (time.perf_counter() - start) / len(names) * 1e6
+
+    sample = rng.sample(range(len(names)), min(NAIVE_SAMPLE, len(names)))
+    start = time.perf_counter()
+    mismatches = 0
+    for i in sample:
+        expected = "allow" if naive_match(allow_rules, names[i]) else "kill" if naive_match(kill_rules, names[i]) else None
+        mismatches += expected != verdicts[i]
+    naive_us = (time.perf_counter() - start) / len(sample) * 1e6
+
+    return {
+        "rules": rule_count,
+        "processes": len(names),
+        "matched": sum(1 for v in verdicts if v == "kill"),
+        "allowed": sum(1 for v in verdicts if v == "allow"),
+        "compile_ms": compile_ms,
+        "cold_us_per_name": cold_us,
+        "warm_us_per_name": warm_us,
+        "naive_us_per_name": naive_us,
+        "mismatches": mismatches,
+    }
+
+
+def format_results(results):
+    """Tabela legível dos resultados"""
+    lines = [f"{'rules':>7}{'procs':>7}{'kill':>6}{'allow':>6}{'compile ms':>12}"
+             f"{'cold us':>10}{'warm us':>10}{'naive us':>11}{'speedup':>9}"]
+    for r in results:
+        lines.append(f"{r['rules']:>7}{r['processes']:>7}{r['matched']:>6}{r['allowed']:>6}{r['compile_ms']:>12.1f}"
+                     f"{r['cold_us_per_name']:>10.2f}{r['warm_us_per_name']:>10.2f}{r['naive_us_per_name']:>11.1f}"
+                     f"{r['naive_us_per_name'] / r['cold_us_per_name']:>8.0f}x")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Ponto de entrada"""
+    parser = argparse.ArgumentParser(description="Rule matcher benchmark")
+    parser.add_argument("--rules", default="100,1000,10000", help="Comma-separated rule counts")
+    parser.add_argument("--processes", type=int, default=5000, help="Distinct process names to classify")
+    parser.add_argument("--output", help="Write results JSON to this path")
+    args = parser.parse_args(argv)
+
+    results = []
+    for count in [int(c) for c in args.rules.split(",") if c.strip()]:
+        results.append(run_case(count, args.processes))
+        print(f"{count:>7} rules done", flush=True)
+    print()
+    print(format_results(results))
+
+    if args.output:
+        report = {
+            "machine": {
+                "platform": platform.platform(),
+                "python": platform.python_version(),
+                "processor": platform.processor() or platform.machine(),
+            },
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    mismatches = sum(r["mismatches"] for r in results)
+    if mismatches:
+        print(f"\n{mismatches} classification(s) differ from the rule-by-rule reference")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
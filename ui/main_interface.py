@@ -10,6 +10,8 @@ from PyQt6.QtWidgets import (QMainWindow, QWidget, QHBoxLayout, QVBoxLayout,
 from PyQt6.QtCore import Qt
 
 from utils.image_handler import ImageHandler
+from utils.image_worker import CallableJob
+from utils.theme_cache import ThemeCache
 from widgets.profile_widget import ProfileWidget
 from widgets.search_widget import SearchWidget
 from widgets.sidebar_widget import SidebarWidget
@@ -20,11 +22,13 @@ logger = logging.getLogger(__name__)
 
 class MainInterface(QMainWindow):
     """Interface principal da aplicação"""
-    
+
     def __init__(self):
         super().__init__()
+        self.theme_cache = ThemeCache()
+        self.theme_job = None
         self.profile_image = self.find_profile_image()
-        self.highlight_color = self.get_theme_color()
+        self.highlight_color, self.secondary_color = self.get_theme_colors()
         self.setupUI()
         self.connect_signals()
 
@@ -36,11 +40,35 @@ class MainInterface(QMainWindow):
                 return name
         return None
 
-    def get_theme_color(self):
-        """Obtém a cor tema baseada na imagem de perfil"""
-        if self.profile_image:
-            return ImageHandler.get_dominant_color(self.profile_image)
-        return "#4a90e2"  # Cor padrão azul
+    def get_theme_colors(self):
+        """Obtém (destaque, secundária) do cache; se desatualizadas, recalcula em segundo plano"""
+        defaults = (ImageHandler.DEFAULT_COLOR, ImageHandler.DEFAULT_SECONDARY)
+        if not self.profile_image:
+            return defaults
+
+        colors, fresh = self.theme_cache.get(self.profile_image)
+        if not fresh:
+            self.theme_job = CallableJob(ImageHandler.get_theme_colors, self.profile_image)
+            self.theme_job.signals.finished.connect(self.on_theme_colors_computed)
+            self.theme_job.start()
+        return colors or defaults
+
+    def on_theme_colors_computed(self, colors):
+        """Recebe as cores calculadas em segundo plano e reestiliza apenas se mudaram"""
+        self.theme_job = None
+        self.theme_cache.set(self.profile_image, colors)
+        if tuple(colors) != (self.highlight_color, self.secondary_color):
+            self.set_theme_colors(*colors)
+
+    def set_theme_colors(self, highlight_color, secondary_color):
+        """Aplica novas cores de destaque e secundária a todos os widgets"""
+        self.highlight_color = highlight_color
+        self.secondary_color = secondary_color
+        self.profile_widget.set_highlight_color(highlight_color)
+        self.profile_widget.set_secondary_color(secondary_color)
+        self.search_widget.set_highlight_color(highlight_color)
+        self.sidebar_menu.set_highlight_color(highlight_color)
+        self.update_scroll_style()
 
     def setupUI(self):
         """Configura a interface principal"""
@@ -95,6 +123,7 @@ class MainInterface(QMainWindow):
         # Profile widget
         self.profile_widget = ProfileWidget(self.profile_image)
         self.profile_widget.set_highlight_color(self.highlight_color)
+        self.profile_widget.set_secondary_color(self.secondary_color)
         sidebar_layout.addWidget(self.profile_widget)
 
         # Search widget
@@ -108,7 +137,17 @@ class MainInterface(QMainWindow):
         menu_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         menu_scroll.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         menu_scroll.setFrameShape(QScrollArea.Shape.NoFrame)
-        menu_scroll.setStyleSheet(f"""
+        self.menu_scroll = menu_scroll
+        self.update_scroll_style()
+
+        self.sidebar_menu = SidebarWidget()
+        self.sidebar_menu.set_highlight_color(self.highlight_color)
+        menu_scroll.setWidget(self.sidebar_menu)
+        sidebar_layout.addWidget(menu_scroll)
+
+    def update_scroll_style(self):
+        """Atualiza o estilo da área de rolagem do menu com a cor de destaque"""
+        self.menu_scroll.setStyleSheet(f"""
             QScrollArea {{
                 border: none;
                 outline: none;
@@ -122,7 +161,7 @@ class MainInterface(QMainWindow):
                 border-radius: 4px;
             }}
             QScrollBar::handle:vertical {{
-                background-color: {self.highlight_color};
+                background-color: {self.secondary_color};
                 border: none;
                 outline: none;
                 border-radius: 4px;
@@ -134,11 +173,6 @@ class MainInterface(QMainWindow):
             }}
         """)
 
-        self.sidebar_menu = SidebarWidget()
-        self.sidebar_menu.set_highlight_color(self.highlight_color)
-        menu_scroll.setWidget(self.sidebar_menu)
-        sidebar_layout.addWidget(menu_scroll)
-
     def setup_content_area(self):
         """Configura a área de conteúdo"""
         self.content_area = QFrame()
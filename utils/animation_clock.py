@@ -0,0 +1,88 @@
+"""
+Relógio de Animação
+Um único timer compartilhado por todas as animações, no ritmo da taxa de atualização da tela
+"""
+
+import logging
+from PyQt6.QtCore import QObject, QTimer, QElapsedTimer, Qt
+from PyQt6.QtGui import QGuiApplication
+
+logger = logging.getLogger(__name__)
+
+
+class AnimationClock(QObject):
+    """Entrega o tempo decorrido (dt, em segundos) aos inscritos a cada quadro
+
+    O intervalo segue a taxa de atualização da tela principal e é recalculado
+    quando ela muda. Sem inscritos o timer fica parado: nenhuma wakeup.
+    """
+
+    DEFAULT_REFRESH_HZ = 60.0
+    MAX_DT = 0.1  # Após uma pausa longa (ex.: sistema ocupado) não "teleportar" as animações
+
+    _shared = None
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.subscribers = []  # callbacks(dt)
+        self.refresh_rate = self.DEFAULT_REFRESH_HZ
+        self.screen = None
+        self.elapsed = QElapsedTimer()
+
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.tick)
+
+        app = QGuiApplication.instance()
+        if app is not None:
+            app.primaryScreenChanged.connect(self.track_screen)
+        self.track_screen(QGuiApplication.primaryScreen())
+
+    @classmethod
+    def shared(cls):
+        """Instância compartilhada pela aplicação"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def track_screen(self, screen):
+        """Passa a seguir a taxa de atualização de outra tela"""
+        if self.screen is not None:
+            self.screen.refreshRateChanged.disconnect(self.update_interval)
+        self.screen = screen
+        if screen is not None:
+            screen.refreshRateChanged.connect(self.update_interval)
+        self.update_interval()
+
+    def update_interval(self, *_):
+        """Recalcula o intervalo do timer a partir da taxa de atualização"""
+        rate = self.screen.refreshRate() if self.screen is not None else 0
+        self.refresh_rate = rate if rate > 0 else self.DEFAULT_REFRESH_HZ
+        self.timer.setInterval(max(1, round(1000 / self.refresh_rate)))
+        logger.debug(f"Relógio de animação a {self.refresh_rate:.0f} Hz ({self.timer.interval()} ms)")
+
+    def subscribe(self, callback):
+        """Inscreve um callback(dt); o timer começa com o primeiro inscrito"""
+        if callback in self.subscribers:
+            return
+        self.subscribers.append(callback)
+        if not self.timer.isActive():
+            self.elapsed.start()
+            self.timer.start()
+
+    def unsubscribe(self, callback):
+        """Remove um callback; o timer para com o último"""
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+        if not self.subscribers:
+            self.timer.stop()
+
+    def is_running(self):
+        """Indica se o timer está ativo"""
+        return self.timer.isActive()
+
+    def tick(self):
+        """Um quadro: repassa o tempo real decorrido desde o anterior"""
+        dt = min(self.elapsed.restart() / 1000, self.MAX_DT)
+        for callback in list(self.subscribers):
+            callback(dt)
@@ -0,0 +1,188 @@
+"""
+Operações em Animações
+Aplica as operações de imagem a todos os quadros de GIF, APNG e WebP animados, em paralelo
+
+Os quadros são decodificados já compostos (tela inteira) e processados em um
+pool de processos. Duração, loop, disposal e blend de cada quadro são mantidos
+na regravação; o formato de saída segue a extensão do arquivo (.gif, .png, .webp).
+
+Uso headless:
+    python -m utils.animation_ops transparent status.gif status_clean.png --tolerance 30
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from PIL import Image
+
+from utils.image_ops import ImageOps
+
+logger = logging.getLogger(__name__)
+
+# Disposal nativo de cada formato <-> forma canônica ("none", "background", "previous")
+GIF_DISPOSAL = {0: "none", 1: "none", 2: "background", 3: "previous"}
+APNG_DISPOSAL = {0: "none", 1: "background", 2: "previous"}
+OUTPUT_FORMATS = {".gif": "GIF", ".png": "PNG", ".apng": "PNG", ".webp": "WEBP"}
+
+
+def is_animated(path):
+    """Indica se o arquivo é uma imagem com mais de um quadro"""
+    try:
+        with Image.open(path) as img:
+            return getattr(img, "is_animated", False)
+    except OSError:
+        return False
+
+
+def read_animation(path):
+    """Decodifica todos os quadros (RGBA, compostos) e os metadados de tempo e disposal"""
+    frames = []
+    meta = {"durations": [], "disposals": [], "blends": []}
+    with Image.open(path) as img:
+        meta["format"] = img.format
+        meta["loop"] = img.info.get("loop")
+        meta["background"] = img.info.get("background")
+        for index in range(img.n_frames):
+            img.seek(index)
+            img.load()  # Alguns formatos (WebP) só preenchem a duração após decodificar
+            frames.append(ImageOps.to_array(img))
+            meta["durations"].append(int(img.info.get("duration", 100)))
+            if img.format == "GIF":
+                meta["disposals"].append(GIF_DISPOSAL.get(getattr(img, "disposal_method", 0), "none"))
+                meta["blends"].append(1)
+            elif img.format == "PNG":
+                meta["disposals"].append(APNG_DISPOSAL.get(img.info.get("disposal", 0), "none"))
+                meta["blends"].append(img.info.get("blend", 0))
+            else:
+                meta["disposals"].append("none")
+                meta["blends"].append(1)
+    return frames, meta
+
+
+def clear_before_transparency(frames, disposals):
+    """Disposal efetivo: quadros compostos com transparência exigem limpar o quadro anterior
+
+    Sem isso, o quadro anterior apareceria pelas áreas que a operação tornou
+    transparentes. Quadros totalmente opacos mantêm o disposal original.
+    """
+    disposals = list(disposals)
+    for index in range(1, len(frames)):
+        if disposals[index - 1] == "none" and (frames[index][..., 3] < 255).any():
+            disposals[index - 1] = "background"
+    return disposals
+
+
+def write_animation(output, frames, meta):
+    """Codifica os quadros no formato da extensão de saída, mantendo duração, loop, disposal e blend"""
+    output_format = OUTPUT_FORMATS.get(os.path.splitext(output)[1].lower())
+    if output_format is None:
+        raise ValueError(f"Unsupported animation output: {output}")
+
+    images = [ImageOps.to_image(frame) for frame in frames]
+    disposals = clear_before_transparency(frames, meta["disposals"])
+    options = {"save_all": True, "append_images": images[1:], "duration": meta["durations"]}
+    if meta.get("loop") is not None:
+        options["loop"] = meta["loop"]
+
+    if output_format == "GIF":
+        to_gif = {"none": 1, "background": 2, "previous": 3}
+        options["disposal"] = [to_gif[d] for d in disposals]
+    elif output_format == "PNG":
+        to_apng = {"none": 0, "background": 1, "previous": 2}
+        options["disposal"] = [to_apng[d] for d in disposals]
+        options["blend"] = meta["blends"]
+    else:
+        options["lossless"] = True
+        # Só keyframes: com subquadros o muxer pode omitir a flag de alpha do VP8X e a
+        # animação inteira passa a ser lida como opaca
+        options["kmax"] = 1
+        if isinstance(meta.get("background"), tuple):
+            options["background"] = meta["background"]
+
+    images[0].save(output, output_format, **options)
+
+
+def process_frame(task):
+    """Aplica a operação a um quadro (executado no processo worker)"""
+    index, frame, operation, args = task
+    operation(frame, *args)
+    return index, frame
+
+
+def process_animation(source, output, operation, *args, workers=None,
+                      progress_callback=None, cancel_check=None):
+    """Aplica a operação (função in-place sobre RGBA) a cada quadro em um pool de processos"""
+    start = time.perf_counter()
+    frames, meta = read_animation(source)
+    decode_seconds = time.perf_counter() - start
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(frames)))
+    processed = [None] * len(frames)
+    done = 0
+    cancelled = False
+    if workers == 1:
+        # Um único worker: evita o custo de iniciar o pool e copiar os quadros
+        for index, frame in enumerate(frames):
+            if cancel_check and cancel_check():
+                cancelled = True
+                break
+            processed[index] = process_frame((index, frame, operation, args))[1]
+            done += 1
+            if progress_callback:
+                progress_callback(done, len(frames))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(process_frame, (index, frame, operation, args))
+                       for index, frame in enumerate(frames)]
+            for future in as_completed(futures):
+                index, frame = future.result()
+                processed[index] = frame
+                done += 1
+                if progress_callback:
+                    progress_callback(done, len(frames))
+                if cancel_check and cancel_check():
+                    cancelled = True
+                    for pending in futures:
+                        pending.cancel()
+                    break
+
+    if not cancelled:
+        write_animation(output, processed, meta)
+
+    return {
+        "source": source,
+        "output": output,
+        "format": meta["format"],
+        "frames": len(frames),
+        "workers": workers,
+        "completed": not cancelled,
+        "decode_seconds": decode_seconds,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def main(argv=None):
+    """Ponto de entrada headless"""
+    from utils.batch_processor import OPERATIONS, add_operation_arguments, parsed_operation_args
+
+    parser = argparse.ArgumentParser(description="Apply transparency / tint to every frame of an animation")
+    parser.add_argument("operation", choices=sorted(OPERATIONS))
+    parser.add_argument("source")
+    parser.add_argument("output", help="Output path (.gif, .png for APNG, .webp)")
+    add_operation_arguments(parser)
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    operation_arguments = parsed_operation_args(args)
+    report = process_animation(args.source, args.output, OPERATIONS[args.operation], *operation_arguments,
+                               workers=args.workers)
+    print(f"{report['frames']} {report['format']} frames on {report['workers']} workers "
+          f"in {report['seconds']:.2f} s (decode {report['decode_seconds']:.2f} s) -> {report['output']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Cache da Aplicação
+Localização do cache em disco e assinaturas de arquivo usadas como chave
+"""
+
+import os
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def get_cache_dir(*parts):
+    """Retorna (e cria) a pasta de cache do Draconic, opcionalmente com subpastas"""
+    base = (os.environ.get("DRACONIC_CACHE_DIR")
+            or os.environ.get("LOCALAPPDATA")
+            or os.environ.get("XDG_CACHE_HOME")
+            or os.path.join(os.path.expanduser("~"), ".cache"))
+    if not os.environ.get("DRACONIC_CACHE_DIR"):
+        base = os.path.join(base, "Draconic")
+    path = os.path.join(base, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def file_signature(path):
+    """Assinatura (caminho absoluto, tamanho, mtime) que invalida o cache quando o arquivo muda"""
+    stat = os.stat(path)
+    return [os.path.abspath(path), stat.st_size, stat.st_mtime_ns]
+
+
+def load_json(path, default=None):
+    """Lê um arquivo JSON do cache, retornando o padrão se ausente ou corrompido"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except (OSError, ValueError) as e:
+        logger.warning(f"Cache inválido em {path}: {e}")
+        return default
+
+
+def atomic_write(path, write):
+    """Grava com write(tmp_path) num arquivo temporário e o renomeia, para que leitores nunca vejam um arquivo parcial"""
+    tmp_path = f"{path}.tmp"
+    try:
+        if write(tmp_path) is False:
+            raise OSError(f"falha ao gravar {tmp_path}")
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def save_image(path, image, **params):
+    """Grava uma imagem PIL como PNG de forma atômica"""
+    atomic_write(path, lambda tmp_path: image.save(tmp_path, "PNG", **params))
+
+
+def save_json(path, data):
+    """Grava JSON de forma atômica (arquivo temporário + rename)"""
+    def write(tmp_path):
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+    try:
+        atomic_write(path, write)
+    except OSError as e:
+        logger.warning(f"Não foi possível gravar o cache {path}: {e}")
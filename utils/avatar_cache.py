@@ -0,0 +1,72 @@
+"""
+Cache de Avatares
+Avatares circulares pré-renderizados, em memória (QPixmapCache) e em disco (PNG)
+"""
+
+import os
+import logging
+from PyQt6.QtGui import QPixmap, QPixmapCache
+
+from utils.app_cache import get_cache_dir, atomic_write
+from utils.image_handler import ImageHandler
+from utils.render_cache import RenderCache
+
+logger = logging.getLogger(__name__)
+
+
+class AvatarCache(RenderCache):
+    """Renderiza avatares em worker threads e os reaproveita entre execuções"""
+
+    def __init__(self, cache_dir=None):
+        super().__init__(cache_dir or get_cache_dir("avatars"), "avatar_")
+
+    def cache_key(self, image_path, size, device_pixel_ratio):
+        """Chave do avatar: arquivo de origem, tamanho e DPR"""
+        return self.make_key(image_path, size, f"{device_pixel_ratio:.2f}")
+
+    def lookup(self, image_path, size, device_pixel_ratio=1.0):
+        """Busca o avatar na memória e depois no disco; retorna None se ainda não renderizado"""
+        key = self.cache_key(image_path, size, device_pixel_ratio)
+        pixmap = QPixmapCache.find(key)
+        if pixmap is not None:
+            return pixmap
+
+        path = self.disk_path(key)
+        if os.path.exists(path):
+            pixmap = QPixmap(path)
+            if not pixmap.isNull():
+                pixmap.setDevicePixelRatio(device_pixel_ratio)
+                QPixmapCache.insert(key, pixmap)
+                return pixmap
+        return None
+
+    def request(self, image_path, size, device_pixel_ratio, callback):
+        """Entrega o avatar ao callback (na thread da UI), renderizando em segundo plano se preciso"""
+        if not image_path or not os.path.exists(image_path):
+            callback(ImageHandler.create_circular_pixmap(None, size))
+            return
+
+        pixmap = self.lookup(image_path, size, device_pixel_ratio)
+        if pixmap is not None:
+            callback(pixmap)
+            return
+
+        key = self.cache_key(image_path, size, device_pixel_ratio)
+        self.submit(key, callback, self.render, image_path, size, device_pixel_ratio,
+                    fallback=lambda: ImageHandler.create_circular_pixmap(None, size))
+
+    @staticmethod
+    def render(image_path, size, device_pixel_ratio, output_path):
+        """Renderiza o avatar como QImage e o persiste em disco (executa no worker)"""
+        image = ImageHandler.create_circular_image(image_path, size, device_pixel_ratio)
+        try:
+            atomic_write(output_path, lambda tmp_path: image.save(tmp_path, "PNG"))
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar o avatar em {output_path}: {e}")
+        return image
+
+    def prepare(self, key, image):
+        """Converte o QImage em QPixmap na thread da UI e o guarda no QPixmapCache"""
+        pixmap = QPixmap.fromImage(image)
+        QPixmapCache.insert(key, pixmap)
+        return pixmap
@@ -0,0 +1,235 @@
+"""
+Processador em Lote
+Aplica transparência ou tint a pastas inteiras de ícones usando um pool de processos
+
+Uso headless:
+    python -m utils.batch_processor tint lib/icons/light -o out --color "#4a90e2"
+    python -m utils.batch_processor transparent "icons/*.png" -o out --tolerance 30
+    python -m utils.batch_processor chroma_key sprites -o out --key "#00ff00" --tolerance 40 --softness 20
+    python -m utils.batch_processor tint_gradient icons -o out --color "#ffd27f" --shadow "#1a1040"
+"""
+
+import os
+import sys
+import glob
+import time
+import logging
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from PIL import Image
+
+from utils.image_ops import ImageOps
+from utils.animation_ops import is_animated, process_animation
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".bmp", ".tiff", ".webp")
+DEFAULT_TEMPLATE = "{stem}_{op}.png"
+
+# Operação -> função in-place sobre o array RGBA (chamada com os argumentos do lote)
+OPERATIONS = {
+    "transparent": ImageOps.transparent_array,
+    "transparent_edge": ImageOps.transparent_edge_array,
+    "chroma_key": ImageOps.chroma_key_array,
+    "chroma_key_lab": ImageOps.chroma_key_lab_array,
+    "tint": ImageOps.tint_array,
+    "tint_colorize": ImageOps.colorize_array,
+    "tint_hue": ImageOps.hue_shift_array,
+    "tint_gradient": ImageOps.gradient_map_array,
+}
+
+
+def collect_inputs(source):
+    """Resolve uma pasta ou padrão glob em uma lista ordenada de imagens"""
+    if os.path.isdir(source):
+        paths = [os.path.join(source, name) for name in os.listdir(source)]
+    else:
+        paths = glob.glob(source, recursive=True)
+    return sorted(p for p in paths
+                  if os.path.isfile(p) and p.lower().endswith(IMAGE_EXTENSIONS))
+
+
+def parse_color(value):
+    """Converte '#rrggbb' ou 'r,g,b' em uma tupla RGB"""
+    value = value.strip()
+    if value.startswith("#") and len(value) == 7:
+        return tuple(int(value[i:i + 2], 16) for i in (1, 3, 5))
+    parts = [int(p) for p in value.split(",")]
+    if len(parts) != 3 or not all(0 <= p <= 255 for p in parts):
+        raise ValueError(f"Invalid color: {value}")
+    return tuple(parts)
+
+
+def operation_args(operation, tolerance=30, color=(255, 255, 255), key=(0, 255, 0), softness=0,
+                   shadow=(0, 0, 0)):
+    """Monta a tupla de argumentos da operação a partir das opções comuns"""
+    if operation == "tint_gradient":
+        return (color, shadow)
+    if operation.startswith("tint"):
+        return (color,)
+    if operation.startswith("chroma_key"):
+        return (key, tolerance, softness)
+    return (tolerance,)
+
+
+def add_operation_arguments(parser):
+    """Registra no parser as opções comuns das operações (tolerância e cores)"""
+    parser.add_argument("--tolerance", type=int, default=30)
+    parser.add_argument("--color", type=parse_color, default="#ffffff", help="Tint color as #rrggbb or r,g,b")
+    parser.add_argument("--key", type=parse_color, default="#00ff00", help="Chroma key color as #rrggbb or r,g,b")
+    parser.add_argument("--softness", type=int, default=0, help="Chroma key soft alpha ramp width")
+    parser.add_argument("--shadow", type=parse_color, default="#000000", help="Gradient map shadow color")
+
+
+def parsed_operation_args(args):
+    """Monta a tupla de argumentos da operação a partir das opções registradas por add_operation_arguments"""
+    return operation_args(args.operation, args.tolerance, args.color, args.key, args.softness, args.shadow)
+
+
+def process_file(task):
+    """Processa um arquivo (executado no processo worker)"""
+    source, output, operation, args = task
+    start = time.perf_counter()
+    try:
+        if is_animated(source):
+            # Todos os quadros, neste mesmo worker (o lote já paraleliza por arquivo)
+            report = process_animation(source, output, OPERATIONS[operation], *args, workers=1)
+            with Image.open(output) as img:
+                width, height = img.size
+            return {"source": source, "output": output, "pixels": width * height * report["frames"],
+                    "seconds": time.perf_counter() - start, "error": None}
+
+        pixels = ImageOps.load_rgba(source)
+        OPERATIONS[operation](pixels, *args)
+        ImageOps.to_image(pixels).save(output)
+        height, width = pixels.shape[:2]
+        return {"source": source, "output": output, "pixels": width * height,
+                "seconds": time.perf_counter() - start, "error": None}
+    except Exception as e:
+        return {"source": source, "output": output, "pixels": 0,
+                "seconds": time.perf_counter() - start, "error": str(e)}
+
+
+class BatchProcessor:
+    """Distribui arquivos de imagem por um pool de processos"""
+
+    def __init__(self, operation, args, output_dir, name_template=DEFAULT_TEMPLATE, workers=None):
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {operation}")
+        self.operation = operation
+        self.args = tuple(args)
+        self.output_dir = output_dir
+        self.name_template = name_template
+        self.workers = workers or os.cpu_count() or 1
+
+    def output_path(self, source, index, keep_ext=False):
+        """Gera o caminho de saída a partir do template de nome"""
+        stem, ext = os.path.splitext(os.path.basename(source))
+        if keep_ext and ext:
+            stem = f"{stem}_{ext.lstrip('.')}"
+        name = self.name_template.format(stem=stem, ext=ext.lstrip("."),
+                                         op=self.operation, index=index)
+        return os.path.join(self.output_dir, name)
+
+    def output_paths(self, files):
+        """Caminhos de saída sem colisões: nomes repetidos ganham a extensão de origem e, se preciso, um sufixo"""
+        paths = [self.output_path(source, index) for index, source in enumerate(files)]
+        counts = Counter(os.path.normcase(path) for path in paths)
+        for index, source in enumerate(files):
+            if counts[os.path.normcase(paths[index])] > 1:
+                paths[index] = self.output_path(source, index, keep_ext=True)
+
+        taken = set()
+        for index, path in enumerate(paths):
+            unique, number = path, 2
+            while os.path.normcase(unique) in taken:
+                root, ext = os.path.splitext(path)
+                unique = f"{root}_{number}{ext}"
+                number += 1
+            if unique != self.output_path(files[index], index):
+                logger.warning(f"Nome de saída repetido para {files[index]}; gravando em {unique}")
+            taken.add(os.path.normcase(unique))
+            paths[index] = unique
+        return paths
+
+    def run(self, files, progress_callback=None, cancel_check=None):
+        """Processa os arquivos e retorna um relatório com tempos por arquivo e throughput"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        tasks = [(source, output, self.operation, self.args)
+                 for source, output in zip(files, self.output_paths(files))]
+        results = []
+        cancelled = False
+        start = time.perf_counter()
+
+        workers = max(1, min(self.workers, len(tasks)))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(process_file, task) for task in tasks]
+            for future in as_completed(futures):
+                results.append(future.result())
+                if progress_callback:
+                    progress_callback(len(results), len(tasks), results[-1])
+                if cancel_check and cancel_check():
+                    cancelled = True
+                    for pending in futures:
+                        pending.cancel()
+                    break
+
+        total = time.perf_counter() - start
+        processed = [r for r in results if not r["error"]]
+        megapixels = sum(r["pixels"] for r in processed) / 1_000_000
+        return {
+            "operation": self.operation,
+            "workers": workers,
+            "files": results,
+            "processed": len(processed),
+            "failed": len(results) - len(processed),
+            "cancelled": cancelled,
+            "total_seconds": total,
+            "files_per_second": len(processed) / total if total > 0 else 0.0,
+            "megapixels_per_second": megapixels / total if total > 0 else 0.0,
+        }
+
+
+def format_report(report):
+    """Formata o relatório do lote para exibição"""
+    lines = []
+    for result in sorted(report["files"], key=lambda r: r["source"]):
+        name = os.path.basename(result["source"])
+        if result["error"]:
+            lines.append(f"  {name}: ERROR {result['error']}")
+        else:
+            lines.append(f"  {name}: {result['seconds'] * 1000:.1f} ms")
+    lines.append(f"{report['processed']} processed, {report['failed']} failed"
+                 f"{' (cancelled)' if report['cancelled'] else ''}"
+                 f" in {report['total_seconds']:.2f} s on {report['workers']} workers")
+    lines.append(f"Throughput: {report['files_per_second']:.1f} files/s, "
+                 f"{report['megapixels_per_second']:.1f} MP/s")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Ponto de entrada headless"""
+    parser = argparse.ArgumentParser(description="Batch icon tinting / background removal")
+    parser.add_argument("operation", choices=sorted(OPERATIONS))
+    parser.add_argument("source", help="Folder or glob pattern of input images")
+    parser.add_argument("-o", "--output", default="output", help="Output folder")
+    parser.add_argument("-t", "--template", default=DEFAULT_TEMPLATE,
+                        help="Output name template ({stem}, {ext}, {op}, {index})")
+    add_operation_arguments(parser)
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    files = collect_inputs(args.source)
+    if not files:
+        print(f"No images found in {args.source}")
+        return 1
+
+    processor = BatchProcessor(args.operation, parsed_operation_args(args), args.output, args.template, args.workers)
+    report = processor.run(files)
+    print(format_report(report))
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+Histórico de Edição
+Undo/redo em memória para operações encadeadas, com tiles compartilhados (copy-on-write)
+"""
+
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT_MB = 256
+
+
+class EditState:
+    """Um passo do histórico: grade de tiles somente leitura (compartilhados com os vizinhos)"""
+
+    def __init__(self, label, shape, tiles):
+        self.label = label
+        self.shape = shape
+        self.tiles = tiles  # {(linha, coluna): array}
+
+
+class EditHistory:
+    """Pilha de estados RGBA em que cada passo só copia os tiles que mudaram
+
+    Undo e redo apenas movem o índice do estado atual (O(1)); a imagem é
+    remontada a partir dos tiles quando pedida. O total de memória conta cada
+    tile uma única vez e, acima do limite, os passos mais antigos são descartados.
+    """
+
+    TILE_SIZE = 256
+
+    def __init__(self, memory_limit_mb=DEFAULT_LIMIT_MB):
+        self.memory_limit = int(memory_limit_mb * 1024 * 1024)
+        self.states = []
+        self.index = -1
+        self.memory_bytes = 0
+        self._refs = {}  # id(tile) -> [tile, número de estados que o usam]
+
+    def clear(self):
+        """Descarta todo o histórico"""
+        self.states = []
+        self.index = -1
+        self.memory_bytes = 0
+        self._refs = {}
+
+    def reset(self, pixels, label="Original"):
+        """Recomeça o histórico a partir de uma imagem"""
+        self.clear()
+        self.push(pixels, label)
+
+    def push(self, pixels, label):
+        """Registra um novo estado; tiles iguais aos do estado atual são compartilhados"""
+        previous = self.current_state()
+        if previous is not None and previous.shape != pixels.shape:
+            previous = None  # Dimensões diferentes: nada a compartilhar
+
+        tiles = {}
+        size = self.TILE_SIZE
+        height, width = pixels.shape[:2]
+        for top in range(0, height, size):
+            for left in range(0, width, size):
+                key = (top // size, left // size)
+                block = pixels[top:top + size, left:left + size]
+                shared = previous.tiles[key] if previous is not None else None
+                if shared is not None and np.array_equal(shared, block):
+                    tiles[key] = shared
+                else:
+                    tile = block.copy()
+                    tile.setflags(write=False)
+                    tiles[key] = tile
+
+        # Um novo passo invalida o redo
+        for state in self.states[self.index + 1:]:
+            self._release(state)
+        del self.states[self.index + 1:]
+
+        state = EditState(label, pixels.shape, tiles)
+        self._retain(state)
+        self.states.append(state)
+        self.index = len(self.states) - 1
+        self._evict()
+        return state
+
+    def _retain(self, state):
+        """Conta as referências aos tiles do estado"""
+        for tile in state.tiles.values():
+            entry = self._refs.get(id(tile))
+            if entry is None:
+                self._refs[id(tile)] = [tile, 1]
+                self.memory_bytes += tile.nbytes
+            else:
+                entry[1] += 1
+
+    def _release(self, state):
+        """Libera os tiles que não são mais usados por nenhum estado"""
+        for tile in state.tiles.values():
+            entry = self._refs[id(tile)]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._refs[id(tile)]
+                self.memory_bytes -= tile.nbytes
+
+    def _evict(self):
+        """Descarta os passos mais antigos (e depois os redos mais distantes) acima do limite"""
+        while self.memory_bytes > self.memory_limit and len(self.states) > 1:
+            if self.index > 0:
+                self._release(self.states.pop(0))
+                self.index -= 1
+            else:
+                self._release(self.states.pop())
+            logger.debug(f"Histórico acima do limite; {len(self.states)} passos mantidos")
+
+    def current_state(self):
+        """Estado atual, ou None se o histórico estiver vazio"""
+        return self.states[self.index] if self.states else None
+
+    def can_undo(self):
+        """Indica se há um passo anterior"""
+        return self.index > 0
+
+    def can_redo(self):
+        """Indica se há um passo desfeito para refazer"""
+        return 0 <= self.index < len(self.states) - 1
+
+    def undo(self):
+        """Volta um passo; retorna False se não houver"""
+        if not self.can_undo():
+            return False
+        self.index -= 1
+        return True
+
+    def redo(self):
+        """Avança um passo desfeito; retorna False se não houver"""
+        if not self.can_redo():
+            return False
+        self.index += 1
+        return True
+
+    def label(self):
+        """Nome do passo atual"""
+        state = self.current_state()
+        return state.label if state else ""
+
+    def redo_label(self):
+        """Nome do passo que o redo restauraria"""
+        return self.states[self.index + 1].label if self.can_redo() else ""
+
+    def pixels(self):
+        """Monta o estado atual em um array RGBA novo e editável"""
+        state = self.current_state()
+        if state is None:
+            return None
+        pixels = np.empty(state.shape, dtype=np.uint8)
+        size = self.TILE_SIZE
+        for (row, column), tile in state.tiles.items():
+            pixels[row * size:row * size + tile.shape[0], column * size:column * size + tile.shape[1]] = tile
+        return pixels
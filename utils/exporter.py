@@ -0,0 +1,199 @@
+"""
+Exportador
+Exporta uma imagem em vários formatos (PNG otimizado, WebP, ICO multi-resolução) a partir de uma única decodificação
+
+Uso headless:
+    python -m utils.exporter output.png -o dist --formats png,webp,ico --level 9
+    python -m utils.exporter icon.png -o dist --formats png --sizes 32,64,128
+"""
+
+import os
+import io
+import sys
+import time
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from PIL import Image
+
+from utils.image_ops import ImageOps
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("png", "webp", "ico")
+ICO_SIZES = (16, 24, 32, 48, 64, 128, 256)
+DEFAULT_LEVEL = 6  # 0 (mais rápido) a 9 (menor arquivo)
+
+
+def parse_list(value, cast=str):
+    """Converte 'a,b,c' em uma lista"""
+    return [cast(part.strip()) for part in value.split(",") if part.strip()]
+
+
+def square_icon(img, size):
+    """Redimensiona mantendo a proporção para caber em size x size, centralizado em um quadrado transparente"""
+    scale = size / max(img.size)
+    width, height = max(1, round(img.width * scale)), max(1, round(img.height * scale))
+    icon = img if (width, height) == img.size else img.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+    if icon.size == (size, size):
+        return icon
+    canvas = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    canvas.paste(icon, ((size - width) // 2, (size - height) // 2))
+    return canvas
+
+
+def encode(img, output_format, level, extra_images=None):
+    """Codifica a imagem no formato pedido e retorna os bytes (executa no pool)"""
+    buffer = io.BytesIO()
+    if output_format == "png":
+        # optimize escolhe o melhor filtro por linha; só vale a pena nos níveis altos
+        img.save(buffer, "PNG", compress_level=level, optimize=level >= 9)
+    elif output_format == "webp":
+        # Sem perdas (ícones); quality/method controlam o esforço do compressor
+        img.save(buffer, "WEBP", lossless=True, quality=round(level * 100 / 9), method=round(level * 6 / 9))
+    elif output_format == "ico":
+        # As resoluções já chegam redimensionadas; o ICO só as empacota (PNG embutido)
+        sizes = [(i.width, i.height) for i in [img] + list(extra_images or [])]
+        img.save(buffer, "ICO", sizes=sizes, append_images=list(extra_images or []))
+    else:
+        raise ValueError(f"Unknown export format: {output_format}")
+    return buffer.getvalue()
+
+
+class Exporter:
+    """Gera todas as resoluções de uma vez e codifica os formatos em paralelo"""
+
+    def __init__(self, formats=FORMATS, sizes=None, level=DEFAULT_LEVEL, ico_sizes=ICO_SIZES, workers=None):
+        unknown = set(formats) - set(FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown export format: {', '.join(sorted(unknown))}")
+        if not 0 <= level <= 9:
+            raise ValueError("Compression level must be between 0 and 9")
+        self.formats = tuple(formats)
+        self.sizes = tuple(sizes or ())  # Vazio: PNG/WebP no tamanho original
+        self.level = level
+        self.ico_sizes = tuple(sorted(ico_sizes, reverse=True))
+        # Os codificadores do Pillow liberam o GIL: threads evitam copiar as imagens entre processos
+        self.workers = workers or os.cpu_count() or 1
+
+    def tasks(self, img):
+        """(formato, rótulo do tamanho, imagem, imagens extras) para cada arquivo de saída"""
+        resized = {}
+
+        def at(size):
+            if size not in resized:
+                resized[size] = square_icon(img, size)
+            return resized[size]
+
+        tasks = []
+        for output_format in self.formats:
+            if output_format == "ico":
+                icons = [at(size) for size in self.ico_sizes]
+                tasks.append(("ico", "multi", icons[0], icons[1:]))
+            elif self.sizes:
+                tasks.extend((output_format, size, at(size), None) for size in self.sizes)
+            else:
+                tasks.append((output_format, "full", img, None))
+        return tasks
+
+    def output_path(self, output_dir, stem, output_format, size):
+        """Caminho do arquivo exportado"""
+        suffix = f"_{size}" if isinstance(size, int) else ""
+        return os.path.join(output_dir, f"{stem}{suffix}.{output_format}")
+
+    def run(self, source, output_dir, stem=None, progress_callback=None, cancel_check=None):
+        """Exporta a origem (caminho ou array RGBA) e retorna um relatório com tempo e tamanho por arquivo"""
+        start = time.perf_counter()
+        if isinstance(source, str):
+            stem = stem or os.path.splitext(os.path.basename(source))[0]
+            pixels = ImageOps.load_rgba(source)
+        else:
+            pixels = source
+        stem = stem or "export"
+        img = ImageOps.to_image(pixels)
+        os.makedirs(output_dir, exist_ok=True)
+
+        tasks = self.tasks(img)
+        prepare_seconds = time.perf_counter() - start
+        results = []
+        cancelled = False
+
+        def timed_encode(task):
+            output_format, size, image, extra_images = task
+            task_start = time.perf_counter()
+            data = encode(image, output_format, self.level, extra_images)
+            return data, time.perf_counter() - task_start
+
+        workers = max(1, min(self.workers, len(tasks)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(timed_encode, task): task for task in tasks}
+            for future in as_completed(futures):
+                output_format, size = futures[future][:2]
+                path = self.output_path(output_dir, stem, output_format, size)
+                try:
+                    data, seconds = future.result()
+                    with open(path, "wb") as f:
+                        f.write(data)
+                    results.append({"format": output_format, "size": size, "path": path,
+                                    "bytes": len(data), "seconds": seconds, "error": None})
+                except Exception as e:
+                    logger.error(f"Erro ao exportar {path}: {e}")
+                    results.append({"format": output_format, "size": size, "path": path,
+                                    "bytes": 0, "seconds": 0.0, "error": str(e)})
+                if progress_callback:
+                    progress_callback(len(results), len(tasks), results[-1])
+                if cancel_check and cancel_check():
+                    cancelled = True
+                    for pending in futures:
+                        pending.cancel()
+                    break
+
+        return {
+            "stem": stem,
+            "level": self.level,
+            "workers": workers,
+            "outputs": results,
+            "failed": sum(1 for r in results if r["error"]),
+            "cancelled": cancelled,
+            "prepare_seconds": prepare_seconds,
+            "total_seconds": time.perf_counter() - start,
+        }
+
+
+def format_report(report):
+    """Formata o relatório de exportação para exibição"""
+    lines = []
+    for result in sorted(report["outputs"], key=lambda r: (r["format"], r["size"] if isinstance(r["size"], int) else 0)):
+        name = os.path.basename(result["path"])
+        if result["error"]:
+            lines.append(f"  {name}: ERROR {result['error']}")
+        else:
+            lines.append(f"  {name}: {result['bytes'] / 1024:.1f} KB in {result['seconds'] * 1000:.1f} ms")
+    lines.append(f"Level {report['level']}: {len(report['outputs']) - report['failed']} files"
+                 f"{' (cancelled)' if report['cancelled'] else ''}"
+                 f" in {report['total_seconds']:.2f} s on {report['workers']} workers"
+                 f" (decode/resize {report['prepare_seconds'] * 1000:.0f} ms)")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Ponto de entrada headless"""
+    parser = argparse.ArgumentParser(description="Export icons as optimized PNG, WebP and multi-size ICO")
+    parser.add_argument("source")
+    parser.add_argument("-o", "--output", default="export", help="Output folder")
+    parser.add_argument("--formats", default=",".join(FORMATS), help="Comma-separated: png,webp,ico")
+    parser.add_argument("--sizes", default="", help="PNG/WebP sizes in px (default: original size)")
+    parser.add_argument("--ico-sizes", default=",".join(map(str, ICO_SIZES)), help="Sizes embedded in the ICO")
+    parser.add_argument("--level", type=int, default=DEFAULT_LEVEL, help="Compression level 0-9")
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    exporter = Exporter(parse_list(args.formats), parse_list(args.sizes, int), args.level,
+                        parse_list(args.ico_sizes, int), args.workers)
+    report = exporter.run(args.source, args.output)
+    print(format_report(report))
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Atlas de Ícones
+Empacota os ícones de lib/icons em uma única imagem e serve QIcons a partir dela
+
+O índice (nome -> retângulo) fica em um chunk de texto do próprio PNG, então o
+carregamento é uma única leitura de arquivo. Para regenerar o atlas:
+    python -m utils.icon_atlas
+"""
+
+import os
+import sys
+import json
+import math
+import logging
+from collections import OrderedDict
+from PIL import Image
+from PIL.PngImagePlugin import PngInfo
+from PyQt6.QtGui import QIcon, QImage, QPixmap
+
+from utils.icon_variants import IconVariantService
+
+logger = logging.getLogger(__name__)
+
+ICONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "lib", "icons")
+INDEX_KEY = "draconic-atlas"
+MAX_INSTANCES = 4  # Atlas decodificados mantidos (base, cor atual e as anteriores mais recentes)
+CELL_SIZE = 96  # 4x o tamanho lógico dos ícones da sidebar (nítido até DPR 4)
+
+
+def atlas_path(theme="light"):
+    """Caminho do atlas compilado para um tema"""
+    return os.path.join(ICONS_DIR, f"atlas_{theme}.png")
+
+
+def build_atlas(source_dir, output_path, cell_size=CELL_SIZE):
+    """Empacota todos os PNGs de source_dir em uma grade e grava o atlas com o índice embutido"""
+    names = sorted(os.path.splitext(n)[0] for n in os.listdir(source_dir) if n.lower().endswith(".png"))
+    if not names:
+        raise ValueError(f"No icons found in {source_dir}")
+
+    columns = math.ceil(math.sqrt(len(names)))
+    rows = math.ceil(len(names) / columns)
+    atlas = Image.new("RGBA", (columns * cell_size, rows * cell_size), (0, 0, 0, 0))
+    index = {"cell": cell_size, "icons": {}}
+
+    for i, name in enumerate(names):
+        with Image.open(os.path.join(source_dir, f"{name}.png")) as icon:
+            icon = icon.convert("RGBA")
+            icon.thumbnail((cell_size, cell_size), Image.LANCZOS)
+        x = (i % columns) * cell_size
+        y = (i // columns) * cell_size
+        # Centralizar ícones não quadrados na célula
+        atlas.paste(icon, (x + (cell_size - icon.width) // 2, y + (cell_size - icon.height) // 2))
+        index["icons"][name] = [x, y, cell_size, cell_size]
+
+    info = PngInfo()
+    info.add_text(INDEX_KEY, json.dumps(index))
+    atlas.save(output_path, pnginfo=info, optimize=True)
+    return index
+
+
+class IconAtlas:
+    """Carrega o atlas uma vez e entrega QIcons recortados dele"""
+
+    _instances = OrderedDict()  # LRU: trocar a cor de destaque não acumula atlas na memória
+
+    def __init__(self, path):
+        self.path = path
+        self.icons = {}
+        self.rects = {}
+        self.image = QImage(path)
+        if self.image.isNull():
+            logger.warning(f"Atlas de ícones não encontrado: {path}")
+            return
+        try:
+            self.rects = json.loads(self.image.text(INDEX_KEY))["icons"]
+        except (ValueError, KeyError) as e:
+            logger.error(f"Índice inválido no atlas {path}: {e}")
+
+    @classmethod
+    def get(cls, theme="light", mode=None, color=None):
+        """Atlas compartilhado por tema e variante (carregado na primeira chamada)
+
+        Com `mode` ("tint", "light", "dark") o atlas vem do cache de variantes,
+        que só faz trabalho de pixel na primeira vez para cada origem e cor.
+        """
+        key = (theme, mode, color)
+        if key in cls._instances:
+            cls._instances.move_to_end(key)
+            return cls._instances[key]
+        path = atlas_path(theme)
+        if mode and os.path.exists(path):
+            path = IconVariantService.shared().get_variant(path, mode, color)
+        atlas = cls._instances[key] = cls(path)
+        while len(cls._instances) > MAX_INSTANCES:
+            cls._instances.popitem(last=False)
+        return atlas
+
+    def has_icon(self, name):
+        """Indica se o atlas contém o ícone"""
+        return name in self.rects
+
+    def icon(self, name):
+        """Retorna o QIcon do ícone (QIcon vazio se não existir)"""
+        if name not in self.icons:
+            if name not in self.rects:
+                return QIcon()
+            x, y, w, h = self.rects[name]
+            self.icons[name] = QIcon(QPixmap.fromImage(self.image.copy(x, y, w, h)))
+        return self.icons[name]
+
+
+def main(argv=None):
+    """Regenera os atlas de todos os temas em lib/icons"""
+    argv = sys.argv[1:] if argv is None else argv
+    themes = argv or [n for n in sorted(os.listdir(ICONS_DIR))
+                      if os.path.isdir(os.path.join(ICONS_DIR, n))]
+    for theme in themes:
+        index = build_atlas(os.path.join(ICONS_DIR, theme), atlas_path(theme))
+        print(f"{theme}: {len(index['icons'])} icons -> {atlas_path(theme)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Variantes de Ícones
+Gera variantes (tint, claro, escuro) de ícones sob demanda em um cache endereçado por conteúdo
+"""
+
+import os
+import hashlib
+import logging
+from PIL import Image
+from PIL.PngImagePlugin import PngInfo
+
+from utils.app_cache import get_cache_dir, save_image
+from utils.image_ops import ImageOps
+
+logger = logging.getLogger(__name__)
+
+
+class IconVariantService:
+    """Variantes de ícones chaveadas pelo hash do arquivo de origem e pela cor"""
+
+    # Cores fixas dos modos; "tint" usa a cor informada
+    MODE_COLORS = {
+        "light": (255, 255, 255),
+        "dark": (32, 32, 32),
+    }
+
+    _shared = None
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or get_cache_dir("icon_variants")
+        self._source_hashes = {}  # (caminho, tamanho, mtime) -> sha1 do conteúdo
+
+    @classmethod
+    def shared(cls):
+        """Instância compartilhada pela aplicação"""
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def source_hash(self, source_path):
+        """Hash do conteúdo do arquivo, memorizado enquanto tamanho e mtime não mudarem"""
+        stat = os.stat(source_path)
+        key = (os.path.abspath(source_path), stat.st_size, stat.st_mtime_ns)
+        if key not in self._source_hashes:
+            with open(source_path, "rb") as f:
+                self._source_hashes[key] = hashlib.sha1(f.read()).hexdigest()
+        return self._source_hashes[key]
+
+    def resolve_color(self, mode, color=None):
+        """Cor RGB efetiva do modo"""
+        if mode == "tint":
+            if color is None:
+                raise ValueError("Tint mode requires a color")
+            if isinstance(color, str):
+                color = color.lstrip("#")
+                return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+            return tuple(color[:3])
+        if mode not in self.MODE_COLORS:
+            raise ValueError(f"Unknown icon variant mode: {mode}")
+        return self.MODE_COLORS[mode]
+
+    def variant_path(self, source_path, mode="tint", color=None):
+        """Caminho da variante no cache (endereçado por hash da origem + cor)"""
+        r, g, b = self.resolve_color(mode, color)
+        key = hashlib.sha1(f"{self.source_hash(source_path)}|{r:02x}{g:02x}{b:02x}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.png")
+
+    def get_variant(self, source_path, mode="tint", color=None):
+        """Retorna o caminho da variante, gerando-a apenas se ainda não estiver no cache"""
+        path = self.variant_path(source_path, mode, color)
+        if not os.path.exists(path):
+            self.generate(source_path, path, self.resolve_color(mode, color))
+        return path
+
+    @staticmethod
+    def generate(source_path, output_path, color):
+        """Aplica o tint e grava a variante, preservando os chunks de texto do PNG (ex.: índice do atlas)"""
+        with Image.open(source_path) as img:
+            text = dict(getattr(img, "text", {}))
+            pixels = ImageOps.to_array(img)
+        ImageOps.tint_array(pixels, color)
+
+        info = PngInfo()
+        for key, value in text.items():
+            info.add_text(key, value)
+
+        save_image(output_path, ImageOps.to_image(pixels), pnginfo=info)
+        logger.info(f"Variante de ícone gerada: {os.path.basename(source_path)} -> {output_path}")
@@ -4,7 +4,8 @@ Classe para gerenciar operações com imagens
 """
 
 import logging
-from PyQt6.QtGui import QColor, QPixmap, QPainter, QPainterPath
+import numpy as np
+from PyQt6.QtGui import QColor, QPixmap, QPainter, QPainterPath, QImage, QImageReader
 from PyQt6.QtCore import Qt
 from PIL import Image
 
@@ -14,63 +15,156 @@ logger = logging.getLogger(__name__)
 class ImageHandler:
     """Classe para gerenciar operações com imagens"""
     
+    DEFAULT_COLOR = "#4a90e2"
+    DEFAULT_SECONDARY = "#357abd"
+
     @staticmethod
     def get_dominant_color(image_path):
         """Extrai a cor predominante de uma imagem"""
+        palette = ImageHandler.get_palette(image_path, count=1)
+        return palette[0][0] if palette else ImageHandler.DEFAULT_COLOR
+
+    @staticmethod
+    def get_palette(image_path, count=5, sample_size=64):
+        """Extrai as `count` cores principais (median-cut) como [(hex, peso)], por peso"""
         try:
             with Image.open(image_path) as img:
-                # Redimensionar para acelerar o processamento
-                img = img.resize((50, 50))
-                img = img.convert("RGB")
-                pixels = list(img.getdata())
-                
-                if not pixels:
-                    return "#4a90e2"  # Cor padrão
-                
-                # Calcular média das cores
-                avg_r = sum(p[0] for p in pixels) // len(pixels)
-                avg_g = sum(p[1] for p in pixels) // len(pixels) 
-                avg_b = sum(p[2] for p in pixels) // len(pixels)
-                
-                return QColor(avg_r, avg_g, avg_b).name()
+                # Reduzir antes de quantizar; JPEG já decodifica em escala reduzida
+                img.draft("RGB", (sample_size, sample_size))
+                img.thumbnail((sample_size, sample_size), reducing_gap=2.0)
+                img = img.convert("RGBA")
+                pixels = np.asarray(img).reshape(-1, 4)
         except Exception as e:
             logger.error(f"Erro ao processar imagem {image_path}: {e}")
-            return "#4a90e2"  # Cor padrão em caso de erro
-    
+            return []
+
+        # Ignorar pixels totalmente transparentes
+        pixels = pixels[pixels[:, 3] > 0, :3]
+        if not len(pixels):
+            return []
+
+        # Centros iniciais por median-cut, refinados por algumas iterações de k-means
+        centers = np.array([box.mean(axis=0) for box in ImageHandler.median_cut(pixels, max(count, 8))])
+        labels, counts = ImageHandler.kmeans(pixels.astype(np.float32), centers.astype(np.float32))
+
+        palette = [(QColor(*(int(c) for c in center.round())).name(), int(n) / len(pixels))
+                   for center, n in zip(labels, counts) if n]
+        palette.sort(key=lambda entry: entry[1], reverse=True)
+        return palette[:count]
+
+    @staticmethod
+    def kmeans(pixels, centers, iterations=4):
+        """Refina os centros por k-means vetorizado; retorna (centros, população de cada centro)"""
+        for _ in range(iterations):
+            # |p - c|² sem o termo |p|², constante por pixel
+            distances = (centers ** 2).sum(axis=1) - 2 * pixels @ centers.T
+            nearest = distances.argmin(axis=1)
+            counts = np.bincount(nearest, minlength=len(centers))
+            sums = np.stack([np.bincount(nearest, weights=pixels[:, c], minlength=len(centers))
+                             for c in range(3)], axis=1)
+            filled = counts > 0
+            centers[filled] = sums[filled] / counts[filled, None]
+        return np.clip(centers, 0, 255), counts
+
+    @staticmethod
+    def median_cut(pixels, box_count):
+        """Divide os pixels (N x 3) em até `box_count` caixas pelo método median-cut"""
+        boxes = [pixels]
+        while len(boxes) < box_count:
+            # Dividir a caixa com maior (amplitude x população)
+            ranges = [np.ptp(box, axis=0) if len(box) > 1 else np.zeros(3) for box in boxes]
+            scores = [int(r.max()) * len(box) for r, box in zip(ranges, boxes)]
+            index = int(np.argmax(scores))
+            if scores[index] == 0:
+                break
+
+            box = boxes.pop(index)
+            channel = int(ranges[index].argmax())
+            order = np.argsort(box[:, channel], kind="stable")
+            middle = len(box) // 2
+            boxes.append(box[order[:middle]])
+            boxes.append(box[order[middle:]])
+        return boxes
+
+    @staticmethod
+    def get_theme_colors(image_path):
+        """Escolhe (destaque, secundária) da paleta, favorecendo cores saturadas e visíveis"""
+        candidates = []
+        for color, weight in ImageHandler.get_palette(image_path, count=8):
+            hue, saturation, value, _ = QColor(color).getHsvF()
+            if value < 0.2 or saturation < 0.15:
+                continue  # Escura ou cinza demais para destacar sobre o fundo #2a2a2a
+            candidates.append((weight * (0.25 + saturation) * value, max(hue, 0.0), color))
+
+        if not candidates:
+            return ImageHandler.DEFAULT_COLOR, ImageHandler.DEFAULT_SECONDARY
+
+        candidates.sort(reverse=True)
+        _, accent_hue, accent = candidates[0]
+        for _, hue, color in candidates[1:]:
+            distance = abs(hue - accent_hue)
+            if min(distance, 1.0 - distance) > 0.08:
+                return accent, color
+
+        # Sem segunda cor distinta: usar uma variação mais escura do destaque
+        return accent, QColor(accent).darker(130).name()
+
     @staticmethod
     def create_circular_pixmap(image_path, size):
         """Cria um QPixmap circular da imagem"""
+        return QPixmap.fromImage(ImageHandler.create_circular_image(image_path, size))
+
+    @staticmethod
+    def create_circular_image(image_path, size, device_pixel_ratio=1.0):
+        """Cria um QImage circular da imagem (seguro fora da thread da UI)"""
+        pixel_size = max(1, round(size * device_pixel_ratio))
         try:
-            pixmap = QPixmap(image_path)
-            if pixmap.isNull():
-                # Criar um pixmap padrão se a imagem não carregar
-                pixmap = QPixmap(size, size)
-                pixmap.fill(QColor("#4a4a4a"))
-            else:
-                pixmap = pixmap.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                                     Qt.TransformationMode.SmoothTransformation)
-            
+            # Decodificar já na escala final em vez de carregar a imagem inteira
+            source = QImage()
+            if image_path:
+                reader = QImageReader(image_path)
+                reader.setAutoTransform(True)
+                source_size = reader.size()
+                if source_size.isValid():
+                    reader.setScaledSize(source_size.scaled(
+                        pixel_size, pixel_size, Qt.AspectRatioMode.KeepAspectRatioByExpanding))
+                source = reader.read()
+
             # Criar máscara circular
-            circular_pixmap = QPixmap(size, size)
-            circular_pixmap.fill(Qt.GlobalColor.transparent)
-            
-            painter = QPainter(circular_pixmap)
+            image = QImage(pixel_size, pixel_size, QImage.Format.Format_ARGB32_Premultiplied)
+            image.fill(Qt.GlobalColor.transparent)
+
+            painter = QPainter(image)
             painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-            
+
             path = QPainterPath()
-            path.addEllipse(0, 0, size, size)
+            path.addEllipse(0, 0, pixel_size, pixel_size)
             painter.setClipPath(path)
-            
-            # Desenhar a imagem centralizada
-            x = (size - pixmap.width()) // 2
-            y = (size - pixmap.height()) // 2
-            painter.drawPixmap(x, y, pixmap)
+
+            if source.isNull():
+                # Preenchimento padrão se a imagem não carregar
+                painter.fillRect(0, 0, pixel_size, pixel_size, QColor("#4a4a4a"))
+            else:
+                # Desenhar a imagem centralizada
+                x = (pixel_size - source.width()) // 2
+                y = (pixel_size - source.height()) // 2
+                painter.drawImage(x, y, source)
             painter.end()
-            
-            return circular_pixmap
+
+            image.setDevicePixelRatio(device_pixel_ratio)
+            return image
         except Exception as e:
-            logger.error(f"Erro ao criar pixmap circular: {e}")
-            # Retornar um pixmap padrão
-            pixmap = QPixmap(size, size)
-            pixmap.fill(QColor("#4a4a4a"))
-            return pixmap
\ No newline at end of file
+            logger.error(f"Erro ao criar imagem circular: {e}")
+            # Retornar uma imagem padrão
+            image = QImage(pixel_size, pixel_size, QImage.Format.Format_ARGB32_Premultiplied)
+            image.fill(QColor("#4a4a4a"))
+            image.setDevicePixelRatio(device_pixel_ratio)
+            return image
+
+    @staticmethod
+    def array_to_pixmap(array):
+        """Converte um array RGBA (NumPy) em QPixmap"""
+        height, width = array.shape[:2]
+        image = QImage(array.data, width, height, array.strides[0], QImage.Format.Format_RGBA8888)
+        # QImage não copia o buffer; converter antes que o array seja liberado
+        return QPixmap.fromImage(image)
@@ -0,0 +1,350 @@
+"""
+Operações de Imagem
+Operações de pixel vetorizadas (NumPy) usadas pelas ferramentas de Extras
+"""
+
+import colorsys
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+
+class ImageOps:
+    """Operações de transparência e tint sobre buffers RGBA"""
+
+    # Máscara do canal alpha no layout de memória RGBA, vista como um uint32 por pixel
+    ALPHA_MASK = np.array([0, 0, 0, 255], dtype=np.uint8).view(np.uint32)[0]
+
+    @staticmethod
+    def load_rgba(image_path):
+        """Carrega uma imagem como array RGBA (altura x largura x 4) editável"""
+        with Image.open(image_path) as img:
+            return ImageOps.to_array(img)
+
+    @staticmethod
+    def load_proxy(image_path, max_width, max_height):
+        """Carrega uma versão reduzida (proxy) da imagem como array RGBA, para previews"""
+        with Image.open(image_path) as img:
+            # JPEG pode decodificar direto em escala reduzida
+            img.draft("RGB", (max_width, max_height))
+            img.thumbnail((max_width, max_height), reducing_gap=2.0)
+            return ImageOps.to_array(img)
+
+    @staticmethod
+    def proxy_array(array, max_width, max_height):
+        """Versão reduzida (proxy) de um array RGBA, para previews"""
+        img = ImageOps.to_image(array)
+        img.thumbnail((max_width, max_height), reducing_gap=2.0)
+        return ImageOps.to_array(img)
+
+    @staticmethod
+    def to_array(img):
+        """Converte uma imagem PIL em array RGBA contíguo e editável"""
+        if img.mode != "RGBA":
+            img = img.convert("RGBA")
+        return np.array(img, dtype=np.uint8)
+
+    @staticmethod
+    def to_image(array):
+        """Converte um array RGBA de volta para imagem PIL"""
+        return Image.fromarray(array, "RGBA")
+
+    @staticmethod
+    def _pixels(array):
+        """Visão uint32 (um inteiro por pixel) do array RGBA, sem cópia"""
+        if not array.flags.c_contiguous:
+            raise ValueError("RGBA array must be C-contiguous")
+        return array.view(np.uint32).reshape(array.shape[:-1])
+
+    @staticmethod
+    def dark_mask(array, tolerance):
+        """Máscara dos pixels com r, g e b <= tolerância"""
+        mask = array[..., 0] <= tolerance
+        mask &= array[..., 1] <= tolerance
+        mask &= array[..., 2] <= tolerance
+        return mask
+
+    @staticmethod
+    def transparent_array(array, tolerance):
+        """Torna transparentes (0, 0, 0, 0) os pixels com r, g e b <= tolerância (in-place)"""
+        ImageOps._pixels(array)[ImageOps.dark_mask(array, tolerance)] = 0
+        return array
+
+    @staticmethod
+    def transparent_edge_array(array, tolerance):
+        """Como transparent_array, mas só remove a região escura conectada à borda (in-place)"""
+        mask = ImageOps.border_connected(ImageOps.dark_mask(array, tolerance))
+        ImageOps._pixels(array)[mask] = 0
+        return array
+
+    @staticmethod
+    def border_connected(mask):
+        """Flood fill (4-conectado) a partir da borda, por scanline: opera sobre runs horizontais
+
+        Cada linha vira uma lista de runs [início, fim); runs de linhas vizinhas que se
+        sobrepõem são conectados e os componentes são rotulados por union-find
+        vetorizado. O número de passadas cresce com o log do número de runs, não com o
+        comprimento do caminho (corredores em serpentina não degeneram).
+        """
+        height, width = mask.shape
+        if not mask.any():
+            return mask
+
+        # Linhas achatadas com uma coluna separadora falsa no fim: as transições alternam
+        # início/fim de run e o índice achatado já é a chave ordenada linha * (largura + 1) + coluna
+        stride = width + 1
+        flat = np.zeros((height, stride), dtype=bool)
+        flat[:, :width] = mask
+        flat = flat.ravel()
+        transitions = np.flatnonzero(flat[1:] != flat[:-1]) + 1
+        if flat[0]:
+            transitions = np.concatenate([[0], transitions])
+        start_keys = transitions[0::2]
+        end_keys = transitions[1::2]
+        run_rows = start_keys // stride
+        run_starts = start_keys - run_rows * stride
+        run_ends = end_keys - run_rows * stride
+
+        # Para cada run, o intervalo [lo, hi) de runs da linha de cima que se sobrepõem a ele
+        above = (run_rows - 1) * stride
+        lo = np.searchsorted(end_keys, above + run_starts, side="right")
+        hi = np.searchsorted(start_keys, above + run_ends, side="left")
+        counts = np.where(run_rows > 0, np.maximum(hi - lo, 0), 0)
+
+        below_runs = np.repeat(np.arange(len(run_rows)), counts)
+        above_runs = ImageOps._expand_ranges(lo, counts)
+
+        # Componentes dos runs; alcançados são os que contêm algum run tocando a borda
+        labels = ImageOps._component_labels(len(run_rows), below_runs, above_runs)
+        touches = (run_rows == 0) | (run_rows == height - 1) | (run_starts == 0) | (run_ends == width)
+        border_labels = np.zeros(len(run_rows), dtype=bool)
+        border_labels[labels[touches]] = True
+        reached = border_labels[labels]
+
+        # Pintar os runs alcançados de volta em uma máscara (+1 no início, -1 no fim)
+        marks = np.zeros(height * stride, dtype=np.int8)
+        marks[start_keys[reached]] = 1
+        marks[end_keys[reached]] = -1
+        return np.cumsum(marks, dtype=np.int8).reshape(height, stride)[:, :width].astype(bool)
+
+    @staticmethod
+    def _component_labels(count, sources, targets):
+        """Union-find vetorizado: rótulo (menor índice) do componente de cada nó
+
+        A cada rodada, a raiz maior de cada aresta é ligada à menor e as árvores são
+        achatadas por saltos de ponteiro. Toda raiz que não é mínimo local desaparece,
+        então as rodadas são O(log n).
+        """
+        parent = np.arange(count)
+        while True:
+            root_a, root_b = parent[sources], parent[targets]
+            differ = root_a != root_b
+            if not differ.any():
+                return parent
+            sources, targets = sources[differ], targets[differ]
+            root_a, root_b = root_a[differ], root_b[differ]
+            np.minimum.at(parent, np.maximum(root_a, root_b), np.minimum(root_a, root_b))
+            while True:
+                grandparent = parent[parent]
+                if np.array_equal(grandparent, parent):
+                    break
+                parent = grandparent
+
+    @staticmethod
+    def _expand_ranges(starts, counts):
+        """Concatena os intervalos [start, start + count) de forma vetorizada"""
+        total = int(counts.sum())
+        if not total:
+            return np.zeros(0, dtype=np.int64)
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        return offsets + np.arange(total)
+
+    @staticmethod
+    def tint_array(array, color):
+        """Substitui o RGB dos pixels visíveis (alpha > 0) pela cor, mantendo o alpha (in-place)"""
+        r, g, b = color[:3]
+        packed = np.array([r, g, b, 0], dtype=np.uint8).view(np.uint32)[0]
+        pixels = ImageOps._pixels(array)
+        alpha = pixels & ImageOps.ALPHA_MASK
+        np.copyto(pixels, alpha | packed, where=alpha != 0)
+        return array
+
+    @staticmethod
+    def luma(array):
+        """Luminância (0-255) de cada pixel (conversão "L" do Pillow, ITU-R 601)"""
+        return np.asarray(Image.fromarray(array, "RGBA").convert("L"))
+
+    @staticmethod
+    def apply_luma_lut(array, lut):
+        """Substitui o RGB por lut[luminância] (tabela 256 x 3), mantendo o alpha (in-place)"""
+        packed = np.zeros((256, 4), dtype=np.uint8)
+        packed[:, :3] = lut
+        pixels = ImageOps._pixels(array)
+        np.bitwise_or(pixels & ImageOps.ALPHA_MASK, packed.view(np.uint32)[:, 0][ImageOps.luma(array)], out=pixels)
+        return array
+
+    @staticmethod
+    def colorize_array(array, color):
+        """Tint que preserva o sombreamento: preto -> cor -> branco conforme a luminância (in-place)"""
+        return ImageOps.apply_luma_lut(array, ImageOps._colorize_lut(tuple(color[:3])))
+
+    @staticmethod
+    def gradient_map_array(array, color, shadow_color=(0, 0, 0)):
+        """Mapa de gradiente: sombras na cor de sombra, luzes na cor principal (in-place)"""
+        return ImageOps.apply_luma_lut(array, ImageOps._gradient_lut(tuple(shadow_color[:3]), tuple(color[:3])))
+
+    @staticmethod
+    def hue_shift_array(array, color):
+        """Gira o matiz (HSV) de todos os pixels pelo matiz da cor, mantendo S, V e alpha (in-place)"""
+        hue = colorsys.rgb_to_hsv(*(c / 255 for c in color[:3]))[0]
+        shift = round(hue * 256) % 256
+        if shift:
+            image = Image.fromarray(array, "RGBA").filter(ImageOps._hue_lut(shift))
+            array[...] = np.asarray(image)
+        return array
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _colorize_lut(color):
+        """Tabela 256 x 3: preto até a cor (na luminância da cor) e da cor até o branco"""
+        target = np.array(color, dtype=np.float64)
+        pivot = max(1.0, min(254.0, (color[0] * 299 + color[1] * 587 + color[2] * 114) / 1000))
+        levels = np.arange(256, dtype=np.float64)[:, None]
+        dark = target * levels / pivot
+        light = target + (255 - target) * (levels - pivot) / (255 - pivot)
+        lut = np.round(np.where(levels <= pivot, dark, light)).clip(0, 255).astype(np.uint8)
+        lut.setflags(write=False)
+        return lut
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _gradient_lut(shadow_color, highlight_color):
+        """Tabela 256 x 3 interpolando linearmente entre as duas cores"""
+        start = np.array(shadow_color, dtype=np.float64)
+        end = np.array(highlight_color, dtype=np.float64)
+        t = np.arange(256, dtype=np.float64)[:, None] / 255
+        lut = np.round(start + (end - start) * t).astype(np.uint8)
+        lut.setflags(write=False)
+        return lut
+
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def _hue_lut(shift, size=33):
+        """LUT 3D (interpolada pelo Pillow) que gira o matiz HSV em `shift`/256 de volta"""
+        levels = np.linspace(0, 255, size).round().astype(np.uint8)
+        # Ordem da tabela do Color3DLUT: r varia mais rápido, depois g, depois b
+        b, g, r = np.meshgrid(levels, levels, levels, indexing="ij")
+        grid = np.stack([r, g, b], axis=-1).reshape(1, -1, 3)
+        hsv = np.array(Image.fromarray(grid, "RGB").convert("HSV"))
+        hsv[..., 0] += np.uint8(shift)  # Estouro de uint8 = rotação circular do matiz
+        rgb = np.asarray(Image.fromarray(hsv, "HSV").convert("RGB"), dtype=np.float64) / 255
+        return ImageFilter.Color3DLUT(size, rgb.ravel().tolist())
+
+    @staticmethod
+    def chroma_key_array(array, key_color, tolerance, softness=0):
+        """Chroma key em RGB: alpha proporcional à distância euclidiana até a cor-chave (in-place)
+
+        Distância <= tolerância fica transparente; a rampa suave vai até tolerância + suavidade.
+        """
+        lut_r, lut_g, lut_b = ImageOps._channel_distance_luts(tuple(key_color[:3]))
+        distance = lut_r[array[..., 0]]
+        distance += lut_g[array[..., 1]]
+        distance += lut_b[array[..., 2]]
+        factor = ImageOps._rgb_alpha_lut(tolerance, softness)[distance]
+        return ImageOps._apply_alpha_factor(array, factor)
+
+    @staticmethod
+    def chroma_key_lab_array(array, key_color, tolerance, softness=0):
+        """Chroma key em Lab (ΔE perceptual), via tabela 3D de 64 níveis por canal (in-place)"""
+        lut = ImageOps._lab_alpha_lut(tuple(key_color[:3]), tolerance, softness)
+        index = (array[..., 0] >> 2).astype(np.int32) << 12
+        index |= (array[..., 1] >> 2).astype(np.int32) << 6
+        index |= array[..., 2] >> 2
+        return ImageOps._apply_alpha_factor(array, lut[index])
+
+    @staticmethod
+    def _apply_alpha_factor(array, factor):
+        """Multiplica o alpha por factor/255; pixels que zeram viram (0, 0, 0, 0)"""
+        alpha = array[..., 3].astype(np.uint16)
+        alpha *= factor
+        alpha += 127
+        alpha //= 255
+        array[..., 3] = alpha
+        ImageOps._pixels(array)[alpha == 0] = 0
+        return array
+
+    @staticmethod
+    def _ramp(distance, tolerance, softness):
+        """Fator de alpha (0-255) para distâncias: 0 até a tolerância, rampa linear na suavidade"""
+        if softness > 0:
+            ramp = (distance - tolerance) / softness
+        else:
+            ramp = (distance > tolerance).astype(np.float64)
+        lut = np.round(np.clip(ramp, 0.0, 1.0) * 255).astype(np.uint8)
+        lut.setflags(write=False)
+        return lut
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _channel_distance_luts(key_color):
+        """Tabelas (256 entradas) da distância ao quadrado por canal para uma cor-chave"""
+        values = np.arange(256, dtype=np.int32)
+        luts = tuple((values - channel) ** 2 for channel in key_color)
+        for lut in luts:
+            lut.setflags(write=False)
+        return luts
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _rgb_alpha_lut(tolerance, softness):
+        """Fator de alpha indexado pela distância RGB ao quadrado (0 a 3 * 255²); independe da cor-chave"""
+        distance = np.sqrt(np.arange(3 * 255 ** 2 + 1, dtype=np.float64))
+        return ImageOps._ramp(distance, tolerance, softness)
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _lab_distance_lut(key_color):
+        """ΔE (CIE76) até a cor-chave para cada célula RGB de 6 bits (64³ entradas)"""
+        centers = (np.arange(64, dtype=np.float64) * 4 + 1.5)
+        grid = np.stack(np.meshgrid(centers, centers, centers, indexing="ij"), axis=-1).reshape(-1, 3)
+        key = ImageOps.rgb_to_lab(np.array([key_color], dtype=np.float64))
+        distance = np.sqrt(((ImageOps.rgb_to_lab(grid) - key) ** 2).sum(axis=1))
+        distance.setflags(write=False)
+        return distance
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _lab_alpha_lut(key_color, tolerance, softness):
+        """Fator de alpha por célula RGB de 6 bits para a cor-chave, tolerância e suavidade"""
+        return ImageOps._ramp(ImageOps._lab_distance_lut(key_color), tolerance, softness)
+
+    @staticmethod
+    def rgb_to_lab(rgb):
+        """Converte cores sRGB (N x 3, 0-255) para CIE Lab (D65)"""
+        c = rgb / 255.0
+        linear = np.where(c > 0.04045, ((c + 0.055) / 1.055) ** 2.4, c / 12.92)
+        xyz = linear @ np.array([[0.4124, 0.2126, 0.0193],
+                                 [0.3576, 0.7152, 0.1192],
+                                 [0.1805, 0.0722, 0.9505]])
+        xyz /= np.array([0.95047, 1.0, 1.08883])
+        f = np.where(xyz > 0.008856, np.cbrt(xyz), 7.787 * xyz + 16 / 116)
+        return np.stack([116 * f[:, 1] - 16,
+                         500 * (f[:, 0] - f[:, 1]),
+                         200 * (f[:, 1] - f[:, 2])], axis=1)
+
+    @staticmethod
+    def make_transparent(img, tolerance):
+        """Remove o fundo escuro de uma imagem PIL e retorna uma nova imagem RGBA"""
+        array = ImageOps.to_array(img)
+        return ImageOps.to_image(ImageOps.transparent_array(array, tolerance))
+
+    @staticmethod
+    def apply_tint(img, color):
+        """Aplica uma cor sólida aos pixels visíveis e retorna uma nova imagem RGBA"""
+        array = ImageOps.to_array(img)
+        return ImageOps.to_image(ImageOps.tint_array(array, color))
+
+
+# Operações que dependem da imagem inteira (não podem ser aplicadas faixa a faixa)
+WHOLE_IMAGE_OPERATIONS = frozenset({ImageOps.transparent_edge_array})
@@ -0,0 +1,232 @@
+"""
+Worker de Imagem
+Executa operações de imagem no pool de threads com progresso e cancelamento
+"""
+
+import logging
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from utils.image_ops import ImageOps, WHOLE_IMAGE_OPERATIONS
+from utils.tiled_processor import open_image, is_streamable, process_tiled
+from utils.animation_ops import is_animated, process_animation
+
+logger = logging.getLogger(__name__)
+
+
+class Job(QRunnable):
+    """Base dos jobs do pool: sinais, cancelamento cooperativo e envio ao pool"""
+
+    signals_class = None  # Classe QObject com os sinais do job
+
+    def __init__(self):
+        super().__init__()
+        self.signals = self.signals_class()
+        self._cancelled = False
+        # Quem cria o job mantém a referência; evita que o pool destrua o objeto
+        self.setAutoDelete(False)
+
+    def cancel(self):
+        """Solicita o cancelamento; o job para no próximo ponto de verificação"""
+        self._cancelled = True
+
+    def is_cancelled(self):
+        """Indica se o cancelamento foi solicitado"""
+        return self._cancelled
+
+    def emit_progress(self, done, total, *_):
+        """Converte o avanço (done de total) em porcentagem para o sinal de progresso"""
+        self.signals.progress.emit(100 * done // total)
+
+    def start(self, pool=None):
+        """Envia o job para o pool (global por padrão)"""
+        (pool or QThreadPool.globalInstance()).start(self)
+
+
+class ImageJobSignals(QObject):
+    """Sinais emitidos por um ImageJob (entregues na thread da UI)"""
+    progress = pyqtSignal(int)      # 0-100
+    finished = pyqtSignal(str)      # caminho do arquivo salvo
+    error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class ImageJob(Job):
+    """Aplica uma operação in-place sobre o array RGBA, em faixas de linhas"""
+
+    signals_class = ImageJobSignals
+
+    STRIP_ROWS = 256  # Linhas processadas entre verificações de cancelamento
+    TILED_THRESHOLD = 50_000_000  # Acima disso (pixels) processa em faixas com memória limitada
+
+    def __init__(self, image_path, output_path, operation, *args):
+        super().__init__()
+        self.image_path = image_path
+        self.output_path = output_path
+        self.operation = operation
+        self.args = args
+        # EditHistory opcional: encadeia sobre o estado atual e registra o resultado como um passo
+        self.history = None
+        self.label = ""
+        self.tiled = False  # Processado em faixas: sem encadeamento nem passo no histórico
+
+    def run(self):
+        """Executa o job na thread do pool"""
+        try:
+            whole_image = self.operation in WHOLE_IMAGE_OPERATIONS
+            if self.history is not None and self.history.current_state() is not None:
+                # Encadeado: parte do estado atual do histórico, não do arquivo
+                pixels = self.history.pixels()
+                height = pixels.shape[0]
+            else:
+                if is_animated(self.image_path):
+                    self.run_animated()
+                    return
+                with open_image(self.image_path) as img:
+                    width, height = img.size
+                    # Formatos que precisam ser decodificados inteiros seguem pelo caminho em memória
+                    tiled = width * height > self.TILED_THRESHOLD and not whole_image and is_streamable(img)
+                if tiled:
+                    self.run_tiled()
+                    return
+
+                pixels = ImageOps.load_rgba(self.image_path)
+                if self.history is not None:
+                    self.history.reset(pixels)
+            self.signals.progress.emit(10)
+
+            # Operações de imagem inteira rodam em uma única "faixa"
+            strip_rows = height if whole_image else self.STRIP_ROWS
+            for top in range(0, height, strip_rows):
+                if self._cancelled:
+                    self.signals.cancelled.emit()
+                    return
+                self.operation(pixels[top:top + strip_rows], *self.args)
+                done = min(top + strip_rows, height)
+                self.signals.progress.emit(10 + 80 * done // max(height, 1))
+
+            if self._cancelled:
+                self.signals.cancelled.emit()
+                return
+
+            if self.history is not None:
+                self.history.push(pixels, self.label)
+            ImageOps.to_image(pixels).save(self.output_path)
+            self.signals.progress.emit(100)
+            self.signals.finished.emit(self.output_path)
+        except Exception as e:
+            logger.error(f"Erro no job de imagem {self.image_path}: {e}")
+            self.signals.error.emit(str(e))
+
+    def run_tiled(self):
+        """Imagens muito grandes: faixas lidas, processadas e gravadas incrementalmente (fora do histórico)"""
+        self.tiled = True
+        report = process_tiled(
+            self.image_path, self.output_path, self.operation, *self.args,
+            progress_callback=self.emit_progress,
+            cancel_check=self.is_cancelled,
+        )
+        if report["completed"]:
+            self.signals.finished.emit(self.output_path)
+        else:
+            self.signals.cancelled.emit()
+
+    def run_animated(self):
+        """Animações: todos os quadros em um pool de processos, mantendo tempos e disposal"""
+        report = process_animation(
+            self.image_path, self.output_path, self.operation, *self.args,
+            progress_callback=self.emit_progress,
+            cancel_check=self.is_cancelled,
+        )
+        if report["completed"]:
+            self.signals.finished.emit(self.output_path)
+        else:
+            self.signals.cancelled.emit()
+
+
+class BatchJobSignals(QObject):
+    """Sinais emitidos por um BatchJob (entregues na thread da UI)"""
+    progress = pyqtSignal(int)      # 0-100
+    finished = pyqtSignal(object)   # relatório do BatchProcessor
+    error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class BatchJob(Job):
+    """Conduz um BatchProcessor (pool de processos) a partir de uma thread do pool"""
+
+    signals_class = BatchJobSignals
+
+    def __init__(self, processor, files):
+        super().__init__()
+        self.processor = processor
+        self.files = files
+
+    def run(self):
+        """Executa o lote na thread do pool"""
+        try:
+            report = self.processor.run(
+                self.files,
+                progress_callback=self.emit_progress,
+                cancel_check=self.is_cancelled,
+            )
+            if report["cancelled"]:
+                self.signals.cancelled.emit()
+            else:
+                self.signals.finished.emit(report)
+        except Exception as e:
+            logger.error(f"Erro no processamento em lote: {e}")
+            self.signals.error.emit(str(e))
+
+
+class ExportJob(Job):
+    """Conduz um Exporter (codificação paralela) a partir de uma thread do pool"""
+
+    signals_class = BatchJobSignals
+
+    def __init__(self, exporter, source, output_dir, stem=None):
+        super().__init__()
+        self.exporter = exporter
+        self.source = source  # Caminho ou array RGBA
+        self.output_dir = output_dir
+        self.stem = stem
+
+    def run(self):
+        """Executa a exportação na thread do pool"""
+        try:
+            report = self.exporter.run(
+                self.source, self.output_dir, self.stem,
+                progress_callback=self.emit_progress,
+                cancel_check=self.is_cancelled,
+            )
+            if report["cancelled"]:
+                self.signals.cancelled.emit()
+            else:
+                self.signals.finished.emit(report)
+        except Exception as e:
+            logger.error(f"Erro na exportação: {e}")
+            self.signals.error.emit(str(e))
+
+
+class CallableJobSignals(QObject):
+    """Sinais emitidos por um CallableJob (entregues na thread da UI)"""
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+
+class CallableJob(Job):
+    """Executa uma função qualquer no pool e entrega o retorno na thread da UI"""
+
+    signals_class = CallableJobSignals
+
+    def __init__(self, function, *args):
+        super().__init__()
+        self.function = function
+        self.args = args
+
+    def run(self):
+        """Executa a função na thread do pool"""
+        try:
+            self.signals.finished.emit(self.function(*self.args))
+        except Exception as e:
+            logger.error(f"Erro no job {getattr(self.function, '__name__', self.function)}: {e}")
+            self.signals.error.emit(str(e))
@@ -0,0 +1,367 @@
+"""
+Motor de Encerramento
+Encerra os processos e serviços de uma lista declarativa (JSON) a partir de uma única leitura da tabela de processos
+
+Uma lista (ex.: Engine/Tools/killlists/asusdie.json) tem nomes exatos
+("processes"), padrões glob ("globs"), expressões regulares ("regexes"),
+exceções ("allow", que sempre vencem) e serviços ("services"). Nomes, globs e
+regexes também aceitam um objeto {"name": ..., "timeout": s} com um tempo
+próprio. As regras são compiladas uma vez em um RuleMatcher. Com "session", os
+apps encontrados são gravados antes do encerramento para serem relançados depois
+(ver utils.session_snapshot). Executáveis em "restart" (ex.: explorer.exe no
+modo SteamOS) são relançados logo após o encerramento, como os scripts .bat
+faziam com "start explorer.exe".
+
+Todos os processos encontrados recebem o pedido de encerramento de uma vez.
+Quem não sair no prazo é forçado. No Windows o pedido (WM_CLOSE) só chega a
+quem tem janela; processos sem janela são forçados de imediato. A espera é pela
+saída real dos processos, sem pausas fixas.
+
+Uso headless:
+    python -m utils.kill_engine asusdie
+    python -m utils.kill_engine steamos --dry-run
+    python -m utils.kill_engine path/to/list.json --json
+"""
+
+import os
+import sys
+import json
+import time
+import ctypes
+import logging
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+import psutil
+
+from utils.process_table import ProcessTable, EXPENSIVE_FIELDS
+from utils.rule_matcher import RuleMatcher, REGEX_PREFIX
+from utils.session_snapshot import save_session, launch
+
+logger = logging.getLogger(__name__)
+
+KILLLISTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Engine", "Tools", "killlists")
+DEFAULT_TIMEOUT = 3.0  # Segundos para sair após o pedido educado
+KILL_TIMEOUT = 2.0  # Segundos para sair após o encerramento forçado
+SERVICE_POLL_SECONDS = 0.1
+CREATE_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+# Processos essenciais do sistema: nenhuma lista consegue encerrá-los
+SYSTEM_ALLOWLIST = ("System", "Registry", "smss.exe", "csrss.exe", "wininit.exe", "winlogon.exe",
+                    "services.exe", "lsass.exe", "svchost.exe", "fontdrvhost.exe", "MsMpEng.exe",
+                    "systemd", "init", "launchd", "kernel_task")
+
+
+def windowed_pids():
+    """PIDs donos de alguma janela de nível superior no Windows (só eles recebem o WM_CLOSE do taskkill)"""
+    from ctypes import wintypes
+    user32 = ctypes.windll.user32
+    owner = wintypes.DWORD()
+    pids = set()
+
+    @ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+    def collect(hwnd, _):
+        user32.GetWindowThreadProcessId(hwnd, ctypes.byref(owner))
+        pids.add(owner.value)
+        return True
+
+    user32.EnumWindows(collect, 0)
+    return pids
+
+
+def resolve_kill_list(name_or_path):
+    """Caminho da lista: arquivo existente ou nome dentro de Engine/Tools/killlists"""
+    if os.path.isfile(name_or_path):
+        return name_or_path
+    path = os.path.join(KILLLISTS_DIR, f"{name_or_path}.json")
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"Kill list not found: {name_or_path}")
+    return path
+
+
+def available_kill_lists():
+    """Nomes das listas distribuídas com o Draconic"""
+    if not os.path.isdir(KILLLISTS_DIR):
+        return []
+    return sorted(os.path.splitext(f)[0] for f in os.listdir(KILLLISTS_DIR) if f.endswith(".json"))
+
+
+def normalize_rules(items, default_timeout):
+    """Converte entradas "nome" ou {"name": ..., "timeout": ...} em (padrão, timeout)"""
+    rules = []
+    for item in items:
+        if isinstance(item, str):
+            rules.append((item, default_timeout))
+        else:
+            rules.append((item["name"], float(item.get("timeout", default_timeout))))
+    return rules
+
+
+def load_kill_list(name_or_path):
+    """Lê e normaliza uma lista de encerramento"""
+    path = resolve_kill_list(name_or_path)
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    timeout = float(data.get("timeout", DEFAULT_TIMEOUT))
+    return {
+        "name": data.get("name") or os.path.splitext(os.path.basename(path))[0],
+        "path": path,
+        "timeout": timeout,
+        "processes": normalize_rules(data.get("processes", []), timeout),
+        "globs": normalize_rules(data.get("globs", []), timeout),
+        "regexes": [(REGEX_PREFIX + pattern, t) for pattern, t in normalize_rules(data.get("regexes", []), timeout)],
+        "allow": list(data.get("allow", [])),
+        "services": list(data.get("services", [])),
+        "session": data.get("session", ""),
+        "restart": list(data.get("restart", [])),
+    }
+
+
+class KillEngine:
+    """Aplica uma lista de encerramento: uma varredura, pedidos simultâneos e escalonamento por prazo"""
+
+    def __init__(self, kill_list, kill_timeout=KILL_TIMEOUT, protected_pids=None):
+        self.kill_list = kill_list
+        self.kill_timeout = kill_timeout
+        self.matcher = RuleMatcher(kill_list["processes"] + kill_list["globs"] + kill_list["regexes"],
+                                   list(SYSTEM_ALLOWLIST) + kill_list["allow"])
+        # Nunca encerrar o próprio Draconic nem quem o iniciou
+        self.protected_pids = set(protected_pids or ()) | {os.getpid(), os.getppid()}
+
+    def match(self, name):
+        """Regra (texto) e timeout que casam com o nome do executável, ou None (sem regra ou permitido)"""
+        return self.matcher.match(name)
+
+    def scan(self, table=None):
+        """Processos da tabela que casam com a lista: [(entrada, regra, timeout)]"""
+        if table is None:
+            # Só o nome de cada processo; exe/cmdline/usuário apenas para quem casar
+            table = ProcessTable(fields=(), expensive_fields=("name",))
+            table.refresh()
+        missing = [field for field in EXPENSIVE_FIELDS if field not in table.expensive_fields]
+        targets = []
+        for entry in table:
+            if entry.pid in self.protected_pids or not entry.name:
+                continue
+            rule = self.match(entry.name)
+            if rule is None:
+                continue
+            if missing:
+                try:
+                    entry.load(missing)
+                except psutil.NoSuchProcess:
+                    continue  # Já saiu
+                except psutil.Error:
+                    pass  # Sem detalhes, mas ainda é alvo
+            targets.append((entry, rule[0], rule[1]))
+        return targets
+
+    def terminate_processes(self, targets, graceful=True):
+        """Pede o encerramento de todos, força quem estourar o prazo e espera a saída real
+        (graceful=False força de imediato, sem o pedido educado)"""
+        results = []
+        pending = {}  # psutil.Process -> [resultado, prazo, forçado]
+        start = time.monotonic()
+        for entry, rule, timeout in targets:
+            result = {"pid": entry.pid, "name": entry.name, "rule": rule, "status": "", "seconds": 0.0}
+            results.append(result)
+            try:
+                proc = psutil.Process(entry.pid)
+                if proc.create_time() != entry.create_time:
+                    result["status"] = "gone"  # PID reutilizado desde a varredura
+                    continue
+                pending[proc] = [result, start + timeout, False]
+            except psutil.NoSuchProcess:
+                result["status"] = "gone"
+
+        for proc in self._request_exit(list(pending)) if graceful else list(pending):
+            pending[proc][1] = start  # Sem como pedir educadamente: força já
+        while pending:
+            now = time.monotonic()
+            for proc, state in list(pending.items()):
+                result, deadline, forced = state
+                if now < deadline:
+                    continue
+                if forced:
+                    result["status"] = "failed"
+                    result["error"] = "still running after kill"
+                    result["seconds"] = now - start
+                    del pending[proc]
+                    continue
+                try:
+                    proc.kill()
+                except psutil.NoSuchProcess:
+                    pass
+                except psutil.AccessDenied as e:
+                    result["status"] = "failed"
+                    result["error"] = f"access denied: {e}"
+                    result["seconds"] = now - start
+                    del pending[proc]
+                    continue
+                state[1], state[2] = now + self.kill_timeout, True
+            if not pending:
+                break
+
+            def on_exit(proc):
+                result, _, forced = pending.pop(proc)
+                result["status"] = "killed" if forced else "terminated"
+                result["seconds"] = time.monotonic() - start
+
+            # Volta quando todos saírem ou no próximo prazo, o que vier primeiro
+            wait = max(0.0, min(state[1] for state in pending.values()) - time.monotonic())
+            psutil.wait_procs(list(pending), timeout=wait, callback=on_exit)
+        return results
+
+    def _request_exit(self, procs):
+        """Pedido educado: SIGTERM no POSIX; no Windows um único taskkill sem /F (WM_CLOSE) para os que
+        têm janela. Retorna os processos que não podem receber o pedido (sem janela) para forçar já"""
+        if not procs:
+            return []
+        if os.name == "nt":
+            try:
+                windowed = windowed_pids()
+            except OSError as e:
+                logger.warning(f"Não foi possível listar as janelas ({e}); pedindo o encerramento a todos")
+                windowed = {proc.pid for proc in procs}
+            command = ["taskkill"]
+            for proc in procs:
+                if proc.pid in windowed:
+                    command += ["/PID", str(proc.pid)]
+            if len(command) > 1:
+                subprocess.run(command, capture_output=True, creationflags=CREATE_NO_WINDOW)
+            return [proc for proc in procs if proc.pid not in windowed]
+        for proc in procs:
+            try:
+                proc.terminate()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass  # A espera/escalonamento registra o resultado
+        return []
+
+    def stop_service(self, name):
+        """Para um serviço do Windows e espera até ele constar como parado"""
+        start = time.monotonic()
+        result = {"name": name, "status": "", "seconds": 0.0}
+        if not hasattr(psutil, "win_service_get"):
+            result["status"] = "unsupported"
+            return result
+        try:
+            service = psutil.win_service_get(name)
+            if service.status() == "stopped":
+                result["status"] = "not_running"
+                return result
+            completed = subprocess.run(["sc", "stop", name], capture_output=True, text=True,
+                                       creationflags=CREATE_NO_WINDOW)
+            if completed.returncode != 0:
+                result["status"] = "failed"
+                result["error"] = (completed.stdout or completed.stderr).strip()
+                return result
+            deadline = start + self.kill_list["timeout"] + self.kill_timeout
+            while service.status() != "stopped":
+                if time.monotonic() >= deadline:
+                    result["status"] = "failed"
+                    result["error"] = "timed out waiting for the service to stop"
+                    return result
+                time.sleep(SERVICE_POLL_SECONDS)
+            result["status"] = "stopped"
+        except psutil.NoSuchProcess:
+            result["status"] = "not_found"
+        except (psutil.AccessDenied, OSError) as e:
+            result["status"] = "failed"
+            result["error"] = str(e)
+        finally:
+            result["seconds"] = time.monotonic() - start
+        return result
+
+    def restart_processes(self, targets, results):
+        """Relança uma vez cada executável de "restart" que foi encerrado (ex.: o shell no modo SteamOS)"""
+        wanted = {name.lower() for name in self.kill_list["restart"]}
+        launched = {}
+        for (entry, _, _), result in zip(targets, results):
+            if entry.name.lower() not in wanted or not entry.exe or entry.exe.lower() in launched:
+                continue
+            if result["status"] in ("terminated", "killed"):
+                launched[entry.exe.lower()] = launch({"name": entry.name, "exe": entry.exe, "cmdline": [entry.exe]})
+        return list(launched.values())
+
+    def run(self, dry_run=False, table=None):
+        """Executa a lista e retorna o relatório estruturado"""
+        start = time.monotonic()
+        targets = self.scan(table)
+        scan_seconds = time.monotonic() - start
+        matched_rules = {rule.lower() for _, rule, _ in targets}
+        report = {
+            "name": self.kill_list["name"],
+            "dry_run": dry_run,
+            "scan_seconds": scan_seconds,
+            "processes": [],
+            "services": [],
+            "not_running": [rule for rule, _ in
+                            self.kill_list["processes"] + self.kill_list["globs"] + self.kill_list["regexes"]
+                            if rule.lower() not in matched_rules],
+        }
+        if dry_run:
+            report["processes"] = [{"pid": entry.pid, "name": entry.name, "rule": rule, "status": "matched",
+                                    "seconds": 0.0} for entry, rule, _ in targets]
+            report["services"] = [{"name": name, "status": "skipped", "seconds": 0.0}
+                                  for name in self.kill_list["services"]]
+        else:
+            if self.kill_list["session"]:
+                report["session"] = save_session(self.kill_list["session"], [entry for entry, _, _ in targets],
+                                                 self.kill_list["name"])
+            # Serviços param em paralelo (cada sc stop é assíncrono) enquanto os processos saem
+            services = self.kill_list["services"]
+            with ThreadPoolExecutor(max_workers=max(1, min(8, len(services)))) as executor:
+                futures = [executor.submit(self.stop_service, name) for name in services]
+                report["processes"] = self.terminate_processes(targets)
+                report["services"] = [future.result() for future in futures]
+            report["restarted"] = self.restart_processes(targets, report["processes"])
+
+        restarted = report.get("restarted", [])
+        report["failed"] = sum(1 for r in report["processes"] + report["services"] + restarted
+                               if r["status"] in ("failed", "missing"))
+        report["seconds"] = time.monotonic() - start
+        logger.info(f"Lista '{report['name']}': {len(report['processes'])} processos, "
+                    f"{report['failed']} falhas em {report['seconds']:.2f} s")
+        return report
+
+
+def format_report(report):
+    """Formata o relatório de encerramento para exibição"""
+    lines = []
+    for result in report["processes"]:
+        error = f" ({result['error']})" if result.get("error") else ""
+        lines.append(f"  {result['status']:<11}{result['pid']:>8} {result['name']}"
+                     f" [{result['rule']}] {result['seconds'] * 1000:.0f} ms{error}")
+    for result in report["services"]:
+        error = f" ({result['error']})" if result.get("error") else ""
+        lines.append(f"  {result['status']:<11}{'service':>8} {result['name']}{error}")
+    for result in report.get("restarted", []):
+        error = f" ({result['error']})" if result.get("error") else ""
+        lines.append(f"  {result['status']:<11}{'restart':>8} {result['name']}{error}")
+    lines.append(f"{report['name']}{' (dry run)' if report['dry_run'] else ''}: "
+                 f"{len(report['processes'])} processes, {len(report['services'])} services, "
+                 f"{report['failed']} failed in {report['seconds']:.2f} s "
+                 f"(scan {report['scan_seconds'] * 1000:.0f} ms, {len(report['not_running'])} rules not running)")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Ponto de entrada headless"""
+    parser = argparse.ArgumentParser(description="Terminate the processes and services of a kill list")
+    parser.add_argument("kill_list", help=f"Kill list file or name ({', '.join(available_kill_lists())})")
+    parser.add_argument("--dry-run", action="store_true", help="Only list what would be terminated")
+    parser.add_argument("--kill-timeout", type=float, default=KILL_TIMEOUT,
+                        help="Seconds to wait after a forced kill")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        engine = KillEngine(load_kill_list(args.kill_list), kill_timeout=args.kill_timeout)
+    except (OSError, ValueError, KeyError) as e:
+        parser.error(f"Invalid kill list {args.kill_list}: {e}")
+    report = engine.run(dry_run=args.dry_run)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""
+Tabela de Processos
+Snapshot incremental dos processos, com chave (pid, create_time) e diffs a cada atualização
+
+Campos caros (nome, exe, cmdline, usuário) são lidos uma única vez, quando o
+processo aparece. Nas atualizações seguintes, só os campos baratos dos processos
+já conhecidos são relidos, em uma leitura agrupada (oneshot) do psutil.Process
+guardado na entrada. Um PID reutilizado entre duas atualizações é reconhecido
+quando o tempo de CPU volta atrás. O resultado vem como um diff de
+adicionados/removidos/alterados. Com fields=() a atualização só compara a lista de
+PIDs, que é o modo mais barato para quem só precisa saber quem entrou e quem saiu.
+Com expensive_fields=("name",) só o nome é lido; ProcessEntry.load() busca o
+resto depois, apenas para os processos que interessarem.
+
+Uso headless:
+    python -m utils.process_table --interval 1 --count 5
+"""
+
+import sys
+import time
+import logging
+import argparse
+import psutil
+
+logger = logging.getLogger(__name__)
+
+EXPENSIVE_FIELDS = ("name", "exe", "cmdline", "username")
+CHEAP_FIELDS = ("status", "cpu_times", "memory_info")
+
+
+class ProcessEntry:
+    """Um processo da tabela: identidade fixa, campos caros lidos uma vez e campos baratos atualizados"""
+
+    def __init__(self, pid, create_time, info):
+        self.pid = pid
+        self.create_time = create_time
+        self.key = (pid, create_time)
+        self.name = info.get("name") or ""
+        self.exe = info.get("exe") or ""
+        self.cmdline = info.get("cmdline") or []
+        self.username = info.get("username") or ""
+        self.values = {}  # Campo barato -> último valor lido
+        self.proc = None  # psutil.Process guardado (create_time em cache) para as releituras
+
+    def __repr__(self):
+        return f"ProcessEntry(pid={self.pid}, name={self.name!r})"
+
+    def load(self, fields=EXPENSIVE_FIELDS):
+        """Lê campos caros que a tabela não leu (ex.: só para quem casou com uma regra)"""
+        proc = psutil.Process(self.pid)
+        if proc.create_time() != self.create_time:
+            raise psutil.NoSuchProcess(self.pid)  # PID reutilizado
+        info = proc.as_dict(attrs=list(fields), ad_value=None)
+        for field in fields:
+            setattr(self, field, info.get(field) or ([] if field == "cmdline" else ""))
+
+
+class ProcessDiff:
+    """Resultado de uma atualização: adicionados, removidos e alterados (entrada, {campo: (antes, depois)})"""
+
+    def __init__(self):
+        self.added = []
+        self.removed = []
+        self.changed = []
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def __repr__(self):
+        return f"ProcessDiff(+{len(self.added)} -{len(self.removed)} ~{len(self.changed)})"
+
+
+class ProcessTable:
+    """Tabela de processos mantida entre atualizações"""
+
+    def __init__(self, fields=CHEAP_FIELDS, expensive_fields=EXPENSIVE_FIELDS):
+        self.fields = tuple(fields)
+        self.expensive_fields = tuple(expensive_fields)
+        self.entries = {}  # (pid, create_time) -> ProcessEntry
+        self._keys = {}  # pid -> chave atual
+        self.last_refresh_seconds = 0.0  # Tempo de CPU da última atualização
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(list(self.entries.values()))
+
+    def get(self, pid):
+        """Entrada atual do PID (None se desconhecido)"""
+        key = self._keys.get(pid)
+        return self.entries.get(key) if key is not None else None
+
+    def by_name(self, name):
+        """Entradas cujo nome de executável é `name` (sem diferenciar maiúsculas)"""
+        name = name.lower()
+        return [entry for entry in self.entries.values() if entry.name.lower() == name]
+
+    def _add(self, proc, diff):
+        """Registra um processo novo, lendo os campos caros uma única vez"""
+        with proc.oneshot():
+            info = proc.as_dict(attrs=self.expensive_fields + self.fields, ad_value=None)
+            entry = ProcessEntry(proc.pid, proc.create_time(), info)
+        entry.proc = proc
+        entry.values = {field: info.get(field) for field in self.fields}
+        self.entries[entry.key] = entry
+        self._keys[entry.pid] = entry.key
+        diff.added.append(entry)
+
+    def _remove(self, pid, diff):
+        """Tira o PID da tabela"""
+        entry = self.entries.pop(self._keys.pop(pid), None)
+        if entry is not None:
+            diff.removed.append(entry)
+
+    def _update(self, entry, diff):
+        """Relê só os campos baratos, em uma leitura agrupada (oneshot) do Process guardado"""
+        proc = entry.proc
+        with proc.oneshot():
+            values = proc.as_dict(attrs=self.fields, ad_value=None)
+        before, after = entry.values.get("cpu_times"), values.get("cpu_times")
+        if before is not None and after is not None and sum(after[:2]) < sum(before[:2]):
+            # Tempo de CPU não volta atrás: o PID foi reutilizado por outro processo
+            self._remove(entry.pid, diff)
+            self._add(psutil.Process(entry.pid), diff)
+            return
+        changes = {field: (entry.values.get(field), value)
+                   for field, value in values.items() if entry.values.get(field) != value}
+        if changes:
+            entry.values.update(values)
+            diff.changed.append((entry, changes))
+
+    def refresh(self):
+        """Atualiza a tabela e retorna o diff em relação ao snapshot anterior"""
+        start = time.process_time()
+        diff = ProcessDiff()
+        current = set(psutil.pids())
+
+        for pid in list(self._keys):
+            if pid not in current:
+                self._remove(pid, diff)
+
+        for pid in sorted(current):
+            try:
+                entry = self.get(pid)
+                if entry is None:
+                    self._add(psutil.Process(pid), diff)
+                elif self.fields:
+                    self._update(entry, diff)
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                # Saiu entre a listagem e a leitura
+                if pid in self._keys:
+                    self._remove(pid, diff)
+            except psutil.AccessDenied:
+                continue
+
+        self.last_refresh_seconds = time.process_time() - start
+        return diff
+
+
+def main(argv=None):
+    """Ponto de entrada headless: mostra os diffs e o custo de cada atualização"""
+    parser = argparse.ArgumentParser(description="Incremental process table")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between refreshes")
+    parser.add_argument("--count", type=int, default=5, help="Number of refreshes after the first snapshot")
+    parser.add_argument("--fields", default=",".join(CHEAP_FIELDS),
+                        help="Cheap fields refreshed for known processes (empty = PID list only)")
+    args = parser.parse_args(argv)
+
+    fields = [f.strip() for f in args.fields.split(",") if f.strip()]
+    table = ProcessTable(fields=fields)
+    table.refresh()
+    print(f"{len(table)} processes (initial snapshot {table.last_refresh_seconds * 1000:.1f} ms CPU)")
+    for _ in range(args.count):
+        time.sleep(args.interval)
+        diff = table.refresh()
+        print(f"{len(table)} processes, +{len(diff.added)} -{len(diff.removed)} ~{len(diff.changed)} "
+              f"({table.last_refresh_seconds * 1000:.1f} ms CPU)")
+        for entry in diff.added:
+            print(f"  + {entry.pid:>7} {entry.name} {entry.username}")
+        for entry in diff.removed:
+            print(f"  - {entry.pid:>7} {entry.name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
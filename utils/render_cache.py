@@ -0,0 +1,58 @@
+"""
+Cache de Renderização
+Base comum dos caches que renderizam em worker threads e persistem o resultado em disco (PNG)
+"""
+
+import os
+import hashlib
+import logging
+
+from utils.app_cache import file_signature
+from utils.image_worker import CallableJob
+
+logger = logging.getLogger(__name__)
+
+
+class RenderCache:
+    """Uma renderização por chave em segundo plano; pedidos repetidos aguardam o mesmo job"""
+
+    def __init__(self, cache_dir, prefix):
+        self.cache_dir = cache_dir
+        self.prefix = prefix
+        self.jobs = {}  # chave -> (job, callbacks) em andamento
+
+    def make_key(self, source_path, *params):
+        """Chave a partir do arquivo de origem (caminho, tamanho, mtime) e dos parâmetros de renderização"""
+        raw = "|".join([str(file_signature(source_path)), *map(str, params)])
+        return self.prefix + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def disk_path(self, key):
+        """Caminho do PNG em disco para a chave"""
+        return os.path.join(self.cache_dir, f"{key}.png")
+
+    def submit(self, key, callback, render, *args, fallback=None):
+        """Agenda render(*args, caminho_em_disco) no worker; o callback recebe o resultado na thread da UI"""
+        if key in self.jobs:
+            self.jobs[key][1].append(callback)
+            return
+
+        job = CallableJob(render, *args, self.disk_path(key))
+        job.signals.finished.connect(lambda result: self.finish(key, self.prepare(key, result)))
+        job.signals.error.connect(lambda message: self.on_error(key, message, fallback))
+        self.jobs[key] = (job, [callback])
+        job.start()
+
+    def prepare(self, key, result):
+        """Adapta o resultado do worker antes da entrega (executa na thread da UI)"""
+        return result
+
+    def on_error(self, key, message, fallback):
+        """Falha na renderização: os interessados recebem o valor de fallback (ou None)"""
+        logger.warning(f"Falha ao renderizar {self.disk_path(key)}: {message}")
+        self.finish(key, fallback() if fallback else None)
+
+    def finish(self, key, result):
+        """Notifica os interessados na thread da UI"""
+        _, callbacks = self.jobs.pop(key, (None, []))
+        for callback in callbacks:
+            callback(result)
@@ -0,0 +1,333 @@
+"""
+Vigia de Reaparecimento
+Encerra de novo os processos de uma lista de encerramento que voltam (ex.: relançados pelos serviços ASUS)
+
+Fontes de eventos:
+    Linux: proc connector (netlink). O kernel avisa cada exec, então não há
+    varredura periódica.
+    Demais sistemas (ou sem permissão para o netlink): a lista de PIDs da
+    ProcessTable é comparada em intervalo adaptativo. O intervalo fica curto logo
+    depois de um reaparecimento e dobra até MAX_INTERVAL enquanto nada acontece,
+    o que também limita a latência de detecção.
+
+Um processo cuja regra já teve um processo encerrado é forçado de imediato, sem o
+pedido educado e seu prazo. Os serviços da lista são parados no início e de novo
+sempre que voltam, em uma thread própria (cada parada espera o serviço constar
+como parado, o que não pode atrasar o encerramento dos processos). Um serviço que
+falha ao parar é tentado de novo com intervalo dobrado e abandonado depois de
+SERVICE_MAX_FAILURES falhas seguidas.
+
+Cada reaparecimento é contado por regra e cada volta de serviço por serviço; as
+contagens são gravadas no cache (respawns/<lista>.json).
+
+Uso headless:
+    python -m utils.respawn_watcher asusdie
+    python -m utils.respawn_watcher asusdie --duration 600 --polling
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import socket
+import struct
+import logging
+import argparse
+import threading
+import psutil
+
+from utils.app_cache import get_cache_dir, load_json, save_json
+from utils.process_table import ProcessTable, ProcessEntry
+from utils.kill_engine import KillEngine, load_kill_list
+
+logger = logging.getLogger(__name__)
+
+MIN_INTERVAL = 0.25  # Segundos entre varreduras logo após um reaparecimento
+MAX_INTERVAL = 2.0  # Teto do intervalo ocioso = latência máxima de detecção no modo varredura
+STOP_CHECK_SECONDS = 1.0  # Com o netlink, frequência com que o pedido de parada é verificado
+SERVICE_CHECK_SECONDS = 2.0  # Intervalo entre verificações dos serviços da lista
+SERVICE_MAX_FAILURES = 5  # Falhas seguidas ao parar um serviço antes de desistir dele
+
+# Proc connector (linux/connector.h, linux/cn_proc.h)
+NETLINK_CONNECTOR = 11
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+PROC_CN_MCAST_LISTEN = 1
+PROC_CN_MCAST_IGNORE = 2
+PROC_EVENT_EXEC = 0x00000002
+NLMSG_DONE = 3
+NLMSG_HEADER = struct.Struct("=IHHII")  # len, type, flags, seq, pid
+CN_MSG_HEADER = struct.Struct("=IIIIHH")  # idx, val, seq, ack, len, flags
+PROC_EVENT_HEADER = struct.Struct("=IIQ")  # what, cpu, timestamp_ns
+EXEC_EVENT = struct.Struct("=II")  # process_pid, process_tgid
+
+
+class ProcConnector:
+    """Eventos de exec do kernel Linux via netlink (exige root/CAP_NET_ADMIN)"""
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_CONNECTOR)
+        try:
+            self.sock.bind((0, CN_IDX_PROC))
+            self._send_control(PROC_CN_MCAST_LISTEN)
+        except OSError:
+            self.sock.close()
+            raise
+
+    def _send_control(self, operation):
+        """Liga/desliga o envio de eventos para este socket"""
+        payload = struct.pack("=I", operation)
+        cn_msg = CN_MSG_HEADER.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 0, len(payload), 0) + payload
+        header = NLMSG_HEADER.pack(NLMSG_HEADER.size + len(cn_msg), NLMSG_DONE, 0, 0, os.getpid())
+        self.sock.send(header + cn_msg)
+
+    def read(self, timeout):
+        """PIDs (tgid) que fizeram exec; lista vazia se nada chegou no prazo"""
+        readable, _, _ = select.select([self.sock], [], [], timeout)
+        if not readable:
+            return []
+        pids = []
+        try:
+            data = self.sock.recv(65536)
+        except OSError as e:
+            if e.errno == errno.ENOBUFS:
+                # Eventos perdidos (rajada): o vigia faz uma varredura completa
+                logger.warning("Fila do proc connector estourou; eventos perdidos")
+                return None
+            raise
+        offset = 0
+        while offset + NLMSG_HEADER.size <= len(data):
+            length = NLMSG_HEADER.unpack_from(data, offset)[0]
+            event_offset = offset + NLMSG_HEADER.size + CN_MSG_HEADER.size
+            if length < NLMSG_HEADER.size or event_offset + PROC_EVENT_HEADER.size > len(data):
+                break
+            what = PROC_EVENT_HEADER.unpack_from(data, event_offset)[0]
+            if what == PROC_EVENT_EXEC:
+                _, tgid = EXEC_EVENT.unpack_from(data, event_offset + PROC_EVENT_HEADER.size)
+                pids.append(tgid)
+            offset += (length + 3) & ~3  # Mensagens netlink alinhadas em 4 bytes
+        return pids
+
+    def close(self):
+        """Para de receber eventos"""
+        try:
+            self._send_control(PROC_CN_MCAST_IGNORE)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class RespawnWatcher:
+    """Mantém os processos de uma lista de encerramento fora do ar, contando cada volta"""
+
+    def __init__(self, kill_list, use_events=True, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL):
+        self.kill_list = kill_list
+        self.engine = KillEngine(kill_list)
+        self.use_events = use_events
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.table = ProcessTable(fields=(), expensive_fields=("name",))  # O vigia só precisa do nome
+        self.stats_path = os.path.join(get_cache_dir("respawns"), f"{self.list_id()}.json")
+        stats = load_json(self.stats_path, {}) or {}
+        self.counts = stats.get("counts", {})  # regra -> reaparecimentos encerrados
+        self.service_counts = stats.get("services", {})  # serviço -> voltas paradas de novo
+        self.repeat_rules = set()  # Regras já encerradas nesta execução: as próximas vão direto ao kill
+        self.max_latency = 0.0  # Segundos entre o início do processo e sua saída confirmada
+        self.source = ""
+        self._stop = threading.Event()
+        self._thread = None
+        self._service_thread = None
+
+    def list_id(self):
+        """Nome do arquivo de estatísticas (nome do arquivo da lista)"""
+        return os.path.splitext(os.path.basename(self.kill_list["path"]))[0]
+
+    def sweep(self, count=True):
+        """Varredura completa: encerra tudo que casar com a lista"""
+        self.table.refresh()
+        return self._terminate(self.engine.scan(self.table), count)
+
+    def run_services(self):
+        """Thread dos serviços: para cada um no início e de novo quando volta (a primeira parada não conta)"""
+        due = {name: 0.0 for name in self.kill_list["services"]}  # serviço -> próxima verificação
+        failures = {}
+        checked = set()
+        while due and not self._stop.is_set():
+            for name in [name for name, when in due.items() if when <= time.monotonic()]:
+                if self._stop.is_set():
+                    return
+                result = self.engine.stop_service(name)
+                if result["status"] == "unsupported":
+                    logger.info("Serviços não são suportados neste sistema; o vigia só cuida dos processos")
+                    return
+                if result["status"] == "failed":
+                    failures[name] = failures.get(name, 0) + 1
+                    if failures[name] >= SERVICE_MAX_FAILURES:
+                        logger.warning(f"Desistindo do serviço {name} após {failures[name]} falhas: "
+                                       f"{result.get('error')}")
+                        del due[name]
+                        continue
+                    logger.warning(f"Não foi possível parar o serviço {name}: {result.get('error')}")
+                    due[name] = time.monotonic() + SERVICE_CHECK_SECONDS * 2 ** failures[name]
+                    continue
+                failures.pop(name, None)
+                if result["status"] == "stopped" and name in checked:
+                    self.service_counts[name] = self.service_counts.get(name, 0) + 1
+                    logger.info(f"Serviço {name} voltou e foi parado de novo")
+                checked.add(name)
+                due[name] = time.monotonic() + SERVICE_CHECK_SECONDS
+            if due:
+                self._stop.wait(max(0.0, min(due.values()) - time.monotonic()))
+
+    def _terminate(self, targets, count=True):
+        """Encerra os alvos e contabiliza os que eram reaparecimentos"""
+        if not targets:
+            return 0
+        # Quem já foi encerrado uma vez volta a ser encerrado: sem pedido educado nem prazo
+        repeats = [target for target in targets if target[1] in self.repeat_rules]
+        firsts = [target for target in targets if target[1] not in self.repeat_rules]
+        results = self.engine.terminate_processes(firsts) + self.engine.terminate_processes(repeats, graceful=False)
+        now = time.time()
+        for (entry, rule, _), result in zip(firsts + repeats, results):
+            if result["status"] not in ("terminated", "killed"):
+                if result["status"] == "failed":
+                    logger.warning(f"Não foi possível encerrar {entry.name} ({entry.pid}): {result.get('error')}")
+                continue
+            self.repeat_rules.add(rule)
+            if count:
+                self.counts[rule] = self.counts.get(rule, 0) + 1
+                self.max_latency = max(self.max_latency, now - entry.create_time)
+                logger.info(f"Reaparecimento de {entry.name} ({entry.pid}) encerrado pela regra {rule}")
+        return len(targets)
+
+    def handle_exec(self, pids):
+        """Eventos do kernel: só o nome dos PIDs novos é lido"""
+        targets = []
+        for pid in pids:
+            if pid in self.engine.protected_pids:
+                continue
+            try:
+                proc = psutil.Process(pid)
+                name = proc.name()
+                rule = self.engine.match(name)
+                if rule is None:
+                    continue
+                targets.append((ProcessEntry(pid, proc.create_time(), {"name": name}), rule[0], rule[1]))
+            except psutil.Error:
+                continue  # Já saiu
+        return self._terminate(targets)
+
+    def run_events(self, connector):
+        """Laço com o proc connector: dorme até o kernel avisar um exec"""
+        while not self._stop.is_set():
+            pids = connector.read(STOP_CHECK_SECONDS)
+            if pids is None:
+                self.sweep()
+            elif pids:
+                self.handle_exec(pids)
+
+    def run_polling(self):
+        """Laço de varredura com intervalo adaptativo (curto após atividade, dobra quando ocioso)"""
+        interval = self.min_interval
+        while not self._stop.wait(interval):
+            diff = self.table.refresh()
+            targets = []
+            for entry in diff.added:
+                if entry.pid in self.engine.protected_pids or not entry.name:
+                    continue
+                rule = self.engine.match(entry.name)
+                if rule is not None:
+                    targets.append((entry, rule[0], rule[1]))
+            if self._terminate(targets):
+                interval = self.min_interval
+            else:
+                interval = min(interval * 2, self.max_interval)
+
+    def run(self):
+        """Encerra o que já estiver rodando e vigia até stop()"""
+        if self.kill_list["services"]:
+            self._service_thread = threading.Thread(target=self.run_services, name="respawn-services", daemon=True)
+            self._service_thread.start()
+        self.sweep(count=False)
+        connector = None
+        if self.use_events and sys.platform.startswith("linux"):
+            try:
+                connector = ProcConnector()
+            except OSError as e:
+                logger.info(f"Proc connector indisponível ({e}); usando varredura")
+        self.source = "proc connector" if connector else "polling"
+        logger.info(f"Vigiando '{self.kill_list['name']}' via {self.source}")
+        try:
+            if connector:
+                self.run_events(connector)
+            else:
+                self.run_polling()
+        finally:
+            if connector:
+                connector.close()
+            if self._service_thread is not None:
+                self._service_thread.join()
+                self._service_thread = None
+            self.save()
+
+    def start(self):
+        """Vigia em uma thread de fundo"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="respawn-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Pede a parada e espera a thread terminar"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def save(self):
+        """Grava as contagens de reaparecimento"""
+        save_json(self.stats_path, {"name": self.kill_list["name"], "counts": self.counts,
+                                    "services": self.service_counts})
+
+
+def main(argv=None):
+    """Ponto de entrada headless"""
+    parser = argparse.ArgumentParser(description="Keep the processes of a kill list from coming back")
+    parser.add_argument("kill_list", help="Kill list file or name (e.g. asusdie)")
+    parser.add_argument("--duration", type=float, default=0, help="Seconds to watch (0 = until Ctrl+C)")
+    parser.add_argument("--polling", action="store_true", help="Use polling even where OS events are available")
+    parser.add_argument("--max-interval", type=float, default=MAX_INTERVAL,
+                        help="Longest polling interval in seconds (bounds detection latency)")
+    args = parser.parse_args(argv)
+
+    try:
+        watcher = RespawnWatcher(load_kill_list(args.kill_list), use_events=not args.polling,
+                                 max_interval=args.max_interval)
+    except (OSError, ValueError, KeyError) as e:
+        parser.error(f"Invalid kill list {args.kill_list}: {e}")
+
+    start_cpu, start = time.process_time(), time.monotonic()
+    watcher.start()
+    try:
+        if args.duration > 0:
+            time.sleep(args.duration)
+        else:
+            while True:
+                time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    watcher.stop()
+
+    elapsed = time.monotonic() - start
+    print(f"Watched '{watcher.kill_list['name']}' via {watcher.source} for {elapsed:.0f} s "
+          f"(CPU {(time.process_time() - start_cpu) / max(elapsed, 1e-9):.2%}, "
+          f"max latency {watcher.max_latency * 1000:.0f} ms)")
+    for rule, count in sorted(watcher.counts.items(), key=lambda item: -item[1]):
+        print(f"  {count:>5}  {rule}")
+    for name, count in sorted(watcher.service_counts.items(), key=lambda item: -item[1]):
+        print(f"  {count:>5}  service {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""
+Matcher de Regras
+Conjuntos grandes de regras de encerramento/permissão compilados uma vez para classificar processos em tempo constante
+
+Sintaxe de uma regra (sem diferenciar maiúsculas):
+    chrome.exe          nome exato (tabela hash)
+    Armoury*            glob só com prefixo (tabela hash por tamanho de prefixo)
+    *Updater.exe        glob só com sufixo (tabela hash por tamanho de sufixo)
+    *helper*            glob de substring (tabela hash por tamanho do trecho)
+    Aac*Hal_x86.exe     glob genérico (regex combinada)
+    re:steam            expressão regular (regex combinada)
+
+Regras "re:" são buscas (re.search), como no grep: re:steam casa com
+steamwebhelper.exe e re:^stubborn com stubbornpy. Use ^ e $ para ancorar.
+
+Globs genéricos e regexes são agrupados pelo primeiro caractere literal e cada
+grupo vira uma única regex com alternativas nomeadas, então um nome só é testado
+contra as regras que podem casar com ele: o grupo do seu primeiro caractere
+(regras ancoradas) e os grupos dos caracteres que ele contém (regexes sem ^). Regexes com
+referências a grupos (\\1, (?P=nome)) ou grupos nomeados próprios seriam
+alteradas pela combinação e são testadas uma a uma. O custo por nome depende do
+tamanho do nome, não do número de regras, e o resultado por nome fica em cache.
+Regras de permissão (allowlist) têm precedência sobre as de encerramento.
+"""
+
+import re
+import fnmatch
+import logging
+
+logger = logging.getLogger(__name__)
+
+REGEX_PREFIX = "re:"
+GLOB_CHARS = set("*?[")
+# Referências a grupos e grupos nomeados: regexes que não podem entrar na regex combinada
+STANDALONE_SYNTAX = re.compile(r"\\[1-9]|\\g<|\(\?P[<=]")
+CACHE_LIMIT = 65536  # Nomes distintos guardados no cache de classificação
+
+
+def rule_kind(pattern):
+    """Tipo da regra: "exact", "prefix", "suffix", "contains", "glob" ou "regex" """
+    if pattern.startswith(REGEX_PREFIX):
+        return "regex"
+    if not GLOB_CHARS & set(pattern):
+        return "exact"
+    core = pattern.strip("*")
+    if core and not GLOB_CHARS & set(core):
+        # Curingas só nas pontas
+        starts, ends = pattern.startswith("*"), pattern.endswith("*")
+        return "contains" if starts and ends else "suffix" if starts else "prefix"
+    return "glob"
+
+
+def literal_head(pattern, kind):
+    """Primeiro caractere que toda correspondência precisa ter ("" se a regra pode começar com qualquer um)"""
+    if kind == "glob":
+        first = pattern[:1]
+        return "" if not first or first in GLOB_CHARS else first.lower()
+    source = pattern[len(REGEX_PREFIX):]
+    if source.startswith("^"):
+        source = source[1:]
+    first = source[:1]
+    # Só um caractere comum conta como literal (sem alternativas, escapes nem quantificador opcional logo depois)
+    if not first or not (first.isalnum() or first in "_-") or "|" in source or source[1:2] in ("*", "?", "{"):
+        return ""
+    return first.lower()
+
+
+def is_anchored(pattern, kind):
+    """Se a regra só pode casar a partir do início do nome (globs sempre; regexes com ^)"""
+    return kind == "glob" or pattern[len(REGEX_PREFIX):].startswith("^")
+
+
+class RuleSet:
+    """Um conjunto de regras compilado; cada regra é "padrão" ou (padrão, dado associado)"""
+
+    def __init__(self, rules=()):
+        self.exact = {}
+        self.prefixes = {}  # tamanho -> {prefixo: regra}
+        self.suffixes = {}  # tamanho -> {sufixo: regra}
+        self.contains = {}  # tamanho -> {trecho: regra}
+        self.patterns = {}  # primeiro caractere ("" = qualquer) -> [(padrão regex, regra)]
+        self.floating_patterns = {}  # Regexes sem âncora: primeiro literal -> [(padrão regex, regra)]
+        self.buckets = {}  # primeiro caractere -> (regex combinada, [regra por grupo], [(regex própria, regra)])
+        self.floating = {}  # primeiro literal -> idem, para regexes sem âncora
+        self.count = 0
+        for rule in rules:
+            self.add(rule)
+        self.compile()
+
+    def __len__(self):
+        return self.count
+
+    def add(self, rule):
+        """Classifica a regra na estrutura do seu tipo (chame compile() depois)"""
+        pattern, data = rule if isinstance(rule, tuple) else (rule, None)
+        entry = (pattern, data)
+        kind = rule_kind(pattern)
+        lowered = pattern.lower()
+        if kind == "exact":
+            self.exact.setdefault(lowered, entry)
+        elif kind == "prefix":
+            key = lowered.rstrip("*")
+            self.prefixes.setdefault(len(key), {}).setdefault(key, entry)
+        elif kind == "suffix":
+            key = lowered.lstrip("*")
+            self.suffixes.setdefault(len(key), {}).setdefault(key, entry)
+        elif kind == "contains":
+            key = lowered.strip("*")
+            self.contains.setdefault(len(key), {}).setdefault(key, entry)
+        else:
+            if kind == "glob":
+                source = r"\A" + fnmatch.translate(lowered)  # Ancorada: as alternativas são buscadas
+            else:
+                source = pattern[len(REGEX_PREFIX):]
+                try:
+                    re.compile(source)
+                except re.error as e:
+                    raise ValueError(f"Invalid regex rule {pattern!r}: {e}") from e
+            head = literal_head(pattern, kind)
+            groups = self.patterns if is_anchored(pattern, kind) or not head else self.floating_patterns
+            groups.setdefault(head, []).append((source, entry))
+        self.count += 1
+
+    def compile(self):
+        """Junta as regexes de cada grupo em uma só, com um grupo nomeado por regra"""
+        self.buckets = {head: self._compile_bucket(patterns) for head, patterns in self.patterns.items()}
+        self.floating = {head: self._compile_bucket(patterns) for head, patterns in self.floating_patterns.items()}
+
+    @staticmethod
+    def _compile_bucket(patterns):
+        """(regex combinada, regras combinadas, [(regex própria, regra)]) de um grupo"""
+        items = [item for item in patterns if not STANDALONE_SYNTAX.search(item[0])]
+        standalone = [item for item in patterns if STANDALONE_SYNTAX.search(item[0])]
+        regex = None
+        if items:
+            alternatives = [f"(?P<r{i}>{source})" for i, (source, _) in enumerate(items)]
+            try:
+                regex = re.compile("|".join(alternatives), re.IGNORECASE)
+            except re.error:
+                # Combinação inválida: cada regra vira sua própria regex
+                standalone, items = patterns, []
+        compiled = [(re.compile(source, re.IGNORECASE), entry) for source, entry in standalone]
+        return regex, items, compiled
+
+    @staticmethod
+    def _match_bucket(buckets, head, name):
+        """Testa o nome contra as regexes de um grupo"""
+        bucket = buckets.get(head)
+        if bucket is None:
+            return None
+        regex, items, standalone = bucket
+        if regex is not None:
+            match = regex.search(name)
+            if match:
+                # O grupo nomeado externo é o último a fechar; ele identifica a regra
+                return items[int(match.lastgroup[1:])][1]
+        for compiled, entry in standalone:
+            if compiled.search(name):
+                return entry
+        return None
+
+    def match(self, name):
+        """Primeira regra que casa com o nome: (padrão, dado) ou None"""
+        lowered = name.lower()
+        entry = self.exact.get(lowered)
+        if entry is not None:
+            return entry
+        size = len(lowered)
+        for length, table in self.prefixes.items():
+            if length <= size and lowered[:length] in table:
+                return table[lowered[:length]]
+        for length, table in self.suffixes.items():
+            if length <= size and lowered[size - length:] in table:
+                return table[lowered[size - length:]]
+        for length, table in self.contains.items():
+            for start in range(size - length + 1):
+                entry = table.get(lowered[start:start + length])
+                if entry is not None:
+                    return entry
+        if lowered:
+            entry = self._match_bucket(self.buckets, lowered[0], lowered)
+            if entry is not None:
+                return entry
+        if self.floating:
+            # Sem âncora o primeiro literal pode estar em qualquer posição: um grupo por caractere do nome
+            for char in dict.fromkeys(lowered):
+                entry = self._match_bucket(self.floating, char, lowered)
+                if entry is not None:
+                    return entry
+        return self._match_bucket(self.buckets, "", lowered)
+
+
+class RuleMatcher:
+    """Classifica nomes de processo contra regras de encerramento e de permissão (a permissão vence)"""
+
+    def __init__(self, kill_rules=(), allow_rules=()):
+        self.kill = RuleSet(kill_rules)
+        self.allow = RuleSet(allow_rules)
+        self.cache = {}  # nome -> (veredito, regra)
+
+    def classify(self, name):
+        """("allow" | "kill" | None, (padrão, dado) | None) para o nome do executável"""
+        result = self.cache.get(name)
+        if result is not None:
+            return result
+        entry = self.allow.match(name)
+        if entry is not None:
+            result = ("allow", entry)
+        else:
+            entry = self.kill.match(name)
+            result = ("kill", entry) if entry is not None else (None, None)
+        if len(self.cache) >= CACHE_LIMIT:
+            self.cache.clear()
+        self.cache[name] = result
+        return result
+
+    def match(self, name):
+        """Regra de encerramento que se aplica ao nome, ou None (permitidos e sem regra)"""
+        verdict, entry = self.classify(name)
+        return entry if verdict == "kill" else None
@@ -0,0 +1,256 @@
+"""
+Snapshot de Sessão
+Registra o que o modo SteamOS encerrou e relança tudo em paralelo ao sair dele
+
+Antes de encerrar, o motor grava para cada aplicativo o executável, a linha de
+comando, a pasta de trabalho e um subconjunto do ambiente. Processos filhos do
+mesmo executável (abas e renderizadores de navegador, por exemplo) não são
+gravados, porque o processo principal os recria, nem os processos iniciados pelo
+sistema, shell ou serviços (NOT_RESTORABLE), que voltam sozinhos. Uma sessão ainda
+não restaurada não é sobrescrita: um novo encerramento só acrescenta apps a ela.
+A restauração sobe primeiro o shell (explorer.exe) e espera ele aparecer; o resto
+é relançado em paralelo.
+
+Uso headless:
+    python -m utils.session_snapshot show steamos
+    python -m utils.session_snapshot restore steamos
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+import psutil
+
+from utils.app_cache import get_cache_dir, load_json, save_json
+
+logger = logging.getLogger(__name__)
+
+# Variáveis de ambiente que afetam como um app de usuário inicia; o resto vem da sessão atual
+ENV_KEYS = ("PATH", "APPDATA", "LOCALAPPDATA", "USERPROFILE", "HOME", "TEMP", "TMP", "LANG",
+            "DISPLAY", "WAYLAND_DISPLAY", "XDG_RUNTIME_DIR", "DBUS_SESSION_BUS_ADDRESS")
+SHELL_PROCESSES = ("explorer.exe",)  # Relançados antes de tudo (bandeja, área de trabalho)
+# Iniciados pelo sistema, pelo shell ou por serviços: relançá-los falha ou abre algo que o usuário não abriu
+NOT_RESTORABLE = frozenset(name.lower() for name in (
+    "dwm.exe", "ShellExperienceHost.exe", "StartMenuExperienceHost.exe", "TextInputHost.exe",
+    "NVDisplay.Container.exe", "Widgets.exe", "ApplicationFrameHost.exe", "SearchApp.exe",
+    "SearchHost.exe", "GameBarPresenceWriter.exe", "RuntimeBroker.exe", "AdobeUpdateService.exe",
+))
+SHELL_TIMEOUT = 10.0  # Segundos esperando o shell aparecer
+POLL_SECONDS = 0.1
+LAUNCH_WORKERS = 8
+
+if os.name == "nt":
+    LAUNCH_OPTIONS = {"creationflags": subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP}
+else:
+    LAUNCH_OPTIONS = {"start_new_session": True}
+
+
+def session_path(name):
+    """Arquivo da sessão de um modo (ex.: "steamos")"""
+    return os.path.join(get_cache_dir("sessions"), f"{name}.json")
+
+
+def is_restorable(name):
+    """Se o processo pode ser relançado pelo Draconic"""
+    return name.lower() not in NOT_RESTORABLE
+
+
+def session_key(info):
+    """Identidade de um app gravado: executável e linha de comando"""
+    return info["exe"].lower(), tuple(info["cmdline"])
+
+
+def restore_tier(name):
+    """Ordem de relançamento: 0 para o shell, 1 para o resto"""
+    return 0 if name.lower() in SHELL_PROCESSES else 1
+
+
+def capture_process(entry):
+    """Dados para relançar um processo (None se ele já saiu ou não pode ser lido)"""
+    try:
+        proc = psutil.Process(entry.pid)
+        with proc.oneshot():
+            ppid = proc.ppid()
+            try:
+                cwd = proc.cwd()
+            except psutil.AccessDenied:
+                cwd = ""
+            try:
+                environ = proc.environ()
+            except psutil.AccessDenied:
+                environ = {}
+    except psutil.NoSuchProcess:
+        return None
+    return {
+        "pid": entry.pid,
+        "ppid": ppid,
+        "name": entry.name,
+        "exe": entry.exe,
+        "cmdline": entry.cmdline,
+        "cwd": cwd,
+        "env": {key: environ[key] for key in ENV_KEYS if key in environ},
+        "tier": restore_tier(entry.name),
+    }
+
+
+def snapshot(entries):
+    """Processos principais a relançar: sem filhos do mesmo executável e sem duplicatas"""
+    captured = [info for info in (capture_process(entry) for entry in entries if is_restorable(entry.name))
+                if info and info["exe"]]
+    exe_by_pid = {info["pid"]: info["exe"] for info in captured}
+    seen = set()
+    processes = []
+    for info in captured:
+        if exe_by_pid.get(info["ppid"]) == info["exe"]:
+            continue  # Filho do mesmo app: o processo principal o recria
+        key = session_key(info)
+        if key in seen:
+            continue
+        seen.add(key)
+        processes.append(info)
+    return processes
+
+
+def save_session(name, entries, kill_list=""):
+    """Grava a sessão do modo e retorna o caminho; uma sessão ainda não restaurada só ganha os apps novos"""
+    path = session_path(name)
+    processes = snapshot(entries)
+    session = load_json(path)
+    if session and session.get("processes") is not None:
+        known = {session_key(info) for info in session["processes"]}
+        added = [info for info in processes if session_key(info) not in known]
+        session["processes"].extend(added)
+        session["updated"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        logger.info(f"Sessão '{name}' ainda não restaurada: {len(added)} apps acrescentados em {path}")
+    else:
+        session = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "kill_list": kill_list,
+            "processes": processes,
+        }
+        logger.info(f"Sessão '{name}': {len(processes)} apps registrados em {path}")
+    save_json(path, session)
+    return path
+
+
+def running_executables():
+    """Caminhos (minúsculos) dos executáveis em execução"""
+    running = set()
+    for proc in psutil.process_iter(["exe"]):
+        if proc.info["exe"]:
+            running.add(proc.info["exe"].lower())
+    return running
+
+
+def launch(info):
+    """Relança um processo gravado, desacoplado do Draconic"""
+    result = {"name": info["name"], "exe": info["exe"], "status": "", "pid": None}
+    if not os.path.exists(info["exe"]):
+        result["status"] = "missing"
+        return result
+    env = dict(os.environ)
+    env.update(info.get("env", {}))
+    cwd = info.get("cwd") if info.get("cwd") and os.path.isdir(info["cwd"]) else None
+    try:
+        proc = subprocess.Popen(info["cmdline"] or [info["exe"]], executable=info["exe"], cwd=cwd, env=env,
+                                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.DEVNULL, close_fds=True, **LAUNCH_OPTIONS)
+        result["status"] = "launched"
+        result["pid"] = proc.pid
+    except OSError as e:
+        result["status"] = "failed"
+        result["error"] = str(e)
+    return result
+
+
+def wait_for_shell(names, timeout=SHELL_TIMEOUT):
+    """Espera algum processo do shell estar rodando (o explorer relançado costuma repassar e sair)"""
+    wanted = {name.lower() for name in names}
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for proc in psutil.process_iter(["name"]):
+            if (proc.info["name"] or "").lower() in wanted:
+                return True
+        time.sleep(POLL_SECONDS)
+    return False
+
+
+def restore_session(name, workers=LAUNCH_WORKERS, keep_file=False):
+    """Relança os apps da sessão: shell primeiro, depois o resto em paralelo"""
+    start = time.monotonic()
+    path = session_path(name)
+    session = load_json(path)
+    if not session:
+        return {"name": name, "results": [], "failed": 0, "seconds": 0.0, "found": False}
+
+    running = running_executables()
+    results = []
+    tiers = sorted({info.get("tier", 1) for info in session["processes"]})
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for tier in tiers:
+            pending = []
+            for info in session["processes"]:
+                if info.get("tier", 1) != tier:
+                    continue
+                if not is_restorable(info["name"]):
+                    results.append({"name": info["name"], "exe": info["exe"], "status": "skipped", "pid": None})
+                    continue
+                if info["exe"].lower() in running:
+                    results.append({"name": info["name"], "exe": info["exe"], "status": "running", "pid": None})
+                    continue
+                pending.append(info)
+            tier_results = list(executor.map(launch, pending))
+            results.extend(tier_results)
+            shell = [r["name"] for r in tier_results if r["status"] == "launched" and restore_tier(r["name"]) == 0]
+            if shell and not wait_for_shell(shell):
+                logger.warning("Shell não apareceu a tempo; relançando o resto assim mesmo")
+
+    failed = sum(1 for r in results if r["status"] in ("failed", "missing"))
+    if not failed and not keep_file:
+        os.remove(path)
+    return {"name": name, "results": results, "failed": failed,
+            "seconds": time.monotonic() - start, "found": True}
+
+
+def format_report(report):
+    """Formata o relatório de restauração para exibição"""
+    if not report["found"]:
+        return f"No saved session for '{report['name']}'"
+    lines = []
+    for result in report["results"]:
+        error = f" ({result['error']})" if result.get("error") else ""
+        lines.append(f"  {result['status']:<9}{result['name']}{error}")
+    lines.append(f"{report['name']}: {len(report['results'])} apps, {report['failed']} failed "
+                 f"in {report['seconds']:.2f} s")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Ponto de entrada headless"""
+    parser = argparse.ArgumentParser(description="Show or restore a session saved by a mode such as SteamOS mode")
+    parser.add_argument("command", choices=("show", "restore"))
+    parser.add_argument("name", nargs="?", default="steamos", help="Session name (default: steamos)")
+    parser.add_argument("--keep", action="store_true", help="Keep the session file after restoring")
+    args = parser.parse_args(argv)
+
+    if args.command == "show":
+        session = load_json(session_path(args.name))
+        if not session:
+            print(f"No saved session for '{args.name}'")
+            return 1
+        print(f"{args.name}: {len(session['processes'])} apps saved at {session['created']}")
+        for info in sorted(session["processes"], key=lambda i: (i.get("tier", 1), i["name"].lower())):
+            print(f"  [{info.get('tier', 1)}] {info['name']}: {' '.join(info['cmdline']) or info['exe']}")
+        return 0
+
+    report = restore_session(args.name, keep_file=args.keep)
+    print(format_report(report))
+    return 1 if report["failed"] or not report["found"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+Cache de Sprites
+Quadros de sprite sheets pré-escalados uma vez por escala e guardados em disco como um único atlas
+
+O manifesto (ex.: Engine/Chibi/sprites.json) nomeia os quadros da folha e os
+estados de animação (walk, idle, drag). O atlas de cada escala é um PNG com o
+índice embutido em um chunk de texto, então a inicialização é uma única leitura
+e trocar de estado apenas troca os retângulos de origem.
+"""
+
+import os
+import json
+import math
+import hashlib
+import logging
+from PIL import Image
+from PIL.PngImagePlugin import PngInfo
+from PyQt6.QtCore import QRect
+from PyQt6.QtGui import QImage, QPixmap
+
+from utils.app_cache import get_cache_dir, file_signature, save_image
+
+logger = logging.getLogger(__name__)
+
+INDEX_KEY = "draconic-sprites"
+
+
+def load_manifest(manifest_path):
+    """Lê o manifesto e resolve o caminho da folha relativo a ele"""
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    manifest["sheet_path"] = os.path.join(os.path.dirname(os.path.abspath(manifest_path)), manifest["sheet"])
+    for name, state in manifest["states"].items():
+        missing = [frame for frame in state["frames"] if frame not in manifest["frames"]]
+        if missing:
+            raise ValueError(f"State '{name}' uses unknown frames: {', '.join(missing)}")
+    return manifest
+
+
+def build_atlas(manifest, pixel_scale, output_path):
+    """Recorta, escala (LANCZOS) e empacota cada quadro uma única vez; grava o atlas com o índice"""
+    frame_width, frame_height = manifest["frame_size"]
+    cell = (max(1, round(frame_width * pixel_scale)), max(1, round(frame_height * pixel_scale)))
+    names = sorted(manifest["frames"])
+    columns = math.ceil(math.sqrt(len(names)))
+    rows = math.ceil(len(names) / columns)
+
+    atlas = Image.new("RGBA", (columns * cell[0], rows * cell[1]), (0, 0, 0, 0))
+    index = {"cell": list(cell), "frames": {}, "states": manifest["states"]}
+    with Image.open(manifest["sheet_path"]) as sheet:
+        sheet = sheet.convert("RGBA")
+        for i, name in enumerate(names):
+            x, y, w, h = manifest["frames"][name]
+            frame = sheet.crop((x, y, x + w, y + h)).resize(cell, Image.LANCZOS, reducing_gap=3.0)
+            left, top = (i % columns) * cell[0], (i // columns) * cell[1]
+            atlas.paste(frame, (left, top))
+            index["frames"][name] = [left, top, cell[0], cell[1]]
+
+    info = PngInfo()
+    info.add_text(INDEX_KEY, json.dumps(index))
+    save_image(output_path, atlas, pnginfo=info, compress_level=1)
+    return index
+
+
+class SpriteAtlas:
+    """Atlas carregado como uma única textura; estados são listas de retângulos de origem"""
+
+    def __init__(self, image, index, device_pixel_ratio=1.0):
+        self.pixmap = QPixmap.fromImage(image)
+        self.device_pixel_ratio = device_pixel_ratio
+        self.cell = tuple(index["cell"])
+        self.states = index["states"]
+        rects = {name: QRect(*rect) for name, rect in index["frames"].items()}
+        self.frames = {state: [rects[name] for name in spec["frames"]] for state, spec in self.states.items()}
+
+    def logical_size(self):
+        """Tamanho do quadro em pixels lógicos (independente do DPR)"""
+        return (round(self.cell[0] / self.device_pixel_ratio), round(self.cell[1] / self.device_pixel_ratio))
+
+    def has_state(self, state):
+        """Indica se o estado existe no manifesto"""
+        return state in self.frames
+
+    def frame_count(self, state):
+        """Número de quadros do estado"""
+        return len(self.frames.get(state, ()))
+
+    def frame_rect(self, state, elapsed):
+        """Retângulo de origem do quadro do estado após `elapsed` segundos"""
+        frames = self.frames[state]
+        spec = self.states[state]
+        index = int(elapsed * spec.get("fps", 8))
+        if spec.get("loop", True):
+            index %= len(frames)
+        return frames[min(index, len(frames) - 1)]
+
+
+class SpriteCache:
+    """Atlas por manifesto e escala, gerados uma vez e reaproveitados entre execuções"""
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or get_cache_dir("sprites")
+        self.atlases = {}  # chave -> SpriteAtlas já carregado nesta execução
+
+    def cache_key(self, manifest_path, manifest, pixel_scale):
+        """Chave: conteúdo do manifesto, assinatura da folha e escala em pixels físicos"""
+        with open(manifest_path, "rb") as f:
+            manifest_hash = hashlib.sha1(f.read()).hexdigest()
+        raw = f"{manifest_hash}|{file_signature(manifest['sheet_path'])}|{pixel_scale:.4f}"
+        return "sprites_" + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get(self, manifest_path, scale, device_pixel_ratio=1.0):
+        """Atlas do manifesto na escala pedida: memória, depois disco; gera só se ainda não existir"""
+        pixel_scale = scale * device_pixel_ratio
+        manifest = load_manifest(manifest_path)
+        key = self.cache_key(manifest_path, manifest, pixel_scale)
+        if key in self.atlases:
+            return self.atlases[key]
+
+        path = os.path.join(self.cache_dir, f"{key}.png")
+        if not os.path.exists(path):
+            logger.info(f"Gerando atlas de sprites ({pixel_scale:.2f}x): {manifest['sheet_path']}")
+            build_atlas(manifest, pixel_scale, path)
+
+        image = QImage(path)
+        try:
+            index = json.loads(image.text(INDEX_KEY))
+        except ValueError:
+            # Atlas corrompido: regenerar uma vez
+            logger.warning(f"Índice inválido no atlas de sprites {path}; regenerando")
+            index = build_atlas(manifest, pixel_scale, path)
+            image = QImage(path)
+
+        atlas = SpriteAtlas(image, index, device_pixel_ratio)
+        self.atlases[key] = atlas
+        return atlas
@@ -0,0 +1,42 @@
+"""
+Cache de Tema
+Guarda em disco as cores tema derivadas da imagem de perfil
+"""
+
+import os
+import logging
+
+from utils.app_cache import get_cache_dir, file_signature, load_json, save_json
+
+logger = logging.getLogger(__name__)
+
+
+class ThemeCache:
+    """Cores tema (destaque, secundária) em cache, chaveadas por caminho, tamanho e mtime da imagem"""
+
+    FILE_NAME = "theme.json"
+
+    def __init__(self, cache_dir=None):
+        self.path = os.path.join(cache_dir or get_cache_dir(), self.FILE_NAME)
+        self.entries = load_json(self.path, {})
+
+    def get(self, image_path):
+        """Retorna (cores, atualizadas) - as cores em cache e se ainda valem para o arquivo atual"""
+        entry = self.entries.get(os.path.abspath(image_path))
+        if not entry or "colors" not in entry:
+            return None, False
+        try:
+            fresh = entry.get("signature") == file_signature(image_path)
+        except OSError:
+            fresh = False
+        return tuple(entry["colors"]), fresh
+
+    def set(self, image_path, colors):
+        """Grava as cores calculadas para a versão atual do arquivo"""
+        try:
+            signature = file_signature(image_path)
+        except OSError as e:
+            logger.warning(f"Não foi possível ler {image_path}: {e}")
+            return
+        self.entries[signature[0]] = {"signature": signature, "colors": list(colors)}
+        save_json(self.path, self.entries)
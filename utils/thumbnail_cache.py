@@ -0,0 +1,54 @@
+"""
+Cache de Miniaturas
+Miniaturas das imagens abertas em Extras, decodificadas já no tamanho de exibição e persistidas em disco
+"""
+
+import os
+import logging
+
+from utils.app_cache import get_cache_dir, save_image
+from utils.image_ops import ImageOps
+from utils.render_cache import RenderCache
+
+logger = logging.getLogger(__name__)
+
+
+class ThumbnailCache(RenderCache):
+    """Decodifica miniaturas em worker threads e as reaproveita entre execuções"""
+
+    def __init__(self, cache_dir=None):
+        super().__init__(cache_dir or get_cache_dir("thumbnails"), "thumb_")
+
+    def cache_key(self, image_path, max_width, max_height):
+        """Chave da miniatura: arquivo de origem e caixa de exibição"""
+        return self.make_key(image_path, f"{max_width}x{max_height}")
+
+    def lookup(self, image_path, max_width, max_height):
+        """Busca a miniatura no disco como array RGBA; retorna None se ainda não gerada"""
+        path = self.disk_path(self.cache_key(image_path, max_width, max_height))
+        if os.path.exists(path):
+            try:
+                return ImageOps.load_rgba(path)
+            except OSError as e:
+                logger.warning(f"Miniatura inválida em {path}: {e}")
+        return None
+
+    def request(self, image_path, max_width, max_height, callback):
+        """Entrega a miniatura (array RGBA, ou None se a decodificação falhar) ao callback na thread da UI"""
+        pixels = self.lookup(image_path, max_width, max_height)
+        if pixels is not None:
+            callback(pixels)
+            return
+
+        key = self.cache_key(image_path, max_width, max_height)
+        self.submit(key, callback, self.render, image_path, max_width, max_height)
+
+    @staticmethod
+    def render(image_path, max_width, max_height, output_path):
+        """Decodifica a imagem em escala reduzida e persiste a miniatura (executa no worker)"""
+        pixels = ImageOps.load_proxy(image_path, max_width, max_height)
+        try:
+            save_image(output_path, ImageOps.to_image(pixels), compress_level=1)
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar a miniatura em {output_path}: {e}")
+        return pixels
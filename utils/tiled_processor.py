@@ -0,0 +1,368 @@
+"""
+Processador em Faixas
+Processa imagens muito grandes em faixas horizontais com memória limitada
+
+A saída é sempre PNG, escrita faixa a faixa (IDATs com zlib incremental) em um
+arquivo temporário que só substitui o destino quando termina.
+Formatos não comprimidos (BMP, TGA, PPM, TIFF sem compressão) também são lidos
+faixa a faixa direto do arquivo. PNGs de até 8 bits sem entrelaçamento são
+descomprimidos incrementalmente: as linhas de cada faixa são desfiltradas pelo
+Pillow a partir da última linha da faixa anterior. Os demais formatos (JPEG,
+PNG de 16 bits ou entrelaçado...) precisam ser decodificados inteiros e são
+recusados quando a decodificação não cabe no orçamento.
+
+Uso headless:
+    python -m utils.tiled_processor transparent huge.bmp out.png --budget 64
+"""
+
+import io
+import os
+import sys
+import time
+import zlib
+import struct
+import logging
+import argparse
+import numpy as np
+from PIL import Image
+
+from utils.image_ops import ImageOps, WHOLE_IMAGE_OPERATIONS
+from utils.batch_processor import OPERATIONS, add_operation_arguments, parsed_operation_args
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET_MB = 64
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+IDAT_FLUSH_BYTES = 1 << 20  # Tamanho máximo de um chunk IDAT acumulado
+IDAT_READ_BYTES = 1 << 16  # Leitura de dados comprimidos por vez
+CHUNK_HEADER = struct.Struct(">I4s")
+# Modos brutos de PNG lidos em faixas -> bits por pixel (16 bits e entrelaçados ficam de fora)
+PNG_STREAM_BITS = {"1": 1, "L;2": 2, "L;4": 4, "L": 8, "P;1": 1, "P;2": 2, "P;4": 4, "P": 8,
+                   "LA": 16, "RGB": 24, "RGBA": 32}
+# Bytes por pixel do filtro -> (tipo de cor PNG, modo Pillow) de 8 bits que devolve os bytes desfiltrados intactos
+PNG_CARRIERS = {1: (0, "L"), 2: (4, "LA"), 3: (2, "RGB"), 4: (6, "RGBA")}
+
+
+def open_image(path):
+    """Abre a imagem sem o limite de pixels do Pillow (o processamento em faixas é limitado por orçamento)"""
+    limit = Image.MAX_IMAGE_PIXELS
+    Image.MAX_IMAGE_PIXELS = None
+    try:
+        return Image.open(path)
+    finally:
+        Image.MAX_IMAGE_PIXELS = limit
+
+
+class PngStripReader:
+    """Descomprime um PNG não entrelaçado de até 8 bits em ordem, faixa a faixa"""
+
+    def __init__(self, path, image):
+        self.image = image
+        self.width = image.width
+        tile = image.tile[0]
+        self.rawmode = tile[3] if isinstance(tile[3], str) else tile[3][0]
+        bits = PNG_STREAM_BITS[self.rawmode]
+        self.row_bytes = (self.width * bits + 7) // 8
+        self.pixel_bytes = max(1, bits // 8)  # Distância usada pelos filtros Sub/Avg/Paeth
+        self.previous_row = bytes(self.row_bytes)
+        self.next_row = 0
+        self.decompressor = zlib.decompressobj()
+        self.buffer = bytearray()
+
+        # O tile do Pillow aponta para os dados do primeiro IDAT
+        self.file = open(path, "rb")
+        self.file.seek(tile[2] - CHUNK_HEADER.size)
+        self.chunk_left, self.chunk_kind = CHUNK_HEADER.unpack(self.file.read(CHUNK_HEADER.size))
+
+    @staticmethod
+    def supports(image):
+        """Se o PNG pode ser lido em faixas (um quadro, sem entrelaçamento, até 8 bits por canal)"""
+        if image.format != "PNG" or image.info.get("interlace") or getattr(image, "n_frames", 1) != 1:
+            return False
+        if len(image.tile) != 1 or image.tile[0][0] != "zip" or image.tile[0][1] != (0, 0) + image.size:
+            return False
+        args = image.tile[0][3]
+        return (args if isinstance(args, str) else args[0]) in PNG_STREAM_BITS
+
+    def _next_compressed(self):
+        """Próximo pedaço dos dados IDAT (b"" no fim da imagem)"""
+        while not self.chunk_left:
+            if self.chunk_kind != b"IDAT":
+                return b""
+            self.file.read(4)  # CRC do chunk anterior
+            header = self.file.read(CHUNK_HEADER.size)
+            if len(header) < CHUNK_HEADER.size:
+                return b""
+            self.chunk_left, self.chunk_kind = CHUNK_HEADER.unpack(header)
+            if self.chunk_kind != b"IDAT":
+                return b""  # IDATs são consecutivos: o próximo chunk encerra os dados
+        data = self.file.read(min(self.chunk_left, IDAT_READ_BYTES))
+        self.chunk_left = self.chunk_left - len(data) if data else 0
+        return data
+
+    def _inflate(self, size):
+        """Próximos size bytes descomprimidos (nunca mais que isso em memória)"""
+        while len(self.buffer) < size:
+            data = self.decompressor.unconsumed_tail or self._next_compressed()
+            if not data:
+                raise ValueError("PNG image data ends early")
+            self.buffer += self.decompressor.decompress(data, size - len(self.buffer))
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+    def _unfilter(self, rows, filtered):
+        """Bytes desfiltrados das linhas: o Pillow decodifica um PNG portador de 8 bits
+        cuja primeira linha (sem filtro) é a última linha da faixa anterior"""
+        color_type, mode = PNG_CARRIERS[self.pixel_bytes]
+        carrier_width = self.row_bytes // self.pixel_bytes
+        stream = zlib.compress(b"\x00" + self.previous_row + filtered, 0)
+        carrier = io.BytesIO()
+        carrier.write(PNG_SIGNATURE)
+        for kind, data in ((b"IHDR", struct.pack(">IIBBBBB", carrier_width, rows + 1, 8, color_type, 0, 0, 0)),
+                           (b"IDAT", stream), (b"IEND", b"")):
+            carrier.write(CHUNK_HEADER.pack(len(data), kind))
+            carrier.write(data)
+            carrier.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind)) & 0xFFFFFFFF))
+        carrier.seek(0)
+        with Image.open(carrier) as decoded:
+            if decoded.mode != mode:
+                raise ValueError(f"Unexpected PNG carrier mode {decoded.mode}")
+            return decoded.tobytes()[self.row_bytes:]
+
+    def read(self, top, bottom):
+        """Linhas [top, bottom) no modo nativo; as faixas precisam vir em ordem"""
+        if top != self.next_row:
+            raise ValueError("PNG strips must be read in order")
+        rows = bottom - top
+        raw = self._unfilter(rows, self._inflate(rows * (self.row_bytes + 1)))
+        self.previous_row = raw[-self.row_bytes:]
+        self.next_row = bottom
+        strip = Image.frombuffer(self.image.mode, (self.width, rows), raw, "raw", self.rawmode, self.row_bytes, 1)
+        if self.image.mode == "P":
+            strip.putpalette(self.image.palette)
+        if "transparency" in self.image.info:
+            strip.info["transparency"] = self.image.info["transparency"]
+        return strip
+
+    def close(self):
+        """Fecha o arquivo"""
+        self.file.close()
+
+
+def raw_tiles(image):
+    """Tiles 'raw' de largura total que podem ser lidos direto do arquivo, ou None"""
+    tiles = []
+    for tile in image.tile:
+        codec, extents, offset, args = tile[:4]
+        if codec != "raw" or extents[0] != 0 or extents[2] != image.width:
+            return None
+        if isinstance(args, str):
+            args = (args, 0, 1)
+        rawmode, stride, orientation = (tuple(args) + (0, 1))[:3]
+        if not stride:
+            try:
+                stride = len(Image.new(image.mode, (image.width, 1)).tobytes("raw", rawmode))
+            except Exception:
+                return None
+        tiles.append((extents[1], extents[3], offset, rawmode, stride, orientation))
+    return tiles or None
+
+
+def is_streamable(image):
+    """Se a imagem aberta pode ser lida em faixas sem ser decodificada inteira"""
+    return raw_tiles(image) is not None or PngStripReader.supports(image)
+
+
+class StripReader:
+    """Lê faixas de linhas de uma imagem como arrays RGBA"""
+
+    def __init__(self, path, budget_bytes=None):
+        self.path = path
+        self.image = open_image(path)
+        self.width, self.height = self.image.size
+        self.raw_tiles = raw_tiles(self.image)
+        self.png = None
+        if self.raw_tiles is None and PngStripReader.supports(self.image):
+            self.png = PngStripReader(path, self.image)
+        self.streaming = self.raw_tiles is not None or self.png is not None
+        if not self.streaming:
+            needed = len(Image.new(self.image.mode, (self.width, 1)).tobytes()) * self.height
+            if budget_bytes is not None and needed > budget_bytes:
+                self.image.close()
+                raise ValueError(f"{self.image.format or 'This'} image of {self.width}x{self.height} must be "
+                                 f"decoded whole ({needed / 1048576:.0f} MB), over the "
+                                 f"{budget_bytes / 1048576:g} MB budget; convert it to 8-bit "
+                                 f"non-interlaced PNG or BMP, or raise the budget")
+            # Decodificação única no modo nativo (sem cópia RGBA da imagem inteira)
+            self.image.load()
+
+    def read(self, top, bottom):
+        """Retorna as linhas [top, bottom) como array RGBA contíguo"""
+        if self.png is not None:
+            return ImageOps.to_array(self.png.read(top, bottom))
+        if not self.streaming:
+            strip = self.image.crop((0, top, self.width, bottom))
+            return ImageOps.to_array(strip)
+
+        parts = []
+        with open(self.path, "rb") as f:
+            for tile_top, tile_bottom, offset, rawmode, stride, orientation in self.raw_tiles:
+                first, last = max(top, tile_top), min(bottom, tile_bottom)
+                if first >= last:
+                    continue
+                rows = last - first
+                if orientation < 0:
+                    # Arquivo de baixo para cima: as linhas pedidas ficam em ordem inversa
+                    f.seek(offset + (tile_bottom - last) * stride)
+                else:
+                    f.seek(offset + (first - tile_top) * stride)
+                data = f.read(rows * stride)
+                strip = Image.frombuffer(self.image.mode, (self.width, rows), data,
+                                         "raw", rawmode, stride, orientation)
+                parts.append(ImageOps.to_array(strip))
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def close(self):
+        """Fecha o arquivo de origem"""
+        if self.png is not None:
+            self.png.close()
+        self.image.close()
+
+
+class PngStripWriter:
+    """Escreve um PNG RGBA incrementalmente, faixa a faixa (em path.tmp até close())"""
+
+    def __init__(self, path, width, height, level=6):
+        self.path = path
+        self.temp_path = f"{path}.tmp"
+        self.file = open(self.temp_path, "wb")
+        self.width = width
+        self.compressor = zlib.compressobj(level)
+        self.previous_row = np.zeros((width * 4,), dtype=np.uint8)
+        self.pending = []
+        self.pending_bytes = 0
+
+        self.file.write(PNG_SIGNATURE)
+        # 8 bits por canal, tipo de cor 6 (RGBA), sem entrelaçamento
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+
+    def _chunk(self, kind, data):
+        """Grava um chunk PNG com CRC"""
+        self.file.write(struct.pack(">I", len(data)))
+        self.file.write(kind)
+        self.file.write(data)
+        self.file.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind)) & 0xFFFFFFFF))
+
+    def _queue(self, data):
+        """Acumula dados comprimidos e emite um IDAT quando o buffer enche"""
+        if data:
+            self.pending.append(data)
+            self.pending_bytes += len(data)
+        if self.pending_bytes >= IDAT_FLUSH_BYTES:
+            self._flush()
+
+    def _flush(self):
+        """Emite os dados acumulados como um chunk IDAT"""
+        if self.pending:
+            self._chunk(b"IDAT", b"".join(self.pending))
+            self.pending = []
+            self.pending_bytes = 0
+
+    def write(self, strip):
+        """Filtra (Up, vetorizado) e comprime uma faixa RGBA"""
+        rows = strip.reshape(strip.shape[0], -1)
+        filtered = np.empty((rows.shape[0], rows.shape[1] + 1), dtype=np.uint8)
+        filtered[:, 0] = 2  # Filtro "Up": diferença para a linha anterior
+        filtered[0, 1:] = rows[0] - self.previous_row
+        filtered[1:, 1:] = rows[1:] - rows[:-1]
+        self.previous_row = rows[-1].copy()
+        self._queue(self.compressor.compress(filtered.tobytes()))
+
+    def close(self):
+        """Finaliza o stream zlib e troca o destino pelo arquivo completo"""
+        self._queue(self.compressor.flush())
+        self._flush()
+        self._chunk(b"IEND", b"")
+        self.file.close()
+        os.replace(self.temp_path, self.path)
+
+    def abort(self):
+        """Descarta a saída incompleta (o destino fica intocado)"""
+        self.file.close()
+        try:
+            os.remove(self.temp_path)
+        except OSError:
+            pass
+
+
+def strip_rows_for_budget(width, budget_bytes):
+    """Linhas por faixa que cabem no orçamento (faixa nativa + RGBA + buffer filtrado)"""
+    bytes_per_row = width * 4 * 3
+    return max(1, budget_bytes // bytes_per_row)
+
+
+def process_tiled(source, output, operation, *args, budget_mb=DEFAULT_BUDGET_MB,
+                  progress_callback=None, cancel_check=None):
+    """Aplica a operação (função in-place sobre RGBA) em faixas e grava o PNG de saída incrementalmente"""
+    if operation in WHOLE_IMAGE_OPERATIONS:
+        raise ValueError("This operation needs the whole image and cannot run in strips")
+    start = time.perf_counter()
+    budget_bytes = int(budget_mb * 1024 * 1024)
+    reader = StripReader(source, budget_bytes)
+    strip_rows = strip_rows_for_budget(reader.width, budget_bytes)
+    writer = PngStripWriter(output, reader.width, reader.height)
+    completed = False
+    try:
+        for top in range(0, reader.height, strip_rows):
+            if cancel_check and cancel_check():
+                break
+            bottom = min(top + strip_rows, reader.height)
+            strip = reader.read(top, bottom)
+            operation(strip, *args)
+            writer.write(strip)
+            if progress_callback:
+                progress_callback(bottom, reader.height)
+        else:
+            completed = True
+    finally:
+        if completed:
+            writer.close()
+        else:
+            writer.abort()
+        reader.close()
+
+    return {
+        "source": source,
+        "output": output,
+        "width": reader.width,
+        "height": reader.height,
+        "strip_rows": strip_rows,
+        "streaming_input": reader.streaming,
+        "completed": completed,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def main(argv=None):
+    """Ponto de entrada headless"""
+    parser = argparse.ArgumentParser(description="Memory-bounded strip processing for huge images")
+    parser.add_argument("operation", choices=sorted(name for name, function in OPERATIONS.items()
+                                                    if function not in WHOLE_IMAGE_OPERATIONS))
+    parser.add_argument("source")
+    parser.add_argument("output", help="Output PNG path")
+    parser.add_argument("--budget", type=int, default=DEFAULT_BUDGET_MB, help="Working set budget in MB")
+    add_operation_arguments(parser)
+    args = parser.parse_args(argv)
+
+    operation_arguments = parsed_operation_args(args)
+    report = process_tiled(args.source, args.output, OPERATIONS[args.operation], *operation_arguments,
+                           budget_mb=args.budget)
+    print(f"{report['width']}x{report['height']} in strips of {report['strip_rows']} rows "
+          f"({'streamed' if report['streaming_input'] else 'decoded'} input) "
+          f"in {report['seconds']:.2f} s -> {report['output']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
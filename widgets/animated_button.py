@@ -4,17 +4,26 @@ Widget de botão com animações suaves
 """
 
 from PyQt6.QtWidgets import QPushButton
-from PyQt6.QtCore import pyqtSignal, QPropertyAnimation, QEasingCurve
+from PyQt6.QtCore import pyqtSignal, QPropertyAnimation, QEasingCurve, QSize
 
 
 class AnimatedButton(QPushButton):
     """Botão com animações suaves"""
     clicked_with_data = pyqtSignal(str)  # Signal personalizado
-    
-    def __init__(self, text, icon_text="", data=None, parent=None):
+    ICON_SIZE = 24
+
+    def __init__(self, text, icon_text="", data=None, parent=None, icon=None):
         super().__init__(parent)
         self.data = data or text
-        self.setText(f"  {icon_text}  {text}")
+        self.normal_icon = None
+        self.hover_icon = None
+        if icon is not None and not icon.isNull():
+            # Ícone do atlas no lugar do emoji
+            self.set_icons(icon)
+            self.setIconSize(QSize(self.ICON_SIZE, self.ICON_SIZE))
+            self.setText(f"  {text}")
+        else:
+            self.setText(f"  {icon_text}  {text}")
         self.setFixedHeight(50)
         self.original_color = "#3a3a3a"
         self.hover_color = "#4a90e2"  # Cor padrão
@@ -31,6 +40,19 @@ class AnimatedButton(QPushButton):
         self.hover_color = color
         self.setup_style()
 
+    def set_icons(self, normal_icon, hover_icon=None):
+        """Define o ícone normal e o usado sobre o fundo de destaque (hover/foco)"""
+        self.normal_icon = normal_icon
+        self.hover_icon = hover_icon or normal_icon
+        self.update_icon()
+
+    def update_icon(self):
+        """Troca o ícone conforme o estado (o fundo muda para a cor de destaque)"""
+        if self.normal_icon is None:
+            return
+        highlighted = self.underMouse() or self.hasFocus() or self.isDown()
+        self.setIcon(self.hover_icon if highlighted else self.normal_icon)
+
     def setup_style(self):
         """Configura o estilo do botão"""
         self.setStyleSheet(f"""
@@ -76,11 +98,21 @@ class AnimatedButton(QPushButton):
     def enterEvent(self, event):
         """Animação ao passar o mouse - removida para evitar assimetria"""
         super().enterEvent(event)
-        # Apenas mudança de cor, sem animação de tamanho
-        pass
+        # Apenas mudança de cor (e do ícone), sem animação de tamanho
+        self.update_icon()
 
     def leaveEvent(self, event):
         """Animação ao sair o mouse - removida para evitar assimetria"""
         super().leaveEvent(event)
-        # Apenas mudança de cor, sem animação de tamanho
-        pass
\ No newline at end of file
+        # Apenas mudança de cor (e do ícone), sem animação de tamanho
+        self.update_icon()
+
+    def focusInEvent(self, event):
+        """Foco usa o fundo de destaque"""
+        super().focusInEvent(event)
+        self.update_icon()
+
+    def focusOutEvent(self, event):
+        """Foco perdido volta ao fundo normal"""
+        super().focusOutEvent(event)
+        self.update_icon()
\ No newline at end of file
@@ -0,0 +1,224 @@
+"""
+Widget Chibi
+Pet virtual em uma janela Qt sem bordas e translúcida, animado pelo relógio compartilhado
+"""
+
+import os
+import logging
+from PyQt6.QtWidgets import QWidget, QMenu
+from PyQt6.QtCore import Qt, QTimer, QRect, QPointF, pyqtSignal
+from PyQt6.QtGui import QPainter, QGuiApplication
+
+from utils.animation_clock import AnimationClock
+from utils.sprite_cache import SpriteCache
+
+logger = logging.getLogger(__name__)
+
+CHIBI_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Engine", "Chibi")
+SPRITES_PATH = os.path.join(CHIBI_DIR, "sprites.json")
+
+
+class ChibiWidget(QWidget):
+    """Pet que passeia pela tela e quica nas bordas; parado ou oculto não gera wakeups
+
+    Estados de animação: "walk" andando, "drag" sendo arrastado e "idle" parado
+    (estacionado ou na pausa depois de ser solto).
+    """
+
+    visibility_changed = pyqtSignal(bool)
+    sprite_cache = None  # Compartilhado entre instâncias
+
+    SCALE = 0.3
+    SPEED = (100.0, 66.0)  # px/s (o pet original andava 3 px e 2 px a cada 30 ms)
+    RESUME_DELAY_MS = 1000  # Pausa depois de ser solto antes de voltar a andar
+
+    def __init__(self, manifest_path=SPRITES_PATH, scale=SCALE, clock=None, parent=None):
+        super().__init__(parent)
+        self.setWindowFlags(Qt.WindowType.FramelessWindowHint
+                            | Qt.WindowType.WindowStaysOnTopHint
+                            | Qt.WindowType.Tool)
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
+        self.setCursor(Qt.CursorShape.OpenHandCursor)
+
+        self.clock = clock or AnimationClock.shared()
+        if ChibiWidget.sprite_cache is None:
+            ChibiWidget.sprite_cache = SpriteCache()
+        screen = QGuiApplication.primaryScreen()
+        device_pixel_ratio = screen.devicePixelRatio() if screen else 1.0
+        self.atlas = ChibiWidget.sprite_cache.get(manifest_path, scale, device_pixel_ratio)
+        self.setFixedSize(*self.atlas.logical_size())
+        self.state = "walk"
+        self.state_time = 0.0  # Segundos desde a entrada no estado atual
+        self.frame_rect = self.atlas.frame_rect(self.state, 0.0)
+
+        self.x, self.y = 100.0, 100.0
+        self.vx, self.vy = self.SPEED
+        self.parked = False
+        self.dragging = False
+        self.drag_offset = QPointF()
+        self.bounds = QRect()  # Área disponível da tela atual (atualizada por sinal, não por quadro)
+        self.tracked_screen = None
+        self.move(round(self.x), round(self.y))
+
+        self.resume_timer = QTimer(self)
+        self.resume_timer.setSingleShot(True)
+        self.resume_timer.setInterval(self.RESUME_DELAY_MS)
+        self.resume_timer.timeout.connect(self.resume_moving)
+
+    def paintEvent(self, event):
+        """Desenha o sprite (o fundo da janela é transparente)"""
+        painter = QPainter(self)
+        painter.drawPixmap(self.rect(), self.atlas.pixmap, self.frame_rect)
+        painter.end()
+
+    def showEvent(self, event):
+        """Ao aparecer, passa a acompanhar a tela e volta a animar"""
+        super().showEvent(event)
+        handle = self.windowHandle()
+        if handle is not None:
+            try:
+                handle.screenChanged.disconnect(self.track_screen)
+            except TypeError:
+                pass
+            handle.screenChanged.connect(self.track_screen)
+        self.track_screen(self.screen())
+        self.update_animation()
+        self.visibility_changed.emit(True)
+
+    def hideEvent(self, event):
+        """Oculto: sai do relógio"""
+        super().hideEvent(event)
+        self.update_animation()
+        self.visibility_changed.emit(False)
+
+    def track_screen(self, screen):
+        """Limites de movimento da tela em que o pet está"""
+        if self.tracked_screen is not None:
+            self.tracked_screen.availableGeometryChanged.disconnect(self.update_bounds)
+        self.tracked_screen = screen or QGuiApplication.primaryScreen()
+        if self.tracked_screen is not None:
+            self.tracked_screen.availableGeometryChanged.connect(self.update_bounds)
+        self.update_bounds()
+
+    def update_bounds(self, *_):
+        """Atualiza a área disponível da tela (barra de tarefas excluída)"""
+        if self.tracked_screen is not None:
+            self.bounds = self.tracked_screen.availableGeometry()
+
+    def current_state(self):
+        """Estado de animação correspondente à situação do pet"""
+        if self.dragging and self.resume_timer.isActive():
+            return "idle"  # Pausa depois de ser solto
+        if self.dragging:
+            return "drag"
+        if self.parked:
+            return "idle"
+        return "walk"
+
+    def set_state(self, state):
+        """Troca o estado de animação (só troca retângulos do atlas, sem decodificar nada)"""
+        if not self.atlas.has_state(state):
+            state = "walk"
+        if state != self.state:
+            self.state = state
+            self.state_time = 0.0
+            self.show_frame(self.atlas.frame_rect(state, 0.0))
+
+    def show_frame(self, rect):
+        """Repinta apenas quando o quadro muda"""
+        if rect != self.frame_rect:
+            self.frame_rect = rect
+            self.update()
+
+    def update_animation(self):
+        """Inscreve no relógio só quando há movimento ou um estado animado para mostrar
+
+        Estacionado ou oculto nunca anima: zero wakeups.
+        """
+        self.set_state(self.current_state())
+        moving = not self.parked and not self.dragging
+        animated = not self.parked and self.atlas.frame_count(self.state) > 1
+        if self.isVisible() and (moving or animated):
+            self.clock.subscribe(self.tick)
+        else:
+            self.clock.unsubscribe(self.tick)
+
+    def set_parked(self, parked):
+        """Estaciona (parado, sem wakeups) ou libera o pet"""
+        self.parked = parked
+        self.update_animation()
+
+    def tick(self, dt):
+        """Avança o quadro do estado e, andando, a posição (quicando nas bordas da tela)"""
+        self.state_time += dt
+        self.show_frame(self.atlas.frame_rect(self.state, self.state_time))
+        if self.dragging or self.parked or self.bounds.isEmpty():
+            return
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+
+        left, top = self.bounds.left(), self.bounds.top()
+        right = self.bounds.left() + self.bounds.width() - self.width()
+        bottom = self.bounds.top() + self.bounds.height() - self.height()
+        if self.x < left or self.x > right:
+            self.x = min(max(self.x, left), right)
+            self.vx = -self.vx
+        if self.y < top or self.y > bottom:
+            self.y = min(max(self.y, top), bottom)
+            self.vy = -self.vy
+        self.move(round(self.x), round(self.y))
+
+    def mousePressEvent(self, event):
+        """Começa a arrastar (a animação pausa)"""
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.dragging = True
+            self.resume_timer.stop()
+            self.drag_offset = event.position()
+            self.setCursor(Qt.CursorShape.ClosedHandCursor)
+            self.update_animation()
+
+    def mouseMoveEvent(self, event):
+        """Segue o cursor enquanto arrasta"""
+        if self.dragging and event.buttons() & Qt.MouseButton.LeftButton:
+            position = event.globalPosition() - self.drag_offset
+            self.x, self.y = position.x(), position.y()
+            self.move(round(self.x), round(self.y))
+
+    def mouseReleaseEvent(self, event):
+        """Solto: volta a andar depois de uma pausa"""
+        if event.button() == Qt.MouseButton.LeftButton and self.dragging:
+            self.setCursor(Qt.CursorShape.OpenHandCursor)
+            self.resume_timer.start()
+            self.update_animation()
+
+    def mouseDoubleClickEvent(self, event):
+        """Duplo clique estaciona ou libera o pet"""
+        if event.button() == Qt.MouseButton.LeftButton:
+            self.set_parked(not self.parked)
+
+    def resume_moving(self):
+        """Fim da pausa pós-arraste"""
+        self.dragging = False
+        self.update_animation()
+
+    def contextMenuEvent(self, event):
+        """Menu com estacionar/liberar e ocultar"""
+        menu = QMenu(self)
+        menu.setStyleSheet("""
+            QMenu {
+                background-color: #3a3a3a;
+                color: white;
+                border: 1px solid #555555;
+            }
+            QMenu::item:selected {
+                background-color: #4a90e2;
+            }
+        """)
+        park_action = menu.addAction("Resume" if self.parked else "Park")
+        hide_action = menu.addAction("Hide")
+        chosen = menu.exec(event.globalPos())
+        if chosen == park_action:
+            self.set_parked(not self.parked)
+        elif chosen == hide_action:
+            self.hide()
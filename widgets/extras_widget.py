@@ -6,19 +6,95 @@ Widget específico para a seção Extras com ferramentas de processamento de ima
 import os
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QSlider, QColorDialog, QFileDialog, 
-                             QMessageBox)
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QColor, QPixmap
+                             QMessageBox, QProgressBar, QInputDialog, QComboBox)
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QColor
+
+from utils.image_ops import ImageOps
+from utils.image_handler import ImageHandler
+from utils.edit_history import EditHistory
+from widgets.chibi_widget import ChibiWidget
+from utils.thumbnail_cache import ThumbnailCache
+from utils.image_worker import ImageJob, BatchJob, ExportJob
+from utils.exporter import DEFAULT_LEVEL, Exporter, format_report as format_export_report
+from utils.batch_processor import (OPERATIONS, BatchProcessor, collect_inputs, format_report,
+                                   operation_args)
 
 
 class ExtrasWidget(QWidget):
     """Widget específico para a seção Extras"""
-    
+
+    # (texto, nome da operação em batch_processor.OPERATIONS)
+    REMOVAL_MODES = [
+        ("Global threshold", "transparent"),
+        ("Edge-connected", "transparent_edge"),
+        ("Chroma key (RGB)", "chroma_key"),
+        ("Chroma key (Lab)", "chroma_key_lab"),
+    ]
+
+    TINT_MODES = [
+        ("Flat color", "tint"),
+        ("Colorize (keep shading)", "tint_colorize"),
+        ("Hue shift", "tint_hue"),
+        ("Gradient map", "tint_gradient"),
+    ]
+
+    thumbnail_cache = None  # Compartilhado entre instâncias
+
+    SLIDER_STYLE = """
+        QSlider::groove:horizontal {
+            border: 1px solid #666666;
+            height: 6px;
+            background: #333333;
+            border-radius: 3px;
+        }
+        QSlider::handle:horizontal {
+            background: #4a90e2;
+            border: 1px solid #357abd;
+            width: 16px;
+            height: 16px;
+            border-radius: 8px;
+            margin: -5px 0;
+        }
+        QSlider::handle:horizontal:hover {
+            background: #5ba0f2;
+        }
+    """
+
+    COMBO_STYLE = """
+        QComboBox {
+            background-color: #4a4a4a;
+            color: white;
+            border: none;
+            border-radius: 4px;
+            padding: 4px 10px;
+            font-size: 13px;
+            min-width: 150px;
+        }
+        QComboBox:hover {
+            background-color: #555555;
+        }
+        QComboBox QAbstractItemView {
+            background-color: #3a3a3a;
+            color: white;
+            selection-background-color: #4a90e2;
+        }
+    """
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.selected_image_path = None
         self.selected_color = (255, 255, 255)  # Cor padrão branca
         self.tolerance = 30  # Tolerância padrão
+        self.removal_mode = "transparent"  # Limiar global (comportamento original)
+        self.key_color = (0, 255, 0)  # Cor-chave padrão (verde)
+        self.softness = 20  # Largura da rampa de alpha do chroma key
+        self.tint_mode = "tint"  # Tint chapado (comportamento original)
+        self.shadow_color = (0, 0, 0)  # Cor das sombras no mapa de gradiente
+        self.current_job = None  # Job de imagem em execução
+        self.preview_pixels = None  # Proxy reduzido da imagem para o preview ao vivo
+        self.history = EditHistory()  # Passos encadeados da imagem selecionada (undo/redo)
+        self.chibi = None  # Pet virtual (janela própria, criada na primeira vez)
         self.setupUI()
 
     def setupUI(self):
@@ -92,6 +168,40 @@ class ExtrasWidget(QWidget):
         color_container.addStretch()
         color_layout.addLayout(color_container)
 
+        # Modo de tint
+        tint_container = QHBoxLayout()
+        tint_label = QLabel("Tint Mode:")
+        tint_label.setStyleSheet("color: white; font-size: 14px; font-weight: 500;")
+
+        self.tint_combo = QComboBox()
+        for text, operation in self.TINT_MODES:
+            self.tint_combo.addItem(text, operation)
+        self.tint_combo.setStyleSheet(self.COMBO_STYLE)
+        self.tint_combo.currentIndexChanged.connect(self.update_tint_mode)
+
+        tint_container.addWidget(tint_label)
+        tint_container.addWidget(self.tint_combo)
+        tint_container.addStretch()
+        color_layout.addLayout(tint_container)
+
+        # Cor das sombras (visível apenas no mapa de gradiente)
+        self.shadow_section = QWidget()
+        shadow_container = QHBoxLayout(self.shadow_section)
+        shadow_container.setContentsMargins(0, 0, 0, 0)
+        shadow_label = QLabel("Shadow Color:")
+        shadow_label.setStyleSheet("color: white; font-size: 14px; font-weight: 500;")
+
+        self.shadow_button = QPushButton()
+        self.shadow_button.setFixedSize(60, 30)
+        self.style_color_button(self.shadow_button, self.shadow_color)
+        self.shadow_button.clicked.connect(self.select_shadow_color)
+
+        shadow_container.addWidget(shadow_label)
+        shadow_container.addWidget(self.shadow_button)
+        shadow_container.addStretch()
+        self.shadow_section.setVisible(False)
+        color_layout.addWidget(self.shadow_section)
+
         # Slider de tolerância
         tolerance_container = QVBoxLayout()
         tolerance_label = QLabel("Transparency Tolerance:")
@@ -101,37 +211,76 @@ class ExtrasWidget(QWidget):
         self.tolerance_slider.setMinimum(0)
         self.tolerance_slider.setMaximum(100)
         self.tolerance_slider.setValue(30)
-        self.tolerance_slider.setStyleSheet("""
-            QSlider::groove:horizontal {
-                border: 1px solid #666666;
-                height: 6px;
-                background: #333333;
-                border-radius: 3px;
-            }
-            QSlider::handle:horizontal {
-                background: #4a90e2;
-                border: 1px solid #357abd;
-                width: 16px;
-                height: 16px;
-                border-radius: 8px;
-                margin: -5px 0;
-            }
-            QSlider::handle:horizontal:hover {
-                background: #5ba0f2;
-            }
-        """)
+        self.tolerance_slider.setStyleSheet(self.SLIDER_STYLE)
         
         self.tolerance_value_label = QLabel("30")
         self.tolerance_value_label.setStyleSheet("color: #4a90e2; font-size: 12px; font-weight: bold;")
         self.tolerance_value_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         self.tolerance_slider.valueChanged.connect(self.update_tolerance)
+
+        # Debounce do preview: cada novo valor reinicia o timer e descarta o pendente
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(30)
+        self.preview_timer.timeout.connect(self.render_preview)
         
         tolerance_container.addWidget(tolerance_label)
         tolerance_container.addWidget(self.tolerance_slider)
         tolerance_container.addWidget(self.tolerance_value_label)
         color_layout.addLayout(tolerance_container)
 
+        # Modo de remoção de fundo
+        mode_container = QHBoxLayout()
+        mode_label = QLabel("Removal Mode:")
+        mode_label.setStyleSheet("color: white; font-size: 14px; font-weight: 500;")
+
+        self.mode_combo = QComboBox()
+        for text, operation in self.REMOVAL_MODES:
+            self.mode_combo.addItem(text, operation)
+        self.mode_combo.setStyleSheet(self.COMBO_STYLE)
+        self.mode_combo.currentIndexChanged.connect(self.update_removal_mode)
+
+        mode_container.addWidget(mode_label)
+        mode_container.addWidget(self.mode_combo)
+        mode_container.addStretch()
+        color_layout.addLayout(mode_container)
+
+        # Controles do chroma key (visíveis apenas nos modos de chroma key)
+        self.chroma_section = QWidget()
+        chroma_layout = QVBoxLayout(self.chroma_section)
+        chroma_layout.setContentsMargins(0, 0, 0, 0)
+        chroma_layout.setSpacing(10)
+
+        key_container = QHBoxLayout()
+        key_label = QLabel("Key Color:")
+        key_label.setStyleSheet("color: white; font-size: 14px; font-weight: 500;")
+
+        self.key_button = QPushButton()
+        self.key_button.setFixedSize(60, 30)
+        self.style_color_button(self.key_button, self.key_color)
+        self.key_button.clicked.connect(self.select_key_color)
+
+        key_container.addWidget(key_label)
+        key_container.addWidget(self.key_button)
+        key_container.addStretch()
+        chroma_layout.addLayout(key_container)
+
+        softness_label = QLabel("Edge Softness:")
+        softness_label.setStyleSheet("color: white; font-size: 14px; font-weight: 500;")
+
+        self.softness_slider = QSlider(Qt.Orientation.Horizontal)
+        self.softness_slider.setMinimum(0)
+        self.softness_slider.setMaximum(100)
+        self.softness_slider.setValue(self.softness)
+        self.softness_slider.setStyleSheet(self.SLIDER_STYLE)
+        self.softness_slider.valueChanged.connect(self.update_softness)
+
+        chroma_layout.addWidget(softness_label)
+        chroma_layout.addWidget(self.softness_slider)
+        self.chroma_section.setVisible(False)
+        color_layout.addWidget(self.chroma_section)
+
         left_layout.addWidget(color_section)
 
         # Botões de ação
@@ -140,8 +289,12 @@ class ExtrasWidget(QWidget):
 
         self.transparent_btn = QPushButton("Make Background Transparent")
         self.tinter_btn = QPushButton("Apply Color Tint")
+        self.export_btn = QPushButton("Export Icon...")
+        self.batch_btn = QPushButton("Batch Process Folder...")
+        self.chibi_btn = QPushButton("Show Desktop Pet")
+        self.chibi_btn.setCheckable(True)
 
-        for btn in [self.transparent_btn, self.tinter_btn]:
+        for btn in [self.transparent_btn, self.tinter_btn, self.export_btn, self.batch_btn, self.chibi_btn]:
             btn.setFixedHeight(50)
             btn.setStyleSheet("""
                 QPushButton {
@@ -156,7 +309,7 @@ class ExtrasWidget(QWidget):
                 QPushButton:hover {
                     background-color: #4a90e2;
                 }
-                QPushButton:pressed {
+                QPushButton:pressed, QPushButton:checked {
                     background-color: #357abd;
                 }
                 QPushButton:disabled {
@@ -167,7 +320,53 @@ class ExtrasWidget(QWidget):
             btn.setEnabled(False)  # Inicialmente desabilitados
             buttons_layout.addWidget(btn)
 
+        self.batch_btn.setEnabled(True)  # Não depende da imagem selecionada
+        self.chibi_btn.setEnabled(True)
         left_layout.addLayout(buttons_layout)
+
+        # Progresso do job em execução
+        progress_layout = QHBoxLayout()
+        progress_layout.setSpacing(10)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setFixedHeight(20)
+        self.progress_bar.setStyleSheet("""
+            QProgressBar {
+                background-color: #333333;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                text-align: center;
+                font-size: 12px;
+            }
+            QProgressBar::chunk {
+                background-color: #4a90e2;
+                border-radius: 4px;
+            }
+        """)
+
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setFixedSize(80, 28)
+        self.cancel_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #4a4a4a;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                font-size: 12px;
+            }
+            QPushButton:hover {
+                background-color: #c0392b;
+            }
+        """)
+        self.cancel_btn.clicked.connect(self.cancel_job)
+
+        progress_layout.addWidget(self.progress_bar)
+        progress_layout.addWidget(self.cancel_btn)
+        left_layout.addLayout(progress_layout)
+        self.set_progress_visible(False)
+
         left_layout.addStretch()
 
         # Lado direito - Área de imagem
@@ -196,8 +395,42 @@ class ExtrasWidget(QWidget):
         self.image_area.setCursor(Qt.CursorShape.PointingHandCursor)
         self.image_area.mousePressEvent = self.select_image
 
+        # Desfazer/refazer os passos encadeados
+        history_layout = QHBoxLayout()
+        history_layout.setSpacing(10)
+
+        self.undo_btn = QPushButton("Undo")
+        self.redo_btn = QPushButton("Redo")
+        for btn in [self.undo_btn, self.redo_btn]:
+            btn.setFixedSize(80, 28)
+            btn.setStyleSheet("""
+                QPushButton {
+                    background-color: #4a4a4a;
+                    color: white;
+                    border: none;
+                    border-radius: 4px;
+                    font-size: 12px;
+                }
+                QPushButton:hover {
+                    background-color: #4a90e2;
+                }
+                QPushButton:disabled {
+                    background-color: #333333;
+                    color: #666666;
+                }
+            """)
+            btn.setEnabled(False)
+        self.undo_btn.clicked.connect(self.undo_edit)
+        self.redo_btn.clicked.connect(self.redo_edit)
+
+        history_layout.addStretch()
+        history_layout.addWidget(self.undo_btn)
+        history_layout.addWidget(self.redo_btn)
+        history_layout.addStretch()
+
         # Informações sobre os arquivos de saída
-        output_info = QLabel("Output files will be saved as:\n• output.png (transparent background)\n• icon_tinted.png (color tinted)")
+        output_info = QLabel("Operations chain on the current result.\n"
+                             "Output files will be saved as:\n• output.png (transparent background)\n• icon_tinted.png (color tinted)")
         output_info.setStyleSheet("""
             QLabel {
                 color: #888888;
@@ -210,6 +443,7 @@ class ExtrasWidget(QWidget):
         output_info.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         right_layout.addWidget(self.image_area)
+        right_layout.addLayout(history_layout)
         right_layout.addWidget(output_info)
         right_layout.addStretch()
 
@@ -220,11 +454,18 @@ class ExtrasWidget(QWidget):
         # Conectar sinais dos botões
         self.transparent_btn.clicked.connect(self.make_background_transparent)
         self.tinter_btn.clicked.connect(self.apply_color_tint)
+        self.export_btn.clicked.connect(self.export_image)
+        self.batch_btn.clicked.connect(self.process_batch)
+        self.chibi_btn.toggled.connect(self.toggle_chibi)
 
     def update_color_button(self):
         """Atualiza a cor do botão de seleção de cor"""
-        r, g, b = self.selected_color
-        self.color_button.setStyleSheet(f"""
+        self.style_color_button(self.color_button, self.selected_color)
+
+    def style_color_button(self, button, color):
+        """Pinta um botão de amostra de cor"""
+        r, g, b = color
+        button.setStyleSheet(f"""
             QPushButton {{
                 background-color: rgb({r}, {g}, {b});
                 border: 2px solid #666666;
@@ -242,22 +483,82 @@ class ExtrasWidget(QWidget):
             self.selected_color = (color.red(), color.green(), color.blue())
             self.update_color_button()
 
+    def select_key_color(self):
+        """Abre diálogo para selecionar a cor-chave do chroma key"""
+        color = QColorDialog.getColor(QColor(*self.key_color), self)
+        if color.isValid():
+            self.key_color = (color.red(), color.green(), color.blue())
+            self.style_color_button(self.key_button, self.key_color)
+            self.schedule_preview()
+
+    def select_shadow_color(self):
+        """Abre diálogo para selecionar a cor das sombras do mapa de gradiente"""
+        color = QColorDialog.getColor(QColor(*self.shadow_color), self)
+        if color.isValid():
+            self.shadow_color = (color.red(), color.green(), color.blue())
+            self.style_color_button(self.shadow_button, self.shadow_color)
+
+    def update_tint_mode(self, index):
+        """Atualiza o modo de tint"""
+        self.tint_mode = self.tint_combo.itemData(index)
+        self.shadow_section.setVisible(self.tint_mode == "tint_gradient")
+
+    def tint_args(self):
+        """Argumentos da operação de tint selecionada"""
+        return operation_args(self.tint_mode, color=self.selected_color, shadow=self.shadow_color)
+
+    def update_softness(self, value):
+        """Atualiza a suavidade da borda do chroma key"""
+        self.softness = value
+        self.schedule_preview()
+
+    def schedule_preview(self):
+        """Agenda (ou reagenda) o preview ao vivo"""
+        if self.preview_pixels is not None:
+            self.preview_timer.start()
+
+    def removal_args(self):
+        """Argumentos da operação de remoção de fundo selecionada"""
+        return operation_args(self.removal_mode, self.tolerance,
+                              key=self.key_color, softness=self.softness)
+
     def update_tolerance(self, value):
         """Atualiza o valor da tolerância"""
         self.tolerance = value
         self.tolerance_value_label.setText(str(value))
+        self.schedule_preview()
+
+    def update_removal_mode(self, index):
+        """Atualiza o modo de remoção de fundo"""
+        self.removal_mode = self.mode_combo.itemData(index)
+        self.chroma_section.setVisible(self.removal_mode.startswith("chroma_key"))
+        self.schedule_preview()
+
+    def render_preview(self):
+        """Renderiza a transparência sobre o proxy reduzido (a imagem completa só no botão)"""
+        if self.preview_pixels is None:
+            return
+        operation = OPERATIONS[self.removal_mode]
+        pixels = operation(self.preview_pixels.copy(), *self.removal_args())
+        self.image_area.setPixmap(ImageHandler.array_to_pixmap(pixels))
 
     def select_image(self, event):
         """Abre diálogo para selecionar imagem"""
+        if self.current_job is not None:
+            return  # O job em execução ainda grava no histórico da imagem atual
         file_path, _ = QFileDialog.getOpenFileName(
             self,
             "Select Image",
             "",
-            "Image files (*.png *.jpg *.jpeg *.gif *.bmp *.tiff);;All files (*.*)"
+            "Image files (*.png *.apng *.jpg *.jpeg *.gif *.webp *.bmp *.tiff);;All files (*.*)"
         )
         
         if file_path:
             self.selected_image_path = file_path
+            self.preview_pixels = None
+            self.history.clear()
+            self.update_history_buttons()
+            self.preview_timer.stop()
             self.update_image_display()
             self.update_file_label()
             self.enable_buttons()
@@ -266,31 +567,42 @@ class ExtrasWidget(QWidget):
         """Atualiza a exibição da imagem selecionada"""
         if self.selected_image_path:
             try:
-                pixmap = QPixmap(self.selected_image_path)
-                if not pixmap.isNull():
-                    # Redimensionar mantendo proporção
-                    scaled_pixmap = pixmap.scaled(
-                        self.image_area.size(), 
-                        Qt.AspectRatioMode.KeepAspectRatio, 
-                        Qt.TransformationMode.SmoothTransformation
-                    )
-                    self.image_area.setPixmap(scaled_pixmap)
-                    self.image_area.setStyleSheet("""
-                        QLabel {
-                            background-color: #3a3a3a;
-                            border: 2px solid #4a90e2;
-                            border-radius: 12px;
-                        }
-                        QLabel:hover {
-                            border-color: #5ba0f2;
-                            background-color: #404040;
-                        }
-                    """)
-                else:
-                    self.show_error("Error", "Could not load the selected image.")
+                # Miniatura decodificada já no tamanho do preview (e reaproveitada do disco)
+                if ExtrasWidget.thumbnail_cache is None:
+                    ExtrasWidget.thumbnail_cache = ThumbnailCache()
+                area = self.image_area.contentsRect()
+                path = self.selected_image_path
+                self.image_area.setText("Loading preview...")
+                ExtrasWidget.thumbnail_cache.request(
+                    path, area.width(), area.height(),
+                    lambda pixels: self.on_thumbnail_loaded(path, pixels))
             except Exception as e:
                 self.show_error("Error", f"Error loading image: {str(e)}")
 
+    def on_thumbnail_loaded(self, path, pixels):
+        """Exibe a miniatura e a usa como proxy do preview ao vivo"""
+        if path != self.selected_image_path:
+            return  # Outra imagem foi selecionada enquanto esta decodificava
+        if pixels is None:
+            self.show_error("Error", "Could not load the selected image.")
+            return
+
+        self.image_area.setPixmap(ImageHandler.array_to_pixmap(pixels))
+        self.image_area.setStyleSheet("""
+            QLabel {
+                background-color: #3a3a3a;
+                border: 2px solid #4a90e2;
+                border-radius: 12px;
+            }
+            QLabel:hover {
+                border-color: #5ba0f2;
+                background-color: #404040;
+            }
+        """)
+
+        # Proxy no tamanho do preview para o slider de tolerância
+        self.preview_pixels = pixels
+
     def update_file_label(self):
         """Atualiza o label com o nome do arquivo"""
         if self.selected_image_path:
@@ -310,8 +622,45 @@ class ExtrasWidget(QWidget):
 
     def enable_buttons(self):
         """Habilita os botões após selecionar imagem"""
-        self.transparent_btn.setEnabled(True)
-        self.tinter_btn.setEnabled(True)
+        self.set_buttons_enabled(True)
+
+    def set_buttons_enabled(self, enabled):
+        """Habilita ou desabilita os botões de ação"""
+        enabled = enabled and self.selected_image_path is not None and self.current_job is None
+        self.transparent_btn.setEnabled(enabled)
+        self.tinter_btn.setEnabled(enabled)
+        self.export_btn.setEnabled(enabled)
+        self.batch_btn.setEnabled(self.current_job is None)
+        self.image_area.setCursor(Qt.CursorShape.PointingHandCursor if self.current_job is None
+                                  else Qt.CursorShape.ForbiddenCursor)
+        self.update_history_buttons()
+
+    def update_history_buttons(self):
+        """Habilita undo/redo conforme o histórico (nunca durante um job, que escreve nele)"""
+        idle = self.current_job is None
+        self.undo_btn.setEnabled(idle and self.history.can_undo())
+        self.redo_btn.setEnabled(idle and self.history.can_redo())
+        self.undo_btn.setToolTip(f"Undo {self.history.label()}" if self.history.can_undo() else "")
+        self.redo_btn.setToolTip(f"Redo {self.history.redo_label()}" if self.history.can_redo() else "")
+
+    def undo_edit(self):
+        """Volta ao passo anterior"""
+        if self.current_job is None and self.history.undo():
+            self.show_history_state()
+
+    def redo_edit(self):
+        """Refaz o passo desfeito"""
+        if self.current_job is None and self.history.redo():
+            self.show_history_state()
+
+    def show_history_state(self):
+        """Exibe o estado atual do histórico e o usa como proxy do preview"""
+        if self.history.current_state() is None:
+            return
+        area = self.image_area.contentsRect()
+        self.preview_pixels = ImageOps.proxy_array(self.history.pixels(), area.width(), area.height())
+        self.image_area.setPixmap(ImageHandler.array_to_pixmap(self.preview_pixels))
+        self.update_history_buttons()
 
     def make_background_transparent(self):
         """Função integrada do icontransparent.py"""
@@ -319,32 +668,14 @@ class ExtrasWidget(QWidget):
             self.show_error("Error", "Please select an image first.")
             return
 
-        try:
-            from PIL import Image
-            
-            # Carregar a imagem
-            img = Image.open(self.selected_image_path).convert("RGBA")
-            data = img.getdata()
-            new_data = []
-
-            # Processar cada pixel
-            for item in data:
-                r, g, b, a = item
-                if r <= self.tolerance and g <= self.tolerance and b <= self.tolerance:
-                    # Transformar em transparente
-                    new_data.append((0, 0, 0, 0))
-                else:
-                    new_data.append(item)
-
-            # Salvar resultado
-            img.putdata(new_data)
-            output_path = "output.png"
-            img.save(output_path)
-            
-            self.show_success("Success", f"Background made transparent!\n\nSaved as: {output_path}\nTolerance used: {self.tolerance}")
-            
-        except Exception as e:
-            self.show_error("Error", f"Error processing image: {str(e)}")
+        tolerance = self.tolerance
+        mode = self.mode_combo.currentText()
+        job = ImageJob(self.selected_image_path, "output.png",
+                       OPERATIONS[self.removal_mode], *self.removal_args())
+        job.history = self.history
+        job.label = f"background removal ({mode})"
+        message = f"Background made transparent!\n\nSaved as: {{}}\nTolerance used: {tolerance}\nMode: {mode}"
+        self.start_job(job, lambda path: self.on_edit_finished(message.format(path), job))
 
     def apply_color_tint(self):
         """Função integrada do icontinter.py"""
@@ -352,29 +683,134 @@ class ExtrasWidget(QWidget):
             self.show_error("Error", "Please select an image first.")
             return
 
-        try:
-            from PIL import Image
-            
-            # Carregar a imagem
-            img = Image.open(self.selected_image_path).convert("RGBA")
-            pixels = img.getdata()
-
-            # Aplicar nova cor mantendo transparência
-            updated_pixels = [
-                (self.selected_color[0], self.selected_color[1], self.selected_color[2], a) if a > 0 else (r, g, b, a)
-                for r, g, b, a in pixels
-            ]
-
-            # Salvar resultado
-            img.putdata(updated_pixels)
-            output_path = "icon_tinted.png"
-            img.save(output_path)
-            
-            r, g, b = self.selected_color
-            self.show_success("Success", f"Color tint applied!\n\nSaved as: {output_path}\nColor used: RGB({r}, {g}, {b})")
-            
-        except Exception as e:
-            self.show_error("Error", f"Error processing image: {str(e)}")
+        r, g, b = self.selected_color
+        mode = self.tint_combo.currentText()
+        job = ImageJob(self.selected_image_path, "icon_tinted.png",
+                       OPERATIONS[self.tint_mode], *self.tint_args())
+        job.history = self.history
+        job.label = f"tint ({mode})"
+        message = f"Color tint applied!\n\nSaved as: {{}}\nColor used: RGB({r}, {g}, {b})\nMode: {mode}"
+        self.start_job(job, lambda path: self.on_edit_finished(message.format(path), job))
+
+    def on_edit_finished(self, message, job):
+        """Mostra o resultado encadeado e confirma o arquivo salvo"""
+        self.show_history_state()
+        if job.tiled:
+            message += ("\n\nLarge image processed in strips: the result was only saved to the file, "
+                        "so the next operation starts from the original and there is nothing to undo.")
+        self.show_success("Success", message)
+
+    def export_image(self):
+        """Exporta o estado atual como PNG otimizado, WebP e ICO multi-resolução"""
+        if not self.selected_image_path:
+            self.show_error("Error", "Please select an image first.")
+            return
+
+        output_dir = QFileDialog.getExistingDirectory(self, "Select Export Folder")
+        if not output_dir:
+            return
+
+        level, ok = QInputDialog.getInt(self, "Export", "Compression level (0 = fastest, 9 = smallest):",
+                                        DEFAULT_LEVEL, 0, 9)
+        if not ok:
+            return
+
+        # Exporta o resultado encadeado, se houver; senão o arquivo original
+        source = self.history.pixels() if self.history.current_state() else self.selected_image_path
+        stem = os.path.splitext(os.path.basename(self.selected_image_path))[0]
+        job = ExportJob(Exporter(level=level), source, output_dir, stem)
+        self.start_job(job, lambda report: self.show_success("Export Complete", format_export_report(report)))
+
+    def toggle_chibi(self, checked):
+        """Mostra ou oculta o pet virtual"""
+        if checked and self.chibi is None:
+            self.chibi = ChibiWidget()
+            self.chibi.visibility_changed.connect(self.on_chibi_visibility_changed)
+        if self.chibi is not None:
+            self.chibi.setVisible(checked)
+
+    def on_chibi_visibility_changed(self, visible):
+        """Mantém o botão em sincronia quando o pet é ocultado pelo próprio menu"""
+        self.chibi_btn.blockSignals(True)
+        self.chibi_btn.setChecked(visible)
+        self.chibi_btn.blockSignals(False)
+        self.chibi_btn.setText("Hide Desktop Pet" if visible else "Show Desktop Pet")
+
+    def process_batch(self):
+        """Aplica a operação escolhida a todas as imagens de uma pasta"""
+        source_dir = QFileDialog.getExistingDirectory(self, "Select Input Folder")
+        if not source_dir:
+            return
+
+        files = collect_inputs(source_dir)
+        if not files:
+            self.show_error("Error", "No images found in the selected folder.")
+            return
+
+        operations = ["Make Background Transparent", "Apply Color Tint"]
+        choice, ok = QInputDialog.getItem(self, "Batch Processing", "Operation:", operations, 0, False)
+        if not ok:
+            return
+
+        output_dir = QFileDialog.getExistingDirectory(self, "Select Output Folder")
+        if not output_dir:
+            return
+
+        if choice == operations[0]:
+            processor = BatchProcessor(self.removal_mode, self.removal_args(), output_dir)
+        else:
+            processor = BatchProcessor(self.tint_mode, self.tint_args(), output_dir)
+
+        self.start_job(BatchJob(processor, files),
+                       lambda report: self.show_success("Batch Complete", format_report(report)))
+
+    def start_job(self, job, on_finished):
+        """Envia um job (ImageJob ou BatchJob) para o pool de threads"""
+        if self.current_job:
+            return
+
+        job.signals.progress.connect(self.progress_bar.setValue)
+        job.signals.finished.connect(lambda result: self.on_job_finished(on_finished, result))
+        job.signals.error.connect(self.on_job_error)
+        job.signals.cancelled.connect(self.on_job_cancelled)
+
+        self.current_job = job
+        self.progress_bar.setValue(0)
+        self.set_progress_visible(True)
+        self.set_buttons_enabled(False)
+        job.start()
+
+    def cancel_job(self):
+        """Cancela o job em execução"""
+        if self.current_job:
+            self.current_job.cancel()
+            self.cancel_btn.setEnabled(False)
+
+    def finish_job(self):
+        """Restaura a interface após o término de um job"""
+        self.current_job = None
+        self.set_progress_visible(False)
+        self.set_buttons_enabled(True)
+
+    def on_job_finished(self, on_finished, result):
+        """Resultado do job entregue na thread da UI"""
+        self.finish_job()
+        on_finished(result)
+
+    def on_job_error(self, error):
+        """Erro do job entregue na thread da UI"""
+        self.finish_job()
+        self.show_error("Error", f"Error processing image: {error}")
+
+    def on_job_cancelled(self):
+        """Cancelamento confirmado pelo job"""
+        self.finish_job()
+
+    def set_progress_visible(self, visible):
+        """Mostra ou oculta a barra de progresso e o botão de cancelar"""
+        self.progress_bar.setVisible(visible)
+        self.cancel_btn.setVisible(visible)
+        self.cancel_btn.setEnabled(visible)
 
     def show_error(self, title, message):
         """Mostra mensagem de erro"""
@@ -6,17 +6,21 @@ Widget para exibir informações do perfil do usuário
 from PyQt6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QLabel
 from PyQt6.QtCore import Qt
 
-from utils.image_handler import ImageHandler
+from utils.avatar_cache import AvatarCache
 
 
 class ProfileWidget(QWidget):
     """Widget do perfil do usuário"""
-    
+
+    AVATAR_SIZE = 60
+    avatar_cache = None  # Compartilhado entre instâncias
+
     def __init__(self, profile_image_path="perfil.png", parent=None):
         super().__init__(parent)
         self.profile_image_path = profile_image_path
         self.setFixedHeight(80)
         self.highlight_color = "#4a90e2"  # Cor padrão
+        self.secondary_color = "#357abd"
         self.setupUI()
 
     def set_highlight_color(self, color):
@@ -24,6 +28,11 @@ class ProfileWidget(QWidget):
         self.highlight_color = color
         self.update_style()
 
+    def set_secondary_color(self, color):
+        """Define a cor secundária (usada no status)"""
+        self.secondary_color = color
+        self.update_style()
+
     def setupUI(self):
         """Configura a interface do perfil"""
         layout = QHBoxLayout(self)
@@ -32,11 +41,13 @@ class ProfileWidget(QWidget):
 
         # Avatar
         self.avatar_label = QLabel()
-        self.avatar_label.setFixedSize(60, 60)
+        self.avatar_label.setFixedSize(self.AVATAR_SIZE, self.AVATAR_SIZE)
         
-        # Criar pixmap circular
-        pixmap = ImageHandler.create_circular_pixmap(self.profile_image_path, 60)
-        self.avatar_label.setPixmap(pixmap)
+        # Avatar circular vem do cache (renderizado em segundo plano se necessário)
+        if ProfileWidget.avatar_cache is None:
+            ProfileWidget.avatar_cache = AvatarCache()
+        ProfileWidget.avatar_cache.request(self.profile_image_path, self.AVATAR_SIZE,
+                                           self.devicePixelRatioF(), self.avatar_label.setPixmap)
         
         # Layout de informações
         info_layout = QVBoxLayout()
@@ -85,7 +96,7 @@ class ProfileWidget(QWidget):
         
         self.status_label.setStyleSheet(f"""
             QLabel {{
-                color: {self.highlight_color};
+                color: {self.secondary_color};
                 font-size: 12px;
                 border: none;
                 outline: none;
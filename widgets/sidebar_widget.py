@@ -7,11 +7,22 @@ from PyQt6.QtWidgets import QWidget, QVBoxLayout
 from PyQt6.QtCore import pyqtSignal, Qt
 
 from widgets.animated_button import AnimatedButton
+from utils.icon_atlas import IconAtlas
 
 
 class SidebarWidget(QWidget):
     """Widget da barra lateral"""
     menu_clicked = pyqtSignal(str)
+
+    # Seção -> ícone do atlas (seções sem ícone continuam com o emoji)
+    ATLAS_ICONS = {
+        "home": "Home",
+        "system": "Settings",
+        "ethernet": "Wifi",
+        "performance": "Perfomance",
+        "personalization": "Personalization",
+        "astrea": "Astrea",
+    }
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -24,6 +35,16 @@ class SidebarWidget(QWidget):
         self.highlight_color = color
         for button in self.buttons:
             button.set_highlight_color(color)
+        self.update_icons()
+
+    def update_icons(self):
+        """Ícones seguem a cor de destaque; sobre o fundo de destaque usam a variante clara"""
+        tinted = IconAtlas.get("light", "tint", self.highlight_color)
+        light = IconAtlas.get("light")
+        for button in self.buttons:
+            name = self.ATLAS_ICONS.get(button.data)
+            if name and tinted.has_icon(name):
+                button.set_icons(tinted.icon(name), light.icon(name))
 
     def setupUI(self):
         """Configura a interface da barra lateral"""
@@ -46,14 +67,17 @@ class SidebarWidget(QWidget):
             ("⭐", "Astrea", "astrea")
         ]
 
+        atlas = IconAtlas.get("light", "tint", self.highlight_color)
         for icon, text, data in menu_items:
-            btn = AnimatedButton(text, icon, data)
+            atlas_icon = atlas.icon(self.ATLAS_ICONS[data]) if data in self.ATLAS_ICONS else None
+            btn = AnimatedButton(text, icon, data, icon=atlas_icon)
             btn.set_highlight_color(self.highlight_color)
             btn.clicked_with_data.connect(self.menu_clicked.emit)
             self.buttons.append(btn)
             layout.addWidget(btn, alignment=Qt.AlignmentFlag.AlignCenter)
 
         layout.addStretch()
+        self.update_icons()
 
     def filter_buttons(self, search_text):
         """Filtra botões baseado no texto de pesquisa"""